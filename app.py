@@ -7,26 +7,61 @@ Version: 3.0.0
 Date: January 1, 2026
 """
 
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, send_from_directory
+from flask import (Flask, render_template, request, redirect, url_for, session, flash, jsonify,
+                   send_from_directory, g, Response, has_app_context, make_response,
+                   before_render_template, template_rendered, stream_template, stream_with_context,
+                   get_flashed_messages)
 import sqlite3
 import hashlib
 import os
 import secrets
 import logging
-from datetime import datetime, timedelta
-from functools import wraps
+import heapq
+import queue
+import math
+import atexit
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from bisect import bisect_left
+from collections import defaultdict, deque, namedtuple
+from datetime import datetime, timedelta, timezone
+from functools import wraps, lru_cache
+from jinja2 import FileSystemBytecodeCache
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 import re
 from contextlib import contextmanager
 import base64
+import csv
 import io
+import gzip
+import zlib
+import mimetypes
+import shutil
+import tempfile
+import click
 from google import genai
 from PIL import Image
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 import json
 from requests_oauthlib import OAuth2Session
-from urllib.parse import urlencode
+from urllib.parse import urlencode, quote
+
+try:
+    import brotli
+except ImportError:  # optional: responses fall back to gzip
+    brotli = None
+
+try:
+    import numpy as np
+except ImportError:  # optional: no related-bugs panel, duplicate checks fall back to word overlap
+    np = None
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -38,9 +73,44 @@ app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 app.config['PERMANENT_SESSION_LIFETIME'] = 86400  # 24 hours
 
+# Observability configuration (instrumentation is a no-op unless enabled)
+app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+app.config['QUERY_PROFILER_ENABLED'] = os.environ.get('QUERY_PROFILER_ENABLED', 'false').lower() == 'true'
+app.config['SLOW_QUERY_MS'] = float(os.environ.get('SLOW_QUERY_MS', '100'))
+
+# Rate limits as 'requests/seconds' token buckets, per client IP and per user (env overrides)
+app.config['RATE_LIMIT_ENABLED'] = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+app.config['RATE_LIMITS'] = {
+    'login': {'ip': os.environ.get('RATE_LIMIT_LOGIN_IP', '20/60'),
+              'user': os.environ.get('RATE_LIMIT_LOGIN_USER', '5/60')},
+    'check_duplicates': {'ip': os.environ.get('RATE_LIMIT_DUPLICATES_IP', '120/60'),
+                         'user': os.environ.get('RATE_LIMIT_DUPLICATES_USER', '60/60')},
+    'generate_avatar': {'ip': os.environ.get('RATE_LIMIT_AVATAR_IP', '10/3600'),
+                        'user': os.environ.get('RATE_LIMIT_AVATAR_USER', '5/3600')}
+}
+
+# Compress text responses larger than this many bytes (brotli when installed, else gzip)
+app.config['COMPRESSION_ENABLED'] = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+app.config['COMPRESSION_MIN_SIZE'] = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+
+# Stream the dashboard as it renders instead of building the whole page first
+app.config['DASHBOARD_STREAMING'] = os.environ.get('DASHBOARD_STREAMING', 'true').lower() == 'true'
+
+# Serve CSS as minified, fingerprinted bundles (false: the individual source files, for editing styles)
+app.config['ASSETS_ENABLED'] = os.environ.get('ASSETS_ENABLED', 'true').lower() == 'true'
+
 # Database configuration
 DATABASE = os.environ.get('DATABASE_PATH', 'bug_tracker.db')
 
+# Background maintenance (optimize, ANALYZE, checkpoint, incremental vacuum, backup) in a local-time window
+app.config['MAINTENANCE_ENABLED'] = os.environ.get('MAINTENANCE_ENABLED', 'false').lower() == 'true'
+app.config['MAINTENANCE_WINDOW'] = os.environ.get('MAINTENANCE_WINDOW', '02:00-05:00')
+app.config['MAINTENANCE_INTERVAL_HOURS'] = float(os.environ.get('MAINTENANCE_INTERVAL_HOURS', '24'))
+app.config['MAINTENANCE_BUDGET_SECONDS'] = float(os.environ.get('MAINTENANCE_BUDGET_SECONDS', '60'))
+app.config['MAINTENANCE_ANALYSIS_LIMIT'] = int(os.environ.get('MAINTENANCE_ANALYSIS_LIMIT', '1000'))
+app.config['BACKUP_DIR'] = os.environ.get('BACKUP_DIR', 'backups')
+app.config['BACKUP_RETENTION'] = int(os.environ.get('BACKUP_RETENTION', '7'))
+
 # Upload configuration
 UPLOAD_FOLDER = os.path.join('static', 'uploads')
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'webp'}
@@ -57,8 +127,9 @@ GOOGLE_OAUTH_CONFIG = {
     'client_id': os.environ.get('GOOGLE_CLIENT_ID', ''),
     'client_secret': os.environ.get('GOOGLE_CLIENT_SECRET', ''),
     'redirect_uri': os.environ.get('GOOGLE_REDIRECT_URI', 'http://localhost:5000/auth/google/callback'),
-    'auth_uri': 'https://accounts.google.com/o/oauth2/v2/auth',
-    'token_uri': 'https://oauth2.googleapis.com/token',
+    'auth_uri': os.environ.get('GOOGLE_AUTH_URI', 'https://accounts.google.com/o/oauth2/v2/auth'),
+    'token_uri': os.environ.get('GOOGLE_TOKEN_URI', 'https://oauth2.googleapis.com/token'),
+    'userinfo_uri': os.environ.get('GOOGLE_USERINFO_URI', 'https://openidconnect.googleapis.com/v1/userinfo'),
     'scopes': ['openid', 'email', 'profile']
 }
 
@@ -66,28 +137,284 @@ GITHUB_OAUTH_CONFIG = {
     'client_id': os.environ.get('GITHUB_CLIENT_ID', ''),
     'client_secret': os.environ.get('GITHUB_CLIENT_SECRET', ''),
     'redirect_uri': os.environ.get('GITHUB_REDIRECT_URI', 'http://localhost:5000/auth/github/callback'),
-    'auth_uri': 'https://github.com/login/oauth/authorize',
-    'token_uri': 'https://github.com/login/oauth/access_token',
+    'auth_uri': os.environ.get('GITHUB_AUTH_URI', 'https://github.com/login/oauth/authorize'),
+    'token_uri': os.environ.get('GITHUB_TOKEN_URI', 'https://github.com/login/oauth/access_token'),
+    'api_url': os.environ.get('GITHUB_API_URL', 'https://api.github.com'),
     'scopes': ['user:email']
 }
 
-# Logging configuration
+# Outbound HTTP (OAuth providers): (connect, read) timeouts in seconds and pool size
+HTTP_TIMEOUT = (float(os.environ.get('HTTP_CONNECT_TIMEOUT', '3.05')), float(os.environ.get('HTTP_READ_TIMEOUT', '10')))
+HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', '16'))
+
+# Logging configuration: LOG_FILE is relative to the working directory, empty logs to stderr only
+LOG_FILE = os.environ.get('LOG_FILE', 'bug_tracker.log')
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bug_tracker.log'),
-        logging.StreamHandler()
-    ]
+    handlers=([logging.FileHandler(LOG_FILE)] if LOG_FILE else []) + [logging.StreamHandler()]
 )
 logger = logging.getLogger(__name__)
 
+# ============== INSTRUMENTATION ==============
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class RequestMetrics:
+    """Thread-safe per-route request statistics rendered in Prometheus text format"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop all collected samples"""
+        with self._lock:
+            self._routes = {}
+            self._statuses = {}
+            self._rate_limited = {}
+            self.upload_bytes = 0
+
+    def observe(self, route, method, status, seconds, sql_count, sql_seconds, render_seconds, upload_bytes):
+        """Record one finished request"""
+        key = (route, method)
+        with self._lock:
+            entry = self._routes.get(key)
+            if entry is None:
+                entry = self._routes[key] = {
+                    'buckets': [0] * len(self.buckets), 'count': 0, 'sum': 0.0,
+                    'sql_count': 0, 'sql_seconds': 0.0, 'render_seconds': 0.0
+                }
+            index = bisect_left(self.buckets, seconds)
+            if index < len(self.buckets):
+                entry['buckets'][index] += 1
+            entry['count'] += 1
+            entry['sum'] += seconds
+            entry['sql_count'] += sql_count
+            entry['sql_seconds'] += sql_seconds
+            entry['render_seconds'] += render_seconds
+            status_key = (route, method, status)
+            self._statuses[status_key] = self._statuses.get(status_key, 0) + 1
+            self.upload_bytes += upload_bytes
+
+    def observe_rate_limited(self, limit, scope):
+        """Count a request rejected by a rate limit"""
+        with self._lock:
+            self._rate_limited[(limit, scope)] = self._rate_limited.get((limit, scope), 0) + 1
+
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        with self._lock:
+            routes = {key: dict(value, buckets=list(value['buckets'])) for key, value in self._routes.items()}
+            statuses = dict(self._statuses)
+            rate_limited = dict(self._rate_limited)
+            upload_bytes = self.upload_bytes
+
+        lines = [
+            '# HELP bugtracker_request_duration_seconds Request latency by route',
+            '# TYPE bugtracker_request_duration_seconds histogram'
+        ]
+        for (route, method), entry in sorted(routes.items()):
+            labels = f'route="{_prom_escape(route)}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, entry['buckets']):
+                cumulative += count
+                lines.append(f'bugtracker_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'bugtracker_request_duration_seconds_bucket{{{labels},le="+Inf"}} {entry["count"]}')
+            lines.append(f'bugtracker_request_duration_seconds_sum{{{labels}}} {entry["sum"]:.6f}')
+            lines.append(f'bugtracker_request_duration_seconds_count{{{labels}}} {entry["count"]}')
+
+        lines += [
+            '# HELP bugtracker_requests_total Requests by route and response status',
+            '# TYPE bugtracker_requests_total counter'
+        ]
+        for (route, method, status), count in sorted(statuses.items()):
+            lines.append(f'bugtracker_requests_total{{route="{_prom_escape(route)}",method="{method}",status="{status}"}} {count}')
+
+        for name, field, help_text, fmt in (
+            ('bugtracker_sql_statements_total', 'sql_count', 'SQL statements executed by route', 'd'),
+            ('bugtracker_sql_seconds_total', 'sql_seconds', 'Time spent executing SQL by route', '.6f'),
+            ('bugtracker_template_render_seconds_total', 'render_seconds', 'Time spent rendering templates by route', '.6f')
+        ):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            for (route, method), entry in sorted(routes.items()):
+                lines.append(f'{name}{{route="{_prom_escape(route)}",method="{method}"}} {entry[field]:{fmt}}')
+
+        lines += [
+            '# HELP bugtracker_upload_bytes_total Bytes received in multipart uploads',
+            '# TYPE bugtracker_upload_bytes_total counter',
+            f'bugtracker_upload_bytes_total {upload_bytes}',
+            '# HELP bugtracker_rate_limited_total Requests rejected by rate limits',
+            '# TYPE bugtracker_rate_limited_total counter'
+        ]
+        for (limit, scope), count in sorted(rate_limited.items()):
+            lines.append(f'bugtracker_rate_limited_total{{limit="{limit}",scope="{scope}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+def _prom_escape(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+request_metrics = RequestMetrics()
+
+_SQL_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_SQL_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SQL_IN_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_SQL_SPACE_RE = re.compile(r'\s+')
+_EXPLAINABLE_PREFIXES = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'REPLACE')
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql):
+    """Reduce a statement to its shape: literals become ? and IN lists collapse"""
+    shape = _SQL_SPACE_RE.sub(' ', sql).strip()
+    shape = _SQL_STRING_RE.sub('?', shape)
+    shape = _SQL_NUMBER_RE.sub('?', shape)
+    return _SQL_IN_LIST_RE.sub('(?, ...)', shape)
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class StatementProfiler:
+    """Aggregates SQL timings by statement shape and logs slow statements"""
+
+    SAMPLE_SIZE = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop all collected statistics"""
+        with self._lock:
+            self._shapes = {}
+
+    def record(self, connection, sql, parameters, elapsed):
+        """Record one statement execution"""
+        shape = normalize_sql(sql)
+        with self._lock:
+            stats = self._shapes.get(shape)
+            if stats is None:
+                stats = self._shapes[shape] = {
+                    'calls': 0, 'total': 0.0, 'max': 0.0, 'slow': 0, 'plan': None, 'explained': False,
+                    'samples': deque(maxlen=self.SAMPLE_SIZE)
+                }
+            stats['calls'] += 1
+            stats['total'] += elapsed
+            stats['max'] = max(stats['max'], elapsed)
+            stats['samples'].append(elapsed)
+
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms >= app.config['SLOW_QUERY_MS']:
+            # Statements of one shape share a plan, so only the first slow one is explained
+            with self._lock:
+                stats['slow'] += 1
+                explained, stats['explained'] = stats['explained'], True
+            if explained:
+                plan = stats['plan']
+            else:
+                plan = self._explain(connection, sql, parameters)
+                with self._lock:
+                    stats['plan'] = plan
+            logger.warning(f"Slow query ({elapsed_ms:.1f} ms): {shape}\n  Plan: {plan or 'unavailable'}")
+
+    @staticmethod
+    def _explain(connection, sql, parameters):
+        """Return the EXPLAIN QUERY PLAN output for a statement, if it has one"""
+        if parameters is None or not sql.lstrip().upper().startswith(_EXPLAINABLE_PREFIXES):
+            return None
+        try:
+            # A plain cursor keeps the EXPLAIN itself out of the statistics
+            rows = sqlite3.Cursor(connection).execute(f'EXPLAIN QUERY PLAN {sql}', parameters).fetchall()
+            return '; '.join(str(row[3]) for row in rows) or None
+        except sqlite3.Error as e:
+            logger.debug(f"Could not explain slow query: {str(e)}")
+            return None
+
+    def top(self, limit=50, order_by='total'):
+        """Return the most expensive statement shapes with latency percentiles"""
+        with self._lock:
+            items = [(shape, dict(stats, samples=sorted(stats['samples'])))
+                     for shape, stats in self._shapes.items()]
+
+        report = []
+        for shape, stats in items:
+            samples = stats['samples']
+            report.append({
+                'shape': shape,
+                'calls': stats['calls'],
+                'total_ms': stats['total'] * 1000,
+                'avg_ms': stats['total'] * 1000 / stats['calls'],
+                'p50_ms': _percentile(samples, 0.50) * 1000,
+                'p95_ms': _percentile(samples, 0.95) * 1000,
+                'p99_ms': _percentile(samples, 0.99) * 1000,
+                'max_ms': stats['max'] * 1000,
+                'slow': stats['slow'],
+                'plan': stats['plan']
+            })
+        if order_by not in ('total_ms', 'calls', 'avg_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'slow'):
+            order_by = 'total_ms'
+        report.sort(key=lambda row: row[order_by], reverse=True)
+        return report[:limit]
+
+statement_profiler = StatementProfiler()
+
+def sql_instrumentation_enabled():
+    """Whether new connections should time their statements"""
+    return app.config['METRICS_ENABLED'] or app.config['QUERY_PROFILER_ENABLED']
+
+def record_sql(connection, sql, parameters, elapsed):
+    """Attribute one executed statement to the current request and the profiler"""
+    if has_app_context() and 'sql_count' in g:
+        g.sql_count += 1
+        g.sql_seconds += elapsed
+    if app.config['QUERY_PROFILER_ENABLED']:
+        statement_profiler.record(connection, sql, parameters, elapsed)
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports the duration of every statement it executes.
+
+    SQLite runs the first step of a statement inside execute(), which is where
+    sorting and aggregation happen, so this captures the bulk of query cost.
+    """
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            record_sql(self.connection, sql, parameters, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record_sql(self.connection, sql, None, time.perf_counter() - start)
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including implicit ones) are instrumented"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
 @contextmanager
 def get_db_connection():
     """Context manager for database connections (best practice)"""
     conn = None
     try:
-        conn = sqlite3.connect(DATABASE, timeout=10.0)
+        factory = InstrumentedConnection if sql_instrumentation_enabled() else sqlite3.Connection
+        conn = sqlite3.connect(DATABASE, timeout=10.0, factory=factory)
         conn.row_factory = sqlite3.Row
         conn.execute('PRAGMA foreign_keys = ON')  # Enable foreign key support
         yield conn
@@ -101,11 +428,66 @@ def get_db_connection():
         if conn:
             conn.close()
 
+EXPORT_SNAPSHOT_MODE = os.environ.get('EXPORT_SNAPSHOT_MODE', 'wal').lower()
+
+@contextmanager
+def get_snapshot_connection(mode=None):
+    """Read-only connection pinned to a consistent snapshot, for exports and other long reads.
+
+    'wal' holds a read transaction on a dedicated read-only connection: writers
+    are never blocked, but the WAL cannot be checkpointed past the snapshot until
+    it is released. 'backup' copies the database with the backup API into a
+    temporary file first, so the live database is only read for the copy.
+    """
+    mode = mode or EXPORT_SNAPSHOT_MODE
+    factory = InstrumentedConnection if sql_instrumentation_enabled() else sqlite3.Connection
+    conn = None
+    snapshot_dir = None
+    try:
+        if mode == 'backup':
+            snapshot_dir = tempfile.mkdtemp(prefix='bug_tracker_snapshot_')
+            conn = sqlite3.connect(os.path.join(snapshot_dir, 'snapshot.db'), factory=factory)
+            source = sqlite3.connect(f'file:{quote(os.path.abspath(DATABASE))}?mode=ro', uri=True, timeout=10.0)
+            try:
+                source.backup(conn)
+            finally:
+                source.close()
+        else:
+            conn = sqlite3.connect(f'file:{quote(os.path.abspath(DATABASE))}?mode=ro', uri=True, timeout=10.0,
+                                   factory=factory)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA query_only = ON')
+        conn.execute('BEGIN')
+        # BEGIN is deferred: the first read is what pins the snapshot, so take it now
+        conn.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+        yield conn
+    finally:
+        if conn:
+            conn.rollback()
+            conn.close()
+        if snapshot_dir:
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+# Tables whose writes invalidate cached pages (see conditional_get)
+DATA_VERSION_TABLES = ('users', 'bugs', 'comments', 'bug_history', 'bug_deletions')
+# Writes that leave cached pages as they are: a bug view is logged on every bug page load
+DATA_VERSION_CONDITIONS = {('bug_history', 'INSERT'): "NEW.action != 'viewed_bug'"}
+
+# Tables with an integer created_at_ms (epoch milliseconds, UTC) next to the TEXT created_at
+TIMESTAMP_MS_TABLES = ('bugs', 'comments', 'bug_history', 'bug_deletions')
+EPOCH_MS_SQL = "CAST(strftime('%s', {column}) AS INTEGER) * 1000"
+
 def init_db():
     """Initialize the database with required tables and indexes"""
     with get_db_connection() as conn:
         cursor = conn.cursor()
         
+        # Only takes effect on a new database; existing ones switch with "flask maintenance --full-vacuum"
+        cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        
+        # WAL lets readers (exports in particular) run alongside writers
+        cursor.execute('PRAGMA journal_mode = WAL')
+        
         # Create users table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -133,6 +515,8 @@ def init_db():
                 assigned_to INTEGER,
                 created_by INTEGER NOT NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_at_ms INTEGER,
+                comment_count INTEGER NOT NULL DEFAULT 0,
                 FOREIGN KEY (created_by) REFERENCES users (id),
                 FOREIGN KEY (assigned_to) REFERENCES users (id)
             )
@@ -203,7 +587,8 @@ def init_db():
             pass
         
         try:
-            cursor.execute('ALTER TABLE users ADD COLUMN oauth_id TEXT UNIQUE')
+            # SQLite cannot add a UNIQUE column; uniqueness comes from idx_users_oauth below
+            cursor.execute('ALTER TABLE users ADD COLUMN oauth_id TEXT')
             logger.info('Added oauth_id column to users table')
         except sqlite3.OperationalError:
             pass
@@ -222,6 +607,7 @@ def init_db():
                 user_id INTEGER NOT NULL,
                 comment TEXT NOT NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_at_ms INTEGER,
                 FOREIGN KEY (bug_id) REFERENCES bugs (id),
                 FOREIGN KEY (user_id) REFERENCES users (id)
             )
@@ -237,11 +623,69 @@ def init_db():
                 old_value TEXT,
                 new_value TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_at_ms INTEGER,
                 FOREIGN KEY (bug_id) REFERENCES bugs (id),
                 FOREIGN KEY (user_id) REFERENCES users (id)
             )
         ''')
         
+        # Tombstones for deleted bugs, whose history rows go with them
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS bug_deletions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                bug_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                title TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_at_ms INTEGER
+            )
+        ''')
+        
+        # Analytics rollups, maintained incrementally from bug_history (see update_analytics):
+        # daily counters per status / priority / assignee, and duration histograms
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS analytics_daily (
+                day INTEGER NOT NULL,
+                dimension TEXT NOT NULL,
+                key TEXT NOT NULL,
+                created INTEGER NOT NULL DEFAULT 0,
+                entered INTEGER NOT NULL DEFAULT 0,
+                exited INTEGER NOT NULL DEFAULT 0,
+                resolved INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, dimension, key)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS analytics_durations (
+                day INTEGER NOT NULL,
+                metric TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                total_ms INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, metric, bucket)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS analytics_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                history_id INTEGER NOT NULL,
+                updated_at TIMESTAMP
+            )
+        ''')
+        cursor.execute('INSERT OR IGNORE INTO analytics_state (id, history_id) VALUES (1, 0)')
+        
+        # Create maintenance runs table (scheduled and manual runs with per-task timings)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS maintenance_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TIMESTAMP NOT NULL,
+                finished_at TIMESTAMP,
+                trigger_name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                report TEXT
+            )
+        ''')
+        
         # Create indexes for better performance
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_bugs_status ON bugs(status)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_bugs_priority ON bugs(priority)')
@@ -249,63 +693,409 @@ def init_db():
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_bugs_assigned_to ON bugs(assigned_to)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_comments_bug_id ON comments(bug_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)')
+        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_users_oauth ON users(oauth_provider, oauth_id)')
+
+        # Epoch-millisecond creation times (migration): sort and range-filter as integers.
+        # Existing rows are filled in by backfill_timestamps(); rows inserted without a
+        # value get one derived from created_at by the trigger
+        for table in TIMESTAMP_MS_TABLES:
+            try:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN created_at_ms INTEGER')
+                logger.info(f'Added created_at_ms column to {table} table')
+            except sqlite3.OperationalError:
+                pass
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_created_at_ms
+                AFTER INSERT ON {table}
+                WHEN NEW.created_at_ms IS NULL
+                BEGIN
+                    UPDATE {table} SET created_at_ms = {EPOCH_MS_SQL.format(column='NEW.created_at')} WHERE id = NEW.id;
+                END
+            ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_bugs_created_at_ms ON bugs(created_at_ms)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_comments_bug_created_at_ms ON comments(bug_id, created_at_ms)')
+
+        # Comments per bug, kept by triggers so pages never count rows (migration fills existing bugs once)
+        try:
+            cursor.execute('ALTER TABLE bugs ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0')
+            cursor.execute('UPDATE bugs SET comment_count = (SELECT COUNT(*) FROM comments WHERE comments.bug_id = bugs.id)')
+            logger.info('Added comment_count column to bugs table')
+        except sqlite3.OperationalError:
+            pass
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_comments_insert_count
+            AFTER INSERT ON comments
+            BEGIN
+                UPDATE bugs SET comment_count = comment_count + 1 WHERE id = NEW.bug_id;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_comments_delete_count
+            AFTER DELETE ON comments
+            BEGIN
+                UPDATE bugs SET comment_count = comment_count - 1 WHERE id = OLD.bug_id;
+            END
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_created_at_ms ON bug_history(created_at_ms)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_bug_created_at_ms ON bug_history(bug_id, created_at_ms)')
+
+        
+        # Data version counter: bumped by triggers on every write to the tables pages are built from,
+        # so conditional GETs can be answered without re-running the queries
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS data_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)')
+        for table in DATA_VERSION_TABLES:
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                name = f'trg_{table}_{event.lower()}_version'
+                condition = DATA_VERSION_CONDITIONS.get((table, event))
+                existing = cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+                                          (name,)).fetchone()
+                if existing and condition and condition not in existing[0]:
+                    # Created before the condition existed
+                    cursor.execute(f'DROP TRIGGER {name}')
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {name}
+                    AFTER {event} ON {table}{f' WHEN {condition}' if condition else ''}
+                    BEGIN
+                        UPDATE data_version SET version = version + 1 WHERE id = 1;
+                    END
+                ''')
     
     logger.info("Database initialized successfully with all tables and indexes!")
     print("[OK] Database initialized successfully!")
 
+# ============== DATA ACCESS ==============
+
+def _record_type(name, fields):
+    """namedtuple type whose instances also support row['field'] and dict(row) like sqlite3.Row"""
+    base = namedtuple(name, fields)
+
+    def __getitem__(self, key):
+        return getattr(self, key) if isinstance(key, str) else tuple.__getitem__(self, key)
+
+    def keys(self):
+        return self._fields
+
+    return type(name, (base,), {'__slots__': (), '__getitem__': __getitem__, 'keys': keys})
+
+class Projection:
+    """The columns one view reads, and the compact record type its rows are fetched into.
+
+    `columns` goes into the SELECT list; fetchall/fetchone skip sqlite3.Row and
+    build tuple-backed records straight from the cursor, so a page only holds
+    the fields it renders.
+    """
+    __slots__ = ('columns', 'record')
+
+    def __init__(self, name, **columns):
+        self.columns = ', '.join(f'{expression} AS {field}' for field, expression in columns.items())
+        self.record = _record_type(name, list(columns))
+
+    def _execute(self, conn, sql, params):
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        return cursor.execute(sql, params)
+
+    def fetchall(self, conn, sql, params=()):
+        return list(map(self.record._make, self._execute(conn, sql, params)))
+
+    def fetchone(self, conn, sql, params=()):
+        row = self._execute(conn, sql, params).fetchone()
+        return self.record._make(row) if row is not None else None
+
+
+# Dashboard bug table (joins creator and assignee)
+BUG_LIST = Projection('BugListRow', id='b.id', title='b.title', priority='b.priority', status='b.status',
+                      screenshot_path='b.screenshot_path', screenshot_url='b.screenshot_url',
+                      created_at='b.created_at', creator_email='creator.email', assignee_email='assignee.email')
+# Dashboard side panels (joins assignee)
+BUG_PANEL = Projection('BugPanelRow', id='b.id', title='b.title', priority='b.priority', status='b.status',
+                       assignee_email='assignee.email')
+# Dashboard recent activity (joins u and b) and notifications (joins actor and b)
+ACTIVITY_ENTRY = Projection('ActivityEntry', id='bh.id', bug_id='bh.bug_id', action='bh.action',
+                            old_value='bh.old_value', new_value='bh.new_value', created_at='bh.created_at',
+                            created_at_ms='bh.created_at_ms', user_email='u.email', bug_title='b.title')
+NOTIFICATION_ENTRY = Projection('NotificationEntry', id='bh.id', bug_id='bh.bug_id', action='bh.action',
+                                new_value='bh.new_value', created_at='bh.created_at',
+                                created_at_ms='bh.created_at_ms', actor_email='actor.email', bug_title='b.title')
+# Bug history timeline: a run of repeated events, shown as its newest row (joins head and u)
+HISTORY_RUN = Projection('HistoryRun', id='head.id', action='head.action', old_value='head.old_value',
+                         new_value='head.new_value', created_at='head.created_at',
+                         created_at_ms='head.created_at_ms', user_email='u.email', repeats='head.repeats',
+                         first_id='head.first_id', first_created_at='head.first_created_at',
+                         first_created_at_ms='head.first_created_at_ms', scan_position='head.scan_position')
+# Comments under a bug (joins u)
+COMMENT_ENTRY = Projection('CommentEntry', id='c.id', user_id='c.user_id', comment='c.comment',
+                           created_at='c.created_at', created_at_ms='c.created_at_ms', user_email='u.email')
+# User pickers and the admin user list
+USER_OPTION = Projection('UserOption', id='id', email='email', role='role')
+USER_SUMMARY = Projection('UserSummary', id='u.id', email='u.email', role='u.role', created_at='u.created_at',
+                          bugs_created='COUNT(b.id)', bugs_assigned='COUNT(DISTINCT ba.id)')
+
+# ============== PASSWORD HASHING ==============
+
+class PasswordHashBusy(Exception):
+    """Raised when the password hashing queue is full"""
+
+class PasswordHashPool:
+    """Runs CPU-bound password hashing in worker processes behind a bounded queue.
+
+    At most `queue_size` hashes may be pending; further callers wait up to
+    `queue_wait` seconds for a slot and then get PasswordHashBusy, so a burst of
+    logins is shed instead of piling up behind the workers. A hash that takes
+    longer than `timeout`, or a pool that keeps crashing, also gives
+    PasswordHashBusy. With workers=0 the hashing runs inline on the calling thread.
+    """
+
+    def __init__(self, workers, queue_size, queue_wait, timeout):
+        self.workers = workers
+        self.queue_wait = queue_wait
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(1, queue_size))
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn avoids forking a process that may hold locks in other threads
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def _submit(self, executor, fn, args):
+        """Submit fn(*args) once a queue slot is free; the slot is released when it finishes"""
+        if not self._slots.acquire(timeout=self.queue_wait):
+            raise PasswordHashBusy()
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _restart(self, broken):
+        """Drop a crashed executor, shutting it down so its worker processes are not leaked"""
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, fn, *args):
+        """Run fn(*args) in the pool and return its result"""
+        if self.workers <= 0:
+            return fn(*args)
+
+        # A crashed pool is replaced and the hash resubmitted once; never fall back to
+        # hashing on the request thread
+        for _ in range(2):
+            executor = self._get_executor()
+            try:
+                future = self._submit(executor, fn, args)
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                logger.warning(f"Password hash took longer than {self.timeout}s")
+                raise PasswordHashBusy()
+            except BrokenProcessPool:
+                logger.error("Password hashing pool crashed; restarting it")
+                self._restart(executor)
+        raise PasswordHashBusy()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+password_hasher = PasswordHashPool(
+    workers=int(os.environ.get('PASSWORD_HASH_WORKERS', str(min(4, os.cpu_count() or 1)))),
+    queue_size=int(os.environ.get('PASSWORD_HASH_QUEUE', '32')),
+    queue_wait=float(os.environ.get('PASSWORD_HASH_QUEUE_WAIT', '2.0')),
+    timeout=float(os.environ.get('PASSWORD_HASH_TIMEOUT', '30'))
+)
+atexit.register(lambda: password_hasher.shutdown())
+
 def hash_password(password):
-    """Hash password using werkzeug's secure pbkdf2:sha256"""
-    return generate_password_hash(password, method='pbkdf2:sha256', salt_length=16)
+    """Hash password using werkzeug's secure pbkdf2:sha256 (in the hashing pool)"""
+    return password_hasher.run(generate_password_hash, password, PASSWORD_HASH_METHOD, 16)
 
 def verify_password(stored_hash, password):
-    """Verify password against stored hash"""
-    return check_password_hash(stored_hash, password)
+    """Verify password against stored hash (in the hashing pool)"""
+    return password_hasher.run(check_password_hash, stored_hash, password)
+
+def password_needs_rehash(stored_hash):
+    """Whether a stored hash was made with different cost parameters than PASSWORD_HASH_METHOD"""
+    return stored_hash.split('$', 1)[0] != PASSWORD_HASH_METHOD
 
 def validate_email(email):
     """Validate email format"""
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return re.match(pattern, email) is not None
 
-def format_datetime(dt_string):
-    """Format datetime string to human-readable format"""
+ABSOLUTE_DATE_AFTER_DAYS = 7
+
+def now_ms():
+    """The current time in epoch milliseconds, as stored in the created_at_ms columns"""
+    return int(time.time() * 1000)
+
+@lru_cache(maxsize=65536)
+def parse_timestamp(value):
+    """Parse epoch milliseconds or a SQLite 'YYYY-MM-DD HH:MM:SS' timestamp (cached) into
+    a naive UTC datetime; None when it is neither"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        try:
+            return datetime.fromtimestamp(value / 1000, timezone.utc).replace(tzinfo=None)
+        except (OverflowError, OSError, ValueError):
+            return None
     try:
-        dt = datetime.strptime(dt_string, '%Y-%m-%d %H:%M:%S')
-        now = datetime.now()
-        diff = now - dt
-        
-        if diff.days == 0:
-            if diff.seconds < 60:
-                return "Just now"
-            elif diff.seconds < 3600:
-                minutes = diff.seconds // 60
-                return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-            else:
-                hours = diff.seconds // 3600
-                return f"{hours} hour{'s' if hours != 1 else ''} ago"
-        elif diff.days == 1:
-            return "Yesterday"
-        elif diff.days < 7:
-            return f"{diff.days} days ago"
+        dt = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return dt if dt.tzinfo is None else None
+
+def parse_date_range(args):
+    """(from_ms, to_ms) bounds on created_at_ms from the ?from=&to= query parameters.
+
+    Both take YYYY-MM-DD or a full ISO timestamp, UTC unless an offset is given.
+    'from' is inclusive and 'to' exclusive, except that a bare 'to' date covers
+    that whole day. Missing bounds are None; malformed ones raise ValueError.
+    """
+    bounds = []
+    for name in ('from', 'to'):
+        value = (args.get(name) or '').strip()
+        if not value:
+            bounds.append(None)
+            continue
+        try:
+            dt = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"Invalid '{name}' date: use YYYY-MM-DD")
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        if name == 'to' and len(value) == 10:
+            dt += timedelta(days=1)
+        bounds.append(int(dt.timestamp() * 1000))
+    return tuple(bounds)
+
+def date_range_sql(column, from_ms, to_ms):
+    """(' AND ...', params) restricting an epoch-ms column to [from_ms, to_ms)"""
+    sql, params = '', []
+    if from_ms is not None:
+        sql += f' AND {column} >= ?'
+        params.append(from_ms)
+    if to_ms is not None:
+        sql += f' AND {column} < ?'
+        params.append(to_ms)
+    return sql, params
+
+@lru_cache(maxsize=4096)
+def _absolute_date(year, month, day):
+    return datetime(year, month, day).strftime('%b %d, %Y')
+
+def format_now():
+    """The 'now' relative times are measured from, computed once per request"""
+    if not has_app_context():
+        return datetime.now()
+    if 'format_now' not in g:
+        g.format_now = datetime.now()
+    return g.format_now
+
+def format_relative(dt, now):
+    diff = now - dt
+    if diff.days == 0:
+        if diff.seconds < 60:
+            return "Just now"
+        elif diff.seconds < 3600:
+            minutes = diff.seconds // 60
+            return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
         else:
-            return dt.strftime('%b %d, %Y')
-    except:
-        return dt_string[:16]
+            hours = diff.seconds // 3600
+            return f"{hours} hour{'s' if hours != 1 else ''} ago"
+    elif diff.days == 1:
+        return "Yesterday"
+    elif diff.days < ABSOLUTE_DATE_AFTER_DAYS:
+        return f"{diff.days} days ago"
+    return _absolute_date(dt.year, dt.month, dt.day)
+
+def format_datetime(dt_string, now=None):
+    """Format a timestamp (epoch milliseconds or datetime string) to human-readable format"""
+    dt = parse_timestamp(dt_string)
+    if dt is None:
+        return dt_string[:16] if isinstance(dt_string, str) else ''
+    return format_relative(dt, now or format_now())
+
+def format_datetimes(values, now=None):
+    """Format a whole column of timestamps against a single 'now'"""
+    now = now or format_now()
+    formatted = {}
+    return [formatted[value] if value in formatted else formatted.setdefault(value, format_datetime(value, now))
+            for value in values]
+
+def created_time(row):
+    """A row's creation time: created_at_ms, or the TEXT created_at while it is not backfilled yet"""
+    return row['created_at_ms'] if row['created_at_ms'] is not None else row['created_at']
 
 def log_bug_history(conn, bug_id, user_id, action, old_value=None, new_value=None):
     """Log bug history for audit trail"""
     try:
         cursor = conn.cursor()
         cursor.execute('''
-            INSERT INTO bug_history (bug_id, user_id, action, old_value, new_value)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (bug_id, user_id, action, old_value, new_value))
+            INSERT INTO bug_history (bug_id, user_id, action, old_value, new_value, created_at_ms)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (bug_id, user_id, action, old_value, new_value, now_ms()))
         conn.commit()
+        if action != 'viewed_bug':
+            change_notifier.notify()
         logger.info(f"History logged: {action} for bug #{bug_id}")
     except Exception as e:
         logger.error(f"Error logging history: {str(e)}")
 
-# Register format_datetime as template filter
+# Register format_datetime (and its column version) and created_time as template filters
 app.jinja_env.filters['format_datetime'] = format_datetime
+app.jinja_env.filters['format_datetimes'] = format_datetimes
+app.jinja_env.filters['created_time'] = created_time
+
+@app.before_request
+def start_request_metrics():
+    """Reset per-request counters when metrics are enabled"""
+    if app.config['METRICS_ENABLED']:
+        g.metrics_start = time.perf_counter()
+        g.sql_count = 0
+        g.sql_seconds = 0.0
+        g.render_seconds = 0.0
+
+@app.after_request
+def finish_request_metrics(response):
+    """Record latency, SQL and render time for the finished request"""
+    start = g.pop('metrics_start', None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        upload_bytes = (request.content_length or 0) if request.mimetype == 'multipart/form-data' else 0
+        request_metrics.observe(route, request.method, response.status_code,
+                                time.perf_counter() - start, g.sql_count, g.sql_seconds,
+                                g.render_seconds, upload_bytes)
+    return response
+
+@before_render_template.connect_via(app)
+def start_render_timer(sender, template, context, **extra):
+    """Mark the start of a template render"""
+    if 'metrics_start' in g:
+        g.render_start = time.perf_counter()
+
+@template_rendered.connect_via(app)
+def stop_render_timer(sender, template, context, **extra):
+    """Accumulate template render time for the current request"""
+    render_start = g.pop('render_start', None)
+    if render_start is not None:
+        g.render_seconds += time.perf_counter() - render_start
 
 def sanitize_input(text, max_length=None):
     """Sanitize user input"""
@@ -316,6 +1106,42 @@ def sanitize_input(text, max_length=None):
         text = text[:max_length]
     return text
 
+VALID_PRIORITIES = ['Low', 'Medium', 'High']
+VALID_STATUSES = ['Open', 'In Progress', 'Fixed', 'Closed']
+
+def _field_text(fields, key, default=''):
+    """Read a field as text; non-string values (e.g. from JSON) are stringified"""
+    value = fields.get(key)
+    if value is None:
+        return default
+    return value if isinstance(value, str) else str(value)
+
+def validate_bug_fields(fields):
+    """Sanitize and validate new bug fields.
+
+    Returns (bug, error): a dict of cleaned values, or None and an error message.
+    """
+    bug = {
+        'title': sanitize_input(_field_text(fields, 'title'), 200),
+        'description': sanitize_input(_field_text(fields, 'description'), 2000),
+        'steps': sanitize_input(_field_text(fields, 'steps'), 2000),
+        'expected_result': sanitize_input(_field_text(fields, 'expected_result'), 2000),
+        'actual_result': sanitize_input(_field_text(fields, 'actual_result'), 2000),
+        'screenshot_url': sanitize_input(_field_text(fields, 'screenshot_url'), 500),
+        'priority': _field_text(fields, 'priority', 'Medium')
+    }
+    
+    if not bug['title'] or not bug['description']:
+        return None, 'Title and description are required'
+    
+    if len(bug['title']) < 5:
+        return None, 'Title must be at least 5 characters long'
+    
+    if bug['priority'] not in VALID_PRIORITIES:
+        return None, 'Invalid priority level'
+    
+    return bug, None
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -344,6 +1170,453 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# ============== HTTP CLIENT ==============
+
+def create_http_adapter():
+    """Connection-pooled adapter with bounded retries.
+
+    Connection failures are retried for every method since nothing was sent;
+    5xx responses only for GETs, so a single-use OAuth code is never replayed.
+    """
+    retry = Retry(total=2, connect=2, read=0, status=2, backoff_factor=0.3,
+                  status_forcelist=(502, 503, 504), allowed_methods=frozenset({'GET'}),
+                  raise_on_status=False)
+    return HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+
+def mount_http_adapter(http):
+    """Route a requests session through the shared connection pool"""
+    http.mount('https://', http_adapter)
+    http.mount('http://', http_adapter)
+    return http
+
+http_adapter = create_http_adapter()
+http_session = mount_http_adapter(requests.Session())
+http_executor = ThreadPoolExecutor(max_workers=HTTP_POOL_SIZE, thread_name_prefix='http')
+
+def fetch_json(url, headers=None, http=None):
+    """GET a JSON document with the shared timeouts, raising on HTTP errors"""
+    response = (http or http_session).get(url, headers=headers, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+# ============== RATE LIMITING ==============
+
+def parse_rate(spec):
+    """Parse a 'count/seconds' limit such as '10/60' into (capacity, tokens_per_second)"""
+    count, _, seconds = spec.partition('/')
+    count, seconds = float(count), float(seconds or 1)
+    if count <= 0 or seconds <= 0:
+        raise ValueError(f'Invalid rate limit: {spec}')
+    return count, count / seconds
+
+def _refill_bucket(tokens, updated_at, capacity, per_second, now):
+    """Take one token from a bucket.
+
+    Returns (tokens_left, retry_after, full_at): retry_after is 0 when the request
+    is allowed, and full_at is when the bucket will have refilled completely.
+    """
+    tokens = min(capacity, tokens + max(0.0, now - updated_at) * per_second)
+    if tokens >= 1:
+        tokens -= 1
+        retry_after = 0.0
+    else:
+        retry_after = (1 - tokens) / per_second
+    return tokens, retry_after, now + (capacity - tokens) / per_second
+
+class TokenBucketLimiter:
+    """In-process token buckets keyed by strings like 'login:ip:127.0.0.1'.
+
+    Each bucket is a (tokens, updated_at, full_at) tuple. There is no expiry
+    timer: a bucket past its full_at is identical to a missing one, so such
+    buckets are swept lazily once the table grows past max_keys, and the least
+    recently used ones are evicted if that is not enough.
+    """
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, per_second, now=None):
+        """Take a token; return 0 if allowed, else the seconds until one is available"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated_at, _ = self._buckets.pop(key, (capacity, now, now))
+            tokens, retry_after, full_at = _refill_bucket(tokens, updated_at, capacity, per_second, now)
+            self._buckets[key] = (tokens, now, full_at)  # re-inserted last, so dict order is LRU order
+            if len(self._buckets) > self.max_keys:
+                self._sweep(now)
+        return retry_after
+
+    def _sweep(self, now):
+        for key in [key for key, bucket in self._buckets.items() if bucket[2] <= now]:
+            del self._buckets[key]
+        excess = len(self._buckets) - int(self.max_keys * 0.9)
+        for key in list(self._buckets)[:max(0, excess)]:
+            del self._buckets[key]
+
+    def __len__(self):
+        return len(self._buckets)
+
+class SQLiteTokenBucketLimiter:
+    """Token buckets in a SQLite table, shared by all worker processes on a host"""
+
+    SWEEP_EVERY = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        self._calls_lock = threading.Lock()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    full_at REAL NOT NULL
+                ) WITHOUT ROWID
+            ''')
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, capacity, per_second, now=None):
+        """Take a token; return 0 if allowed, else the seconds until one is available"""
+        now = time.time() if now is None else now  # wall clock, comparable across processes
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated_at = row if row else (capacity, now)
+            tokens, retry_after, full_at = _refill_bucket(tokens, updated_at, capacity, per_second, now)
+            conn.execute('''
+                INSERT INTO rate_limit_buckets (key, tokens, updated_at, full_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens,
+                    updated_at = excluded.updated_at, full_at = excluded.full_at
+            ''', (key, tokens, now, full_at))
+
+            with self._calls_lock:
+                self._calls += 1
+                sweep = self._calls % self.SWEEP_EVERY == 0
+            if sweep:
+                conn.execute('DELETE FROM rate_limit_buckets WHERE full_at <= ?', (now,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return retry_after
+
+def create_rate_limiter():
+    """Build the limiter selected by RATE_LIMIT_BACKEND (memory or sqlite)"""
+    if os.environ.get('RATE_LIMIT_BACKEND', 'memory').lower() == 'sqlite':
+        return SQLiteTokenBucketLimiter(os.environ.get('RATE_LIMIT_DATABASE', 'rate_limits.db'))
+    return TokenBucketLimiter(int(os.environ.get('RATE_LIMIT_MAX_KEYS', '100000')))
+
+rate_limiter = create_rate_limiter()
+
+def rate_limit_keys():
+    """(scope, identity) pairs the current request is limited by"""
+    ip = request.remote_addr or 'unknown'
+    user = session.get('user_id')
+    if user is None:
+        # Before sign-in the account is only named by the form, which anyone can fill in:
+        # pairing it with the client still slows guessing from one address, but failed
+        # attempts from elsewhere cannot lock the account's owner out
+        email = request.form.get('email', '').strip().lower()
+        user = f'{ip}:{email}' if email else None
+    return (('ip', ip), ('user', user))
+
+def check_rate_limit(name):
+    """Take a token from every bucket of a limited route; return (scope, retry_after) or None"""
+    for scope, identity in rate_limit_keys():
+        spec = app.config['RATE_LIMITS'].get(name, {}).get(scope)
+        if not spec or identity is None:
+            continue
+        try:
+            retry_after = rate_limiter.take(f'{name}:{scope}:{identity}', *parse_rate(spec))
+        except Exception as e:
+            # Fail open: an unavailable limiter must not take the endpoint down with it
+            logger.error(f"Rate limiter error: {str(e)}")
+            return None
+        if retry_after:
+            return scope, retry_after
+    return None
+
+def rate_limit(name, methods=('POST',), on_limited=None):
+    """Decorator applying the token buckets configured in RATE_LIMITS[name].
+
+    Rejected requests get a 429 with Retry-After; on_limited builds the response
+    for HTML routes (a flashed message is already queued), JSON otherwise.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not app.config['RATE_LIMIT_ENABLED'] or request.method not in methods:
+                return f(*args, **kwargs)
+
+            limited = check_rate_limit(name)
+            if not limited:
+                return f(*args, **kwargs)
+
+            scope, retry_after = limited
+            retry_after = max(1, math.ceil(retry_after))
+            request_metrics.observe_rate_limited(name, scope)
+            logger.warning(f"Rate limited {name} ({scope}) from {request.remote_addr}, retry in {retry_after}s")
+
+            message = f'Too many requests. Please try again in {retry_after} seconds.'
+            if on_limited:
+                flash(message, 'error')
+                response = make_response(on_limited())
+                if response.status_code not in (301, 302, 303, 307, 308):
+                    response.status_code = 429
+            else:
+                response = make_response(jsonify({'success': False, 'error': message}), 429)
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        return decorated_function
+    return decorator
+
+# ============== COMPRESSION AND CONDITIONAL GET ==============
+
+COMPRESSIBLE_MIMETYPES = {'text/html', 'text/css', 'text/plain', 'text/csv', 'application/json',
+                          'application/x-ndjson', 'application/javascript', 'image/svg+xml'}
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # dynamic responses: much faster than the default of 11 for a few percent of size
+
+def _etag_salt():
+    """Changes whenever the code, templates or stylesheets are redeployed, so old ETags stop matching"""
+    paths = [os.path.abspath(__file__)]
+    for folder in (os.path.join(app.root_path, 'templates'), os.path.join(app.static_folder, 'css')):
+        paths += [os.path.join(folder, name) for name in sorted(os.listdir(folder))]
+    return hashlib.sha1(''.join(f'{path}:{os.path.getmtime(path)}' for path in paths).encode()).hexdigest()[:12]
+
+ETAG_SALT = _etag_salt()
+
+def current_data_version():
+    with get_db_connection() as conn:
+        return conn.execute('SELECT version FROM data_version WHERE id = 1').fetchone()[0]
+
+def conditional_get(max_age=None):
+    """Decorator answering If-None-Match with 304 before the view runs.
+
+    The weak ETag covers the data version, the viewer (pages are personalized),
+    the full URL and the deployed code. max_age caps how long an ETag stays
+    valid for pages showing relative times ("5 minutes ago"). Requests with
+    pending flash messages are not cached, since rendering consumes them.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method != 'GET' or '_flashes' in session:
+                return f(*args, **kwargs)
+            try:
+                version = current_data_version()
+            except Exception as e:
+                logger.warning(f"Data version unavailable, serving without ETag: {str(e)}")
+                return f(*args, **kwargs)
+
+            parts = [ETAG_SALT, version, session.get('user_id'), session.get('user_email'),
+                     session.get('user_role'), session.get('user_name'), request.full_path]
+            if max_age:
+                parts.append(int(time.time() // max_age))
+            etag = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated_function
+    return decorator
+
+def choose_content_encoding():
+    """Best encoding the client accepts: br when available, then gzip"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+def compress_chunks(chunks, encoding):
+    """Compress a streamed body chunk by chunk, flushing each so the client gets it right away"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        compress, flush, finish = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+    try:
+        for chunk in chunks:
+            if chunk:
+                yield compress(chunk.encode() if isinstance(chunk, str) else chunk) + flush()
+        yield finish()
+    finally:
+        # Closes the wrapped stream, and with it any connection it holds, if the client goes away
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+@app.after_request
+def compress_response(response):
+    """gzip/brotli-compress text responses above COMPRESSION_MIN_SIZE; streamed ones as they are sent"""
+    if (not app.config['COMPRESSION_ENABLED']
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_content_encoding()
+    if encoding is not None and response.is_streamed:
+        response.response = compress_chunks(response.response, encoding)
+        response.headers['Content-Encoding'] = encoding
+        response.headers.pop('Content-Length', None)
+        return response
+    if encoding is None or (response.content_length or 0) < app.config['COMPRESSION_MIN_SIZE']:
+        return response
+
+    data = response.get_data()
+    if encoding == 'br':
+        data = brotli.compress(data, quality=BROTLI_QUALITY)
+    else:
+        data = gzip.compress(data, compresslevel=GZIP_LEVEL)
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+# ============== STATIC ASSETS ==============
+
+# Bundles are concatenated in this order; pages that only need the base styles use core.css
+ASSET_BUNDLES = {
+    'core.css': ['css/style.css'],
+    'app.css': ['css/style.css', 'css/light-theme-enhanced.css', 'css/enhancements.css',
+                'css/dark-theme-enhanced.css'],
+}
+ASSETS_DIR = os.path.join(app.root_path, 'static', 'dist')
+ASSET_MAX_AGE = 365 * 24 * 3600
+ASSET_ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+_CSS_STRING_OR_COMMENT = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet, leaving strings untouched"""
+    strings = []
+
+    def protect(match):
+        if match.group(1) is None:
+            return ''
+        strings.append(match.group(1))
+        return f'\x00{len(strings) - 1}\x00'
+
+    css = _CSS_STRING_OR_COMMENT.sub(protect, css)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return re.sub(r'\x00(\d+)\x00', lambda match: strings[int(match.group(1))], css).strip()
+
+def build_assets(output_dir=ASSETS_DIR):
+    """Bundle, minify and fingerprint ASSET_BUNDLES with .gz/.br variants; returns the manifest.
+
+    Earlier builds are left in place so pages rendered before a deploy can
+    still load the files they reference.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {}
+    for bundle, sources in ASSET_BUNDLES.items():
+        parts = []
+        for source in sources:
+            with open(os.path.join(app.static_folder, source), encoding='utf-8') as f:
+                parts.append(minify_css(f.read()))
+        data = '\n'.join(parts).encode('utf-8')
+
+        stem, ext = os.path.splitext(bundle)
+        name = f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+        variants = {name: data, name + '.gz': gzip.compress(data, compresslevel=9)}
+        if brotli is not None:
+            variants[name + '.br'] = brotli.compress(data, quality=11)
+        for filename, content in variants.items():
+            path = os.path.join(output_dir, filename)
+            if not os.path.exists(path):
+                with open(path + '.tmp', 'wb') as f:
+                    f.write(content)
+                os.replace(path + '.tmp', path)
+        manifest[bundle] = name
+
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+def load_asset_manifest():
+    """The built manifest while it is newer than every source, otherwise None"""
+    manifest_path = os.path.join(ASSETS_DIR, 'manifest.json')
+    sources = {source for sources in ASSET_BUNDLES.values() for source in sources}
+    try:
+        built_at = os.path.getmtime(manifest_path)
+        if all(os.path.getmtime(os.path.join(app.static_folder, source)) <= built_at for source in sources):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if set(manifest) == set(ASSET_BUNDLES):
+                return manifest
+    except (OSError, ValueError):
+        pass
+    return None
+
+def use_asset_manifest(manifest):
+    """Serve the bundles in manifest from now on; an empty manifest serves the sources"""
+    asset_manifest.clear()
+    asset_manifest.update(manifest)
+
+# Importing the app never writes to the tree: bundles come from `build-assets`
+# or warm_up(), and until one has run the unbundled sources are served
+asset_manifest = {}
+if app.config['ASSETS_ENABLED']:
+    manifest = load_asset_manifest()
+    if manifest is None:
+        logger.info("No current asset build, serving unbundled stylesheets")
+    else:
+        use_asset_manifest(manifest)
+
+@app.context_processor
+def inject_asset_urls():
+    def asset_urls(bundle):
+        """Stylesheet URLs for a bundle: the fingerprinted file, or its sources when bundling is off"""
+        if bundle in asset_manifest:
+            return [url_for('assets', filename=asset_manifest[bundle])]
+        return [url_for('static', filename=source) for source in ASSET_BUNDLES[bundle]]
+    return {'asset_urls': asset_urls}
+
+@app.route('/assets/<path:filename>')
+def assets(filename):
+    """Fingerprinted bundles: cached for a year, precompressed variant chosen per client"""
+    if filename == 'manifest.json' or filename.endswith(('.gz', '.br', '.tmp')):
+        return Response('Not found\n', status=404, mimetype='text/plain')
+    encoding = choose_content_encoding()
+    if encoding and not os.path.exists(os.path.join(ASSETS_DIR, filename + ASSET_ENCODINGS[encoding])):
+        encoding = None
+
+    response = send_from_directory(ASSETS_DIR, filename + ASSET_ENCODINGS.get(encoding, ''),
+                                   mimetype=mimetypes.guess_type(filename)[0], max_age=ASSET_MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
 # ============== AUTHENTICATION ROUTES ==============
 
 @app.route('/')
@@ -408,6 +1681,10 @@ def signup():
                 flash(f'Account created successfully as {role.title()}! Please login.', 'success')
                 return redirect(url_for('login'))
                 
+        except PasswordHashBusy:
+            logger.warning(f"Signup rejected, password hashing pool busy: {email}")
+            flash('The server is busy. Please try again in a moment.', 'error')
+            return render_template('signup.html'), 503
         except Exception as e:
             logger.error(f"Signup error: {str(e)}")
             flash('An error occurred during registration. Please try again.', 'error')
@@ -449,30 +1726,32 @@ def google_callback():
             return redirect(url_for('login'))
         
         # Exchange code for token
-        google = OAuth2Session(
+        google = mount_http_adapter(OAuth2Session(
             client_id=GOOGLE_OAUTH_CONFIG['client_id'],
             redirect_uri=GOOGLE_OAUTH_CONFIG['redirect_uri'],
             state=state
-        )
+        ))
         token = google.fetch_token(
             GOOGLE_OAUTH_CONFIG['token_uri'],
             client_secret=GOOGLE_OAUTH_CONFIG['client_secret'],
-            authorization_response=request.url
+            authorization_response=request.url,
+            timeout=HTTP_TIMEOUT
         )
         
         # Get user info
-        user_info = google.get('https://openidconnect.googleapis.com/v1/userinfo').json()
+        user_info = fetch_json(GOOGLE_OAUTH_CONFIG['userinfo_uri'], http=google)
         
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
             # Check if user exists
-            cursor.execute('SELECT id FROM users WHERE oauth_provider = ? AND oauth_id = ?',
+            cursor.execute('SELECT id, email, full_name FROM users WHERE oauth_provider = ? AND oauth_id = ?',
                          ('google', user_info['sub']))
             existing_user = cursor.fetchone()
             
             if existing_user:
                 user_id = existing_user['id']
+                email, full_name = existing_user['email'], existing_user['full_name']
             else:
                 # Create new user
                 email = user_info.get('email', '').lower()
@@ -488,7 +1767,7 @@ def google_callback():
                     cursor.execute('''
                         INSERT INTO users (email, password, role, full_name, oauth_provider, oauth_id, oauth_token)
                         VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (email, generate_password_hash('oauth'), 'user', full_name, 'google', user_info['sub'], json.dumps(token)))
+                    ''', (email, hash_password('oauth'), 'user', full_name, 'google', user_info['sub'], json.dumps(token)))
                     
                     conn.commit()
                     user_id = cursor.lastrowid
@@ -557,7 +1836,7 @@ def github_callback():
         }
         headers = {'Accept': 'application/json'}
         
-        token_response = requests.post(token_url, json=payload, headers=headers)
+        token_response = http_session.post(token_url, json=payload, headers=headers, timeout=HTTP_TIMEOUT)
         token_data = token_response.json()
         
         if 'error' in token_data:
@@ -566,29 +1845,35 @@ def github_callback():
         
         access_token = token_data.get('access_token')
         
-        # Get user info
+        # Get user info and emails concurrently (the email is needed when it is not public)
         user_headers = {'Authorization': f'token {access_token}', 'Accept': 'application/json'}
-        user_response = requests.get('https://api.github.com/user', headers=user_headers)
-        user_info = user_response.json()
+        user_future = http_executor.submit(fetch_json, f"{GITHUB_OAUTH_CONFIG['api_url']}/user", user_headers)
+        emails_future = http_executor.submit(fetch_json, f"{GITHUB_OAUTH_CONFIG['api_url']}/user/emails", user_headers)
+        user_info = user_future.result()
         
-        # Get email if not public
         if not user_info.get('email'):
-            email_response = requests.get('https://api.github.com/user/emails', headers=user_headers)
-            emails = email_response.json()
-            user_info['email'] = next((e['email'] for e in emails if e['primary']), emails[0]['email'] if emails else None)
+            try:
+                emails = emails_future.result()
+            except requests.RequestException as e:
+                logger.warning(f"GitHub email lookup failed: {str(e)}")
+                emails = []
+            # Only a verified address may match (and so sign in as) an existing account
+            verified = [e for e in emails if e.get('verified')]
+            user_info['email'] = next((e['email'] for e in verified if e['primary']), verified[0]['email'] if verified else None)
         
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
             # Check if user exists
-            cursor.execute('SELECT id FROM users WHERE oauth_provider = ? AND oauth_id = ?',
+            cursor.execute('SELECT id, email, full_name FROM users WHERE oauth_provider = ? AND oauth_id = ?',
                          ('github', str(user_info['id'])))
             existing_user = cursor.fetchone()
             
             if existing_user:
                 user_id = existing_user['id']
+                email, full_name = existing_user['email'], existing_user['full_name']
             else:
-                email = user_info.get('email', f"github_{user_info['login']}@github.local").lower()
+                email = (user_info.get('email') or f"github_{user_info['login']}@github.local").lower()
                 full_name = user_info.get('name', user_info.get('login', ''))
                 
                 # Check if email already exists
@@ -601,7 +1886,7 @@ def github_callback():
                     cursor.execute('''
                         INSERT INTO users (email, password, role, full_name, oauth_provider, oauth_id, oauth_token)
                         VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (email, generate_password_hash('oauth'), 'user', full_name, 'github', str(user_info['id']), json.dumps(token_data)))
+                    ''', (email, hash_password('oauth'), 'user', full_name, 'github', str(user_info['id']), json.dumps(token_data)))
                     
                     conn.commit()
                     user_id = cursor.lastrowid
@@ -630,6 +1915,7 @@ def github_callback():
         return redirect(url_for('login'))
 
 @app.route('/login', methods=['GET', 'POST'])
+@rate_limit('login', on_limited=lambda: render_template('login.html'))
 def login():
     """User login with secure password verification"""
     if request.method == 'POST':
@@ -649,6 +1935,15 @@ def login():
                 user = cursor.fetchone()
                 
                 if user and verify_password(user['password'], password):
+                    # Transparently upgrade hashes made with older cost parameters
+                    if password_needs_rehash(user['password']):
+                        try:
+                            cursor.execute('UPDATE users SET password = ? WHERE id = ?',
+                                         (hash_password(password), user['id']))
+                            logger.info(f"Password hash upgraded for: {email}")
+                        except PasswordHashBusy:
+                            pass
+                    
                     session['user_id'] = user['id']
                     session['user_email'] = user['email']
                     session['user_role'] = user['role']
@@ -661,6 +1956,10 @@ def login():
                     flash('Invalid email or password', 'error')
                     return render_template('login.html')
                     
+        except PasswordHashBusy:
+            logger.warning(f"Login rejected, password hashing pool busy: {email}")
+            flash('The server is busy. Please try again in a moment.', 'error')
+            return render_template('login.html'), 503
         except Exception as e:
             logger.error(f"Login error: {str(e)}")
             flash('An error occurred during login. Please try again.', 'error')
@@ -767,6 +2066,7 @@ def profile():
 
 @app.route('/generate-avatar', methods=['POST'])
 @login_required
+@rate_limit('generate_avatar', on_limited=lambda: redirect(url_for('profile')))
 def generate_avatar():
     """Generate animated Ghibli-style avatar using Gemini API"""
     try:
@@ -928,19 +2228,14 @@ def view_users():
     """View all registered users (Admin only)"""
     try:
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT u.id, u.email, u.role, u.created_at,
-                       COUNT(b.id) as bugs_created,
-                       COUNT(DISTINCT ba.id) as bugs_assigned
+            users = USER_SUMMARY.fetchall(conn, f'''
+                SELECT {USER_SUMMARY.columns}
                 FROM users u
                 LEFT JOIN bugs b ON u.id = b.created_by
                 LEFT JOIN bugs ba ON u.id = ba.assigned_to
                 GROUP BY u.id
                 ORDER BY u.created_at DESC
             ''')
-            users = cursor.fetchall()
             
             return render_template('users.html', users=users)
     
@@ -949,205 +2244,380 @@ def view_users():
         flash('Error loading users. Please try again.', 'error')
         return redirect(url_for('dashboard'))
 
-# ============== BUG MANAGEMENT ROUTES ==============
+@app.route('/admin/query-profiler', methods=['GET', 'POST'])
+@admin_required
+def query_profiler():
+    """Top SQL statements by cost, with runtime profiler controls (Admin only)"""
+    if request.method == 'POST':
+        action = request.form.get('action', '')
+        if action == 'enable':
+            app.config['QUERY_PROFILER_ENABLED'] = True
+            flash('Query profiler enabled', 'success')
+        elif action == 'disable':
+            app.config['QUERY_PROFILER_ENABLED'] = False
+            flash('Query profiler disabled', 'success')
+        elif action == 'reset':
+            statement_profiler.reset()
+            flash('Query statistics cleared', 'success')
+        elif action == 'threshold':
+            try:
+                threshold = float(request.form.get('slow_query_ms', ''))
+            except ValueError:
+                threshold = None
+            if threshold is None or not math.isfinite(threshold) or threshold < 0:
+                flash('Threshold must be a non-negative number', 'error')
+                return render_query_profiler(), 400
+            app.config['SLOW_QUERY_MS'] = threshold
+            flash(f'Slow query threshold set to {threshold:g} ms', 'success')
+        logger.info(f"Query profiler action '{action}' by {session['user_email']}")
+        return redirect(url_for('query_profiler'))
 
-@app.route('/dashboard')
+    return render_query_profiler()
+
+def render_query_profiler():
+    """The profiler page for the current statistics"""
+    order_by = request.args.get('order_by', 'total_ms')
+    return render_template('query_profiler.html',
+                           statements=statement_profiler.top(limit=50, order_by=order_by),
+                           order_by=order_by,
+                           enabled=app.config['QUERY_PROFILER_ENABLED'],
+                           slow_query_ms=app.config['SLOW_QUERY_MS'])
+
+# ============== BUG MANAGEMENT ROUTES ==============
+
+# Users embedded in the dashboard for the assignee picker before it switches to search-as-you-type
+ASSIGNEE_PRELOAD_LIMIT = int(os.environ.get('ASSIGNEE_PRELOAD_LIMIT', '2000'))
+USER_SEARCH_MAX_LIMIT = 50
+
+# Comments on the bug page: the newest page is rendered, older ones are loaded on demand
+COMMENTS_PAGE_SIZE = int(os.environ.get('COMMENTS_PAGE_SIZE', '50'))
+COMMENTS_MAX_PAGE_SIZE = 200
+
+def parse_page_cursor(value):
+    """Parse a '<created_at_ms>.<id>' comments or history cursor (raises ValueError)"""
+    created_at_ms, _, comment_id = value.partition('.')
+    return int(created_at_ms), int(comment_id)
+
+def comment_page(conn, bug_id, before=None, limit=COMMENTS_PAGE_SIZE):
+    """One page of a bug's comments ending just before `before`, oldest first.
+
+    Keyset pagination down idx_comments_bug_created_at_ms (bug_id, created_at_ms,
+    then the implicit rowid): each page is an index range scan however deep it
+    is. Returns (comments, cursor of the next older page or None).
+    """
+    keyset_sql, params = '', [bug_id]
+    if before is not None:
+        keyset_sql = ' AND (c.created_at_ms, c.id) < (?, ?)'
+        params += list(before)
+    comments = COMMENT_ENTRY.fetchall(conn, f'''
+        SELECT {COMMENT_ENTRY.columns}
+        FROM comments c
+        JOIN users u ON c.user_id = u.id
+        WHERE c.bug_id = ?{keyset_sql}
+        ORDER BY c.created_at_ms DESC, c.id DESC
+        LIMIT ?
+    ''', params + [limit + 1])
+    older = None
+    if len(comments) > limit:
+        comments = comments[:limit]
+        older = f'{comments[-1].created_at_ms}.{comments[-1].id}'
+    comments.reverse()
+    return comments, older
+
+# Bug history timeline: entries per page, and the most history rows one page reads
+# while folding a long burst of repeats (a burst longer than that continues on the next page)
+HISTORY_PAGE_SIZE = int(os.environ.get('HISTORY_PAGE_SIZE', '50'))
+HISTORY_MAX_PAGE_SIZE = 200
+HISTORY_SCAN_ROWS = int(os.environ.get('HISTORY_SCAN_ROWS', '2000'))
+
+# Actions written by log_bug_history, with their filter labels
+HISTORY_ACTIONS = {
+    'bug_created': 'Bug created',
+    'viewed_bug': 'Viewed',
+    'comment_added': 'Comment added',
+    'status_changed': 'Status changed',
+    'assigned_to': 'Assigned',
+    'priority_changed': 'Priority changed',
+    'title_changed': 'Title changed',
+    'description_changed': 'Description updated',
+    'bug_edited': 'Bug edited',
+}
+
+def history_page(conn, bug_id, before=None, limit=HISTORY_PAGE_SIZE, actions=None, actor_id=None, collapse=True):
+    """One page of a bug's history ending just before `before`, newest first.
+
+    Rows are read by keyset down idx_history_bug_created_at_ms (bug_id,
+    created_at_ms, then the implicit rowid), optionally only the given actions
+    or one actor's. With `collapse`, consecutive identical events (same action,
+    user and values, such as a burst of views) come back as one entry: its
+    newest row, `repeats` and the oldest row as first_*. Returns (entries,
+    cursor of the next older page or None).
+    """
+    filter_sql, params = '', [bug_id]
+    if before is not None:
+        filter_sql += ' AND (bh.created_at_ms, bh.id) < (?, ?)'
+        params += list(before)
+    if actions:
+        filter_sql += f" AND bh.action IN ({', '.join('?' * len(actions))})"
+        params += list(actions)
+    if actor_id is not None:
+        filter_sql += ' AND bh.user_id = ?'
+        params.append(actor_id)
+    if collapse:
+        starts_run = '''(action IS NOT LAG(action) OVER w OR user_id IS NOT LAG(user_id) OVER w
+                          OR old_value IS NOT LAG(old_value) OVER w OR new_value IS NOT LAG(new_value) OVER w)'''
+    else:
+        starts_run = '1'
+    sql = f'''
+        WITH scanned AS (
+            SELECT bh.id, bh.user_id, bh.action, bh.old_value, bh.new_value, bh.created_at, bh.created_at_ms
+            FROM bug_history bh
+            WHERE bh.bug_id = ?{filter_sql}
+            ORDER BY bh.created_at_ms DESC, bh.id DESC
+            LIMIT ?
+        ), flagged AS (
+            SELECT *, ROW_NUMBER() OVER w AS position, {starts_run} AS starts_run
+            FROM scanned
+            WINDOW w AS (ORDER BY created_at_ms DESC, id DESC)
+        ), numbered AS (
+            SELECT *, SUM(starts_run) OVER (ORDER BY position) AS run FROM flagged
+        )
+        SELECT {HISTORY_RUN.columns}
+        FROM (
+            SELECT *, COUNT(*) OVER run_rows AS repeats, LAST_VALUE(id) OVER run_rows AS first_id,
+                   LAST_VALUE(created_at) OVER run_rows AS first_created_at,
+                   LAST_VALUE(created_at_ms) OVER run_rows AS first_created_at_ms,
+                   LAST_VALUE(position) OVER run_rows AS scan_position
+            FROM numbered
+            WINDOW run_rows AS (PARTITION BY run ORDER BY position
+                                ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+        ) head
+        LEFT JOIN users u ON head.user_id = u.id
+        WHERE head.starts_run
+        ORDER BY head.run
+        LIMIT ?
+    '''
+    # Folding costs per row read, so read just enough: one row per entry, and
+    # four times as many each time repeats leave the page short
+    scan = min(limit + 1, HISTORY_SCAN_ROWS)
+    while True:
+        entries = HISTORY_RUN.fetchall(conn, sql, params + [scan, limit + 1])
+        scan_full = bool(entries) and entries[-1].scan_position == scan
+        if len(entries) > limit or not scan_full or scan >= HISTORY_SCAN_ROWS:
+            break
+        scan = min(scan * 4, HISTORY_SCAN_ROWS)
+    older = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        older = f'{entries[-1].first_created_at_ms}.{entries[-1].first_id}'
+    elif scan_full:
+        # The scan stopped inside the last run; the rest of it starts the next page
+        older = f'{entries[-1].first_created_at_ms}.{entries[-1].first_id}'
+    return entries, older
+
+# Streamed pages are sent in chunks of about this many characters rather than per template fragment
+STREAM_CHUNK_SIZE = int(os.environ.get('STREAM_CHUNK_SIZE', '16384'))
+
+def coalesce_chunks(chunks, size=STREAM_CHUNK_SIZE):
+    """Join the many small strings a streamed template yields into chunks of about `size`"""
+    buffer, buffered = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield ''.join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+def dashboard_panels(conn):
+    """Everything on the dashboard besides the bug table"""
+    cursor = conn.cursor()
+    
+    # Get statistics
+    stats = dashboard_stats(conn)
+    
+    # Get recent activity (last 10 history records) - with error handling
+    recent_activity = []
+    notifications = []
+    try:
+        recent_activity = ACTIVITY_ENTRY.fetchall(conn, f'''
+            SELECT {ACTIVITY_ENTRY.columns}
+            FROM bug_history bh
+            LEFT JOIN users u ON bh.user_id = u.id
+            LEFT JOIN bugs b ON bh.bug_id = b.id
+            ORDER BY bh.created_at_ms DESC, bh.id DESC
+            LIMIT 10
+        ''')
+
+        # Personalized notifications: assignment to me, comments/status on bugs assigned to me
+        notifications = NOTIFICATION_ENTRY.fetchall(conn, f'''
+            SELECT {NOTIFICATION_ENTRY.columns}
+            FROM bug_history bh
+            LEFT JOIN users actor ON bh.user_id = actor.id
+            LEFT JOIN bugs b ON bh.bug_id = b.id
+            WHERE (
+                (bh.action = 'assigned_to' AND bh.new_value = ?)
+                OR (b.assigned_to = ? AND bh.action IN ('comment_added', 'status_changed'))
+            )
+            ORDER BY bh.created_at_ms DESC, bh.id DESC
+            LIMIT 8
+        ''', (session.get('user_email'), session.get('user_id')))
+    except Exception as activity_error:
+        logger.warning(f"Could not load recent activity: {str(activity_error)}")
+        recent_activity = []
+        notifications = []
+    
+    # Assignee picker data, rendered once per page (admins only); with more users
+    # than ASSIGNEE_PRELOAD_LIMIT the picker searches /api/users/search instead
+    assignees = None
+    if session.get('user_role') == 'admin':
+        user_count = cursor.execute('SELECT COUNT(*) FROM users').fetchone()[0]
+        if user_count <= ASSIGNEE_PRELOAD_LIMIT:
+            assignees = USER_OPTION.fetchall(conn, f'SELECT {USER_OPTION.columns} FROM users ORDER BY email')
+    
+    # Get unassigned bugs with high priority
+    unassigned_bugs = BUG_PANEL.fetchall(conn, f'''
+        SELECT {BUG_PANEL.columns}
+        FROM bugs b
+        LEFT JOIN users assignee ON b.assigned_to = assignee.id
+        WHERE b.assigned_to IS NULL
+        ORDER BY b.priority DESC, b.created_at_ms DESC, b.id DESC
+        LIMIT 10
+    ''')
+    
+    # Get high priority bugs
+    high_priority_bugs = BUG_PANEL.fetchall(conn, f'''
+        SELECT {BUG_PANEL.columns}
+        FROM bugs b
+        LEFT JOIN users assignee ON b.assigned_to = assignee.id
+        WHERE b.priority = 'High'
+        ORDER BY b.created_at_ms DESC, b.id DESC
+        LIMIT 10
+    ''')
+    
+    # Get in-progress bugs
+    in_progress_bugs_list = BUG_PANEL.fetchall(conn, f'''
+        SELECT {BUG_PANEL.columns}
+        FROM bugs b
+        LEFT JOIN users assignee ON b.assigned_to = assignee.id
+        WHERE b.status = 'In Progress'
+        ORDER BY b.created_at_ms DESC, b.id DESC
+        LIMIT 10
+    ''')
+    
+    return dict(assignees=assignees,
+                stats=stats,
+                recent_activity=recent_activity,
+                notifications=notifications,
+                unassigned_bugs=unassigned_bugs,
+                unassigned_count=len(unassigned_bugs),
+                high_priority_bugs=high_priority_bugs,
+                high_priority_count=len(high_priority_bugs),
+                in_progress_bugs=in_progress_bugs_list,
+                in_progress_count=len(in_progress_bugs_list))
+
+def stream_dashboard(query, params, filters):
+    """The dashboard as a streamed response.
+
+    Every query runs first, on one read snapshot that is released before the
+    first byte is sent: a failing query still gets the usual error page, and a
+    slow client never holds a read transaction (and with it WAL checkpoints)
+    open. Only the HTML is produced as the client reads it.
+    """
+    with get_snapshot_connection('wal') as conn:
+        panels = dashboard_panels(conn)
+        bugs = BUG_LIST.fetchall(conn, query, params)
+
+    def generate(chunks):
+        try:
+            yield from chunks
+        except Exception as e:
+            # The 200 status has gone out already: end the page with an error, not silently
+            logger.error(f"Dashboard render error: {str(e)}")
+            yield '<div class="alert alert-error">Error loading dashboard. Please try again.</div>'
+
+    # Flashes live in the session, whose cookie goes out before the body does
+    get_flashed_messages(with_categories=True)
+    chunks = coalesce_chunks(stream_template('dashboard.html', bugs=bugs, **filters, **panels))
+    return Response(generate(chunks), mimetype='text/html')
+
+@app.route('/dashboard')
 @login_required
+@conditional_get(max_age=60)
 def dashboard():
-    """Main dashboard showing all bugs with statistics"""
+    """Main dashboard showing all bugs with statistics (streamed with DASHBOARD_STREAMING)"""
     try:
+        # Get filter parameters
+        status_filter = request.args.get('status', '')
+        priority_filter = request.args.get('priority', '')
+        search_query = sanitize_input(request.args.get('search', ''), 200)
+        
+        # Build query with filters
+        query = f'''
+            SELECT {BUG_LIST.columns}
+            FROM bugs b
+            LEFT JOIN users creator ON b.created_by = creator.id
+            LEFT JOIN users assignee ON b.assigned_to = assignee.id
+            WHERE 1=1
+        '''
+        params = []
+        
+        if status_filter:
+            query += ' AND b.status = ?'
+            params.append(status_filter)
+        
+        if priority_filter:
+            query += ' AND b.priority = ?'
+            params.append(priority_filter)
+        
+        if search_query:
+            query += ' AND (b.title LIKE ? OR b.description LIKE ?)'
+            params.extend([f'%{search_query}%', f'%{search_query}%'])
+        
+        # Created-date range, a range scan on idx_bugs_created_at_ms
+        date_from = request.args.get('from', '')
+        date_to = request.args.get('to', '')
+        try:
+            from_ms, to_ms = parse_date_range(request.args)
+        except ValueError as e:
+            flash(str(e), 'error')
+            from_ms = to_ms = None
+            date_from = date_to = ''
+        range_sql, range_params = date_range_sql('b.created_at_ms', from_ms, to_ms)
+        query += range_sql
+        params.extend(range_params)
+        
+        query += ' ORDER BY b.created_at_ms DESC, b.id DESC'
+        
+        filters = dict(status_filter=status_filter,
+                       priority_filter=priority_filter,
+                       search_query=search_query,
+                       date_from=date_from,
+                       date_to=date_to)
+        
+        if app.config['DASHBOARD_STREAMING']:
+            return stream_dashboard(query, params, filters)
+        
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Get filter parameters
-            status_filter = request.args.get('status', '')
-            priority_filter = request.args.get('priority', '')
-            search_query = sanitize_input(request.args.get('search', ''), 200)
-            
-            # Build query with filters
-            query = '''
-                SELECT b.*, 
-                       creator.email as creator_email,
-                       assignee.email as assignee_email
-                FROM bugs b
-                LEFT JOIN users creator ON b.created_by = creator.id
-                LEFT JOIN users assignee ON b.assigned_to = assignee.id
-                WHERE 1=1
-            '''
-            params = []
-            
-            if status_filter:
-                query += ' AND b.status = ?'
-                params.append(status_filter)
-            
-            if priority_filter:
-                query += ' AND b.priority = ?'
-                params.append(priority_filter)
-            
-            if search_query:
-                query += ' AND (b.title LIKE ? OR b.description LIKE ?)'
-                params.extend([f'%{search_query}%', f'%{search_query}%'])
-            
-            query += ' ORDER BY b.created_at DESC'
-            
-            cursor.execute(query, params)
-            bugs = cursor.fetchall()
-            
-            # Get statistics
-            cursor.execute('SELECT COUNT(*) as total FROM bugs')
-            total_bugs = cursor.fetchone()['total']
-            
-            cursor.execute("SELECT COUNT(*) as open FROM bugs WHERE status = 'Open'")
-            open_bugs = cursor.fetchone()['open']
-            
-            cursor.execute("SELECT COUNT(*) as in_progress FROM bugs WHERE status = 'In Progress'")
-            in_progress_bugs = cursor.fetchone()['in_progress']
-            
-            cursor.execute("SELECT COUNT(*) as fixed FROM bugs WHERE status = 'Fixed'")
-            fixed_bugs = cursor.fetchone()['fixed']
-            
-            cursor.execute("SELECT COUNT(*) as high FROM bugs WHERE priority = 'High'")
-            high_priority = cursor.fetchone()['high']
-            
-            cursor.execute("SELECT COUNT(*) as closed FROM bugs WHERE status = 'Closed'")
-            closed_bugs = cursor.fetchone()['closed']
-            
-            # Get recent activity (last 10 history records) - with error handling
-            recent_activity = []
-            notifications = []
-            try:
-                cursor.execute('''
-                    SELECT bh.*, u.email as user_email, b.title as bug_title
-                    FROM bug_history bh
-                    LEFT JOIN users u ON bh.user_id = u.id
-                    LEFT JOIN bugs b ON bh.bug_id = b.id
-                    ORDER BY bh.created_at DESC
-                    LIMIT 10
-                ''')
-                recent_activity = cursor.fetchall()
-
-                # Personalized notifications: assignment to me, comments/status on bugs assigned to me
-                cursor.execute('''
-                    SELECT bh.*, actor.email as actor_email, b.title as bug_title
-                    FROM bug_history bh
-                    LEFT JOIN users actor ON bh.user_id = actor.id
-                    LEFT JOIN bugs b ON bh.bug_id = b.id
-                    WHERE (
-                        (bh.action = 'assigned_to' AND bh.new_value = ?)
-                        OR (b.assigned_to = ? AND bh.action IN ('comment_added', 'status_changed'))
-                    )
-                    ORDER BY bh.created_at DESC
-                    LIMIT 8
-                ''', (session.get('user_email'), session.get('user_id')))
-                notifications = cursor.fetchall()
-            except Exception as activity_error:
-                logger.warning(f"Could not load recent activity: {str(activity_error)}")
-                recent_activity = []
-                notifications = []
-            
-            # Get all users for assignment dropdown
-            cursor.execute('SELECT id, email, role FROM users ORDER BY email')
-            users = cursor.fetchall()
-            
-            # Get unassigned bugs with high priority
-            cursor.execute('''
-                SELECT b.*, 
-                       creator.email as creator_email,
-                       assignee.email as assignee_email
-                FROM bugs b
-                LEFT JOIN users creator ON b.created_by = creator.id
-                LEFT JOIN users assignee ON b.assigned_to = assignee.id
-                WHERE b.assigned_to IS NULL
-                ORDER BY b.priority DESC, b.created_at DESC
-                LIMIT 10
-            ''')
-            unassigned_bugs = cursor.fetchall()
-            unassigned_count = len(unassigned_bugs)
-            
-            # Get high priority bugs
-            cursor.execute('''
-                SELECT b.*, 
-                       creator.email as creator_email,
-                       assignee.email as assignee_email
-                FROM bugs b
-                LEFT JOIN users creator ON b.created_by = creator.id
-                LEFT JOIN users assignee ON b.assigned_to = assignee.id
-                WHERE b.priority = 'High'
-                ORDER BY b.created_at DESC
-                LIMIT 10
-            ''')
-            high_priority_bugs = cursor.fetchall()
-            high_priority_count = len(high_priority_bugs)
-            
-            # Get in-progress bugs
-            cursor.execute('''
-                SELECT b.*, 
-                       creator.email as creator_email,
-                       assignee.email as assignee_email
-                FROM bugs b
-                LEFT JOIN users creator ON b.created_by = creator.id
-                LEFT JOIN users assignee ON b.assigned_to = assignee.id
-                WHERE b.status = 'In Progress'
-                ORDER BY b.created_at DESC
-                LIMIT 10
-            ''')
-            in_progress_bugs_list = cursor.fetchall()
-            in_progress_count = len(in_progress_bugs_list)
-            
-            stats = {
-                'total': total_bugs,
-                'open': open_bugs,
-                'in_progress': in_progress_bugs,
-                'fixed': fixed_bugs,
-                'high_priority': high_priority,
-                'closed': closed_bugs
-            }
-            
-            return render_template('dashboard.html', 
-                                 bugs=bugs, 
-                                 users=users,
-                                 status_filter=status_filter,
-                                 priority_filter=priority_filter,
-                                 search_query=search_query,
-                                 stats=stats,
-                                 recent_activity=recent_activity,
-                                 notifications=notifications,
-                                 unassigned_bugs=unassigned_bugs,
-                                 unassigned_count=unassigned_count,
-                                 high_priority_bugs=high_priority_bugs,
-                                 high_priority_count=high_priority_count,
-                                 in_progress_bugs=in_progress_bugs_list,
-                                 in_progress_count=in_progress_count)
+            bugs = BUG_LIST.fetchall(conn, query, params)
+            return render_template('dashboard.html', bugs=bugs, **filters, **dashboard_panels(conn))
         
     except Exception as e:
         logger.error(f"Dashboard error: {str(e)}")
         flash('Error loading dashboard. Please try again.', 'error')
-        return render_template('dashboard.html', bugs=[], users=[], stats={}, recent_activity=[], notifications=[])
+        return render_template('dashboard.html', bugs=[], assignees=None, stats={}, recent_activity=[],
+                               notifications=[], unassigned_bugs=[], high_priority_bugs=[], in_progress_bugs=[])
 
 @app.route('/bug/new', methods=['GET', 'POST'])
 @login_required
 def new_bug():
     """Create a new bug report with validation and image upload"""
     if request.method == 'POST':
-        title = sanitize_input(request.form.get('title', ''), 200)
-        description = sanitize_input(request.form.get('description', ''), 2000)
-        steps = sanitize_input(request.form.get('steps', ''), 2000)
-        expected_result = sanitize_input(request.form.get('expected_result', ''), 2000)
-        actual_result = sanitize_input(request.form.get('actual_result', ''), 2000)
-        screenshot_url = sanitize_input(request.form.get('screenshot_url', ''), 500)
-        priority = request.form.get('priority', 'Medium')
-        
         # Validation
-        if not title or not description:
-            flash('Title and description are required', 'error')
-            return render_template('new_bug.html')
-        
-        if len(title) < 5:
-            flash('Title must be at least 5 characters long', 'error')
-            return render_template('new_bug.html')
-        
-        if priority not in ['Low', 'Medium', 'High']:
-            flash('Invalid priority level', 'error')
+        bug, error = validate_bug_fields(request.form)
+        if error:
+            flash(error, 'error')
             return render_template('new_bug.html')
         
         # Handle file upload
@@ -1173,11 +2643,13 @@ def new_bug():
                 cursor = conn.cursor()
                 
                 cursor.execute('''
-                    INSERT INTO bugs (title, description, steps, expected_result, actual_result, screenshot_url, screenshot_path, priority, created_by)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (title, description, steps, expected_result, actual_result, screenshot_url, screenshot_path, priority, session['user_id']))
+                    INSERT INTO bugs (title, description, steps, expected_result, actual_result, screenshot_url, screenshot_path, priority, created_by, created_at_ms)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (bug['title'], bug['description'], bug['steps'], bug['expected_result'], bug['actual_result'],
+                      bug['screenshot_url'], screenshot_path, bug['priority'], session['user_id'], now_ms()))
+                log_bug_history(conn, cursor.lastrowid, session['user_id'], 'bug_created', None, bug['title'])
                 
-                logger.info(f"New bug created by {session['user_email']}: {title}")
+                logger.info(f"New bug created by {session['user_email']}: {bug['title']}")
                 flash('Bug reported successfully!', 'success')
                 return redirect(url_for('dashboard'))
                 
@@ -1218,27 +2690,57 @@ def view_bug(bug_id):
             except Exception as log_error:
                 logger.warning(f"Failed to log view event for bug {bug_id}: {log_error}")
             
-            # Get comments
-            cursor.execute('''
-                SELECT c.*, u.email as user_email
-                FROM comments c
-                JOIN users u ON c.user_id = u.id
-                WHERE c.bug_id = ?
-                ORDER BY c.created_at ASC
-            ''', (bug_id,))
-            comments = cursor.fetchall()
+            # Newest page of comments; older pages come from /api/bugs/<id>/comments
+            comments, older_comments = comment_page(conn, bug_id)
             
             # Get all users for assignment with roles
-            cursor.execute('SELECT id, email, role FROM users ORDER BY email')
-            users = cursor.fetchall()
+            users = USER_OPTION.fetchall(conn, f'SELECT {USER_OPTION.columns} FROM users ORDER BY email')
+
+            # Similar bugs from the similarity index (an optional panel: never fail the page over it)
+            try:
+                related = related_bugs(conn, bug)
+            except Exception as related_error:
+                logger.warning(f"Failed to find related bugs for bug {bug_id}: {related_error}")
+                related = []
             
-            return render_template('view_bug.html', bug=bug, comments=comments, users=users)
+            return render_template('view_bug.html', bug=bug, comments=comments, older_comments=older_comments,
+                                   users=users, related=related)
         
     except Exception as e:
         logger.error(f"Error loading bug {bug_id}: {str(e)}")
         flash('Error loading bug details. Please try again.', 'error')
         return redirect(url_for('dashboard'))
 
+@app.route('/api/bugs/<int:bug_id>/comments')
+@login_required
+def api_bug_comments(bug_id):
+    """Older comments of a bug: /api/bugs/<id>/comments?before=<cursor>&limit=
+
+    Pages run oldest first within the page; `older` is the cursor for the
+    page before this one, or null at the first comment.
+    """
+    try:
+        before = parse_page_cursor(request.args['before']) if request.args.get('before') else None
+        limit = min(max(1, int(request.args.get('limit', COMMENTS_PAGE_SIZE))), COMMENTS_MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid before or limit parameter'}), 400
+
+    try:
+        with get_db_connection() as conn:
+            bug = conn.execute('SELECT comment_count FROM bugs WHERE id = ?', (bug_id,)).fetchone()
+            if not bug:
+                return jsonify({'success': False, 'error': 'Bug not found'}), 404
+            comments, older = comment_page(conn, bug_id, before, limit)
+        return jsonify({
+            'success': True,
+            'total': bug['comment_count'],
+            'older': older,
+            'comments': [comment._asdict() for comment in comments]
+        })
+    except Exception as e:
+        logger.error(f"Error loading comments for bug {bug_id}: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to fetch comments'}), 500
+
 @app.route('/bug/<int:bug_id>/comment', methods=['POST'])
 @login_required
 def add_comment(bug_id):
@@ -1260,9 +2762,9 @@ def add_comment(bug_id):
                 return redirect(url_for('dashboard'))
             
             cursor.execute('''
-                INSERT INTO comments (bug_id, user_id, comment)
-                VALUES (?, ?, ?)
-            ''', (bug_id, session['user_id'], comment_text))
+                INSERT INTO comments (bug_id, user_id, comment, created_at_ms)
+                VALUES (?, ?, ?, ?)
+            ''', (bug_id, session['user_id'], comment_text, now_ms()))
             log_bug_history(conn, bug_id, session['user_id'], 'comment_added', None, comment_text)
             
             logger.info(f"Comment added to bug #{bug_id} by {session['user_email']}")
@@ -1307,7 +2809,7 @@ def edit_bug(bug_id):
                     flash('Title and description are required', 'error')
                     return render_template('edit_bug.html', bug=bug)
                 
-                if priority not in ['Low', 'Medium', 'High']:
+                if priority not in VALID_PRIORITIES:
                     flash('Invalid priority level', 'error')
                     return render_template('edit_bug.html', bug=bug)
                 
@@ -1334,6 +2836,8 @@ def edit_bug(bug_id):
                 if bug['description'] != description:
                     changes.append("Description updated")
                     log_bug_history(conn, bug_id, session['user_id'], 'description_changed')
+                if (bug['steps'] or '') != steps:
+                    changes.append("Steps updated")
                 if bug['priority'] != priority:
                     changes.append(f"Priority: {bug['priority']} → {priority}")
                     log_bug_history(conn, bug_id, session['user_id'], 'priority_changed', bug['priority'], priority)
@@ -1409,8 +2913,7 @@ def update_status(bug_id):
     status = request.form.get('status', 'Open')
     status_note = sanitize_input(request.form.get('status_note', ''), 500)
     
-    valid_statuses = ['Open', 'In Progress', 'Fixed', 'Closed']
-    if status not in valid_statuses:
+    if status not in VALID_STATUSES:
         flash('Invalid status', 'error')
         return redirect(url_for('view_bug', bug_id=bug_id))
     
@@ -1441,46 +2944,262 @@ def update_status(bug_id):
     
     return redirect(url_for('view_bug', bug_id=bug_id))
 
+# ============== BULK TRIAGE ==============
+
+BULK_MAX_BUGS = 1000
+SQLITE_MAX_VARIABLES = 900  # stay below SQLite's default host parameter limit
+
+def _chunked(values, size=SQLITE_MAX_VARIABLES):
+    """Split a list into slices small enough for an IN (...) clause"""
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+def parse_bug_ids(values):
+    """Turn submitted ids into a de-duplicated list of ints (raises ValueError)"""
+    try:
+        bug_ids = list(dict.fromkeys(int(value) for value in values))
+    except (TypeError, ValueError):
+        raise ValueError('Invalid bug selection')
+    if not bug_ids:
+        raise ValueError('Select at least one bug')
+    if len(bug_ids) > BULK_MAX_BUGS:
+        raise ValueError(f'At most {BULK_MAX_BUGS} bugs can be updated at once')
+    return bug_ids
+
+def bulk_triage(conn, bug_ids, user_id, status=None, status_note='', change_assignee=False, assigned_to=None):
+    """Apply a status and/or assignee change to many bugs in one transaction.
+
+    Existence and current values are read with set-based queries and all history
+    rows are written with a single executemany, in the same format as the
+    single-bug routes; bugs that already have the new status or assignee get no
+    history row for it. Returns {'updated', 'missing'}.
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    current = {}
+    for chunk in _chunked(bug_ids):
+        placeholders = ','.join('?' * len(chunk))
+        for row in conn.execute(f'''
+            SELECT id, status, assigned_to FROM bugs WHERE id IN ({placeholders})
+        ''', chunk):
+            current[row['id']] = row
+    found = [bug_id for bug_id in bug_ids if bug_id in current]
+    missing = [bug_id for bug_id in bug_ids if bug_id not in current]
+    history = []
+    created_at_ms = now_ms()
+
+    if change_assignee:
+        assignee_label = 'Unassigned'
+        if assigned_to is not None:
+            user = conn.execute('SELECT email FROM users WHERE id = ?', (assigned_to,)).fetchone()
+            if not user:
+                conn.rollback()
+                raise ValueError('Invalid user assignment')
+            assignee_label = user['email']
+        reassigned = [bug_id for bug_id in found if current[bug_id]['assigned_to'] != assigned_to]
+        for chunk in _chunked(reassigned, SQLITE_MAX_VARIABLES - 1):
+            placeholders = ','.join('?' * len(chunk))
+            conn.execute(f'UPDATE bugs SET assigned_to = ? WHERE id IN ({placeholders})', [assigned_to] + chunk)
+        history += [(bug_id, user_id, 'assigned_to', None, assignee_label, created_at_ms) for bug_id in reassigned]
+
+    if status:
+        changed = [bug_id for bug_id in found if current[bug_id]['status'] != status]
+        for chunk in _chunked(changed, SQLITE_MAX_VARIABLES - 1):
+            placeholders = ','.join('?' * len(chunk))
+            conn.execute(f'UPDATE bugs SET status = ? WHERE id IN ({placeholders})', [status] + chunk)
+        note_suffix = f" | note: {status_note}" if status_note else ""
+        history += [(bug_id, user_id, 'status_changed', current[bug_id]['status'], f"{status}{note_suffix}",
+                     created_at_ms) for bug_id in changed]
+
+    conn.executemany('''
+        INSERT INTO bug_history (bug_id, user_id, action, old_value, new_value, created_at_ms)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', history)
+    conn.commit()
+    change_notifier.notify()
+    return {'updated': found, 'missing': missing}
+
+@app.route('/bugs/bulk', methods=['POST'])
+@login_required
+def bulk_triage_form():
+    """Apply a status or assignment change to the bugs selected on the dashboard"""
+    status = request.form.get('status', '')
+    status_note = sanitize_input(request.form.get('status_note', ''), 500)
+    assigned_to = request.form.get('assigned_to', '')
+    change_assignee = assigned_to != ''
+
+    try:
+        bug_ids = parse_bug_ids(request.form.getlist('bug_ids'))
+    except ValueError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('dashboard'))
+
+    try:
+        assignee_id = int(assigned_to) if change_assignee and assigned_to != 'none' else None
+    except ValueError:
+        flash('Invalid user assignment', 'error')
+        return redirect(url_for('dashboard'))
+
+    if status and status not in VALID_STATUSES:
+        flash('Invalid status', 'error')
+        return redirect(url_for('dashboard'))
+    if change_assignee and session.get('user_role') != 'admin':
+        flash('Admin access required', 'error')
+        return redirect(url_for('dashboard'))
+    if not status and not change_assignee:
+        flash('Choose a status or an assignee to apply', 'error')
+        return redirect(url_for('dashboard'))
+
+    try:
+        with get_db_connection() as conn:
+            result = bulk_triage(conn, bug_ids, session['user_id'], status=status or None,
+                                 status_note=status_note, change_assignee=change_assignee, assigned_to=assignee_id)
+
+        logger.info(f"Bulk triage of {len(result['updated'])} bugs by {session['user_email']}")
+        flash(f"Updated {len(result['updated'])} bug{'s' if len(result['updated']) != 1 else ''}"
+              + (f" ({len(result['missing'])} not found)" if result['missing'] else ''), 'success')
+
+    except ValueError as e:
+        flash(str(e), 'error')
+    except Exception as e:
+        logger.error(f"Bulk triage error: {str(e)}")
+        flash('Error updating bugs. Please try again.', 'error')
+
+    return redirect(url_for('dashboard'))
+
+@app.route('/api/bugs/bulk', methods=['POST'])
+@login_required
+def api_bulk_triage():
+    """JSON API: {"bug_ids": [...], "status": "...", "note": "...", "assigned_to": id|null}"""
+    data = request.get_json(silent=True) or {}
+    status = data.get('status')
+    note = data.get('note') or ''
+    change_assignee = 'assigned_to' in data
+
+    try:
+        bug_ids = parse_bug_ids(data.get('bug_ids') or [])
+        if status is not None and status not in VALID_STATUSES:
+            raise ValueError('Invalid status')
+        if not isinstance(note, str):
+            raise ValueError('note must be a string')
+        if not status and not change_assignee:
+            raise ValueError('Provide a status and/or assigned_to')
+        assigned_to = int(data['assigned_to']) if change_assignee and data['assigned_to'] is not None else None
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    if change_assignee and session.get('user_role') != 'admin':
+        return jsonify({'success': False, 'error': 'Admin access required'}), 403
+
+    try:
+        with get_db_connection() as conn:
+            result = bulk_triage(conn, bug_ids, session['user_id'], status=status,
+                                 status_note=sanitize_input(note, 500),
+                                 change_assignee=change_assignee, assigned_to=assigned_to)
+        logger.info(f"Bulk triage (API) of {len(result['updated'])} bugs by {session['user_email']}")
+        return jsonify({'success': True, **result})
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Bulk triage API error: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to update bugs'}), 500
+
 # ============== ADVANCED FEATURES ==============
 
+# Fields /api/bugs can return (?fields=), in default order; creator_email is the only one needing a join
+API_BUG_FIELDS = {
+    'id': 'b.id',
+    'title': 'b.title',
+    'description': 'b.description',
+    'priority': 'b.priority',
+    'status': 'b.status',
+    'created_at': 'b.created_at',
+    'created_at_ms': 'b.created_at_ms',
+    'creator_email': 'creator.email',
+    'comment_count': 'b.comment_count',
+}
+# Low-cardinality fields sent as ids into a per-response dictionary by format=columnar
+API_BUG_DICTIONARY_FIELDS = ('status', 'priority', 'creator_email')
+API_BUG_FORMATS = ('json', 'ndjson', 'columnar')
+NDJSON_BATCH_ROWS = 1000
+
 @app.route('/api/bugs', methods=['GET'])
 @login_required
+@conditional_get()
 def api_bugs():
-    """API endpoint to get bugs in JSON format"""
+    """API endpoint to get bugs: /api/bugs?status=&priority=&from=&to=&fields=&format=json|ndjson|columnar
+
+    json is one object with a list of bug objects; ndjson streams one bug object
+    per line as the rows are read; columnar returns one array per field, with
+    status, priority and creator_email as indexes into `dictionaries`.
+    """
+    output_format = request.args.get('format', 'json')
+    if output_format not in API_BUG_FORMATS:
+        return jsonify({'success': False, 'error': f"format must be one of: {', '.join(API_BUG_FORMATS)}"}), 400
+    fields = [field.strip() for field in request.args.get('fields', '').split(',') if field.strip()]
+    unknown = [field for field in fields if field not in API_BUG_FIELDS]
+    if unknown:
+        return jsonify({'success': False, 'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+    fields = list(dict.fromkeys(fields)) or list(API_BUG_FIELDS)
+    try:
+        from_ms, to_ms = parse_date_range(request.args)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    status_filter = request.args.get('status', '')
+    priority_filter = request.args.get('priority', '')
+    
+    query = f"SELECT {', '.join(API_BUG_FIELDS[field] for field in fields)} FROM bugs b"
+    if 'creator_email' in fields:
+        query += ' LEFT JOIN users creator ON b.created_by = creator.id'
+    query += ' WHERE 1=1'
+    params = []
+    
+    if status_filter:
+        query += ' AND b.status = ?'
+        params.append(status_filter)
+    
+    if priority_filter:
+        query += ' AND b.priority = ?'
+        params.append(priority_filter)
+    
+    range_sql, range_params = date_range_sql('b.created_at_ms', from_ms, to_ms)
+    query += range_sql
+    params.extend(range_params)
+    
+    query += ' ORDER BY b.created_at_ms DESC, b.id DESC'
+
+    if output_format == 'ndjson':
+        return stream_bugs_ndjson(query, params, fields)
+
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            
-            status_filter = request.args.get('status', '')
-            priority_filter = request.args.get('priority', '')
-            
-            query = '''
-                SELECT b.id, b.title, b.description, b.priority, b.status, 
-                       b.created_at, creator.email as creator_email
-                FROM bugs b
-                LEFT JOIN users creator ON b.created_by = creator.id
-                WHERE 1=1
-            '''
-            params = []
-            
-            if status_filter:
-                query += ' AND b.status = ?'
-                params.append(status_filter)
-            
-            if priority_filter:
-                query += ' AND b.priority = ?'
-                params.append(priority_filter)
-            
-            query += ' ORDER BY b.created_at DESC'
-            
-            cursor.execute(query, params)
-            bugs = [dict(row) for row in cursor.fetchall()]
-            
+            cursor.row_factory = None
+            rows = cursor.execute(query, params).fetchall()
+
+        if output_format == 'columnar':
+            columns, dictionaries = {}, {}
+            for field, values in zip(fields, zip(*rows) if rows else [()] * len(fields)):
+                if field in API_BUG_DICTIONARY_FIELDS:
+                    codes = {}
+                    values = [codes.setdefault(value, len(codes)) for value in values]
+                    dictionaries[field] = list(codes)
+                columns[field] = list(values)
             return jsonify({
                 'success': True,
-                'count': len(bugs),
-                'bugs': bugs
+                'count': len(rows),
+                'fields': fields,
+                'columns': columns,
+                'dictionaries': dictionaries
             })
+
+        bugs = [dict(zip(fields, row)) for row in rows]
+        
+        return jsonify({
+            'success': True,
+            'count': len(bugs),
+            'bugs': bugs
+        })
     
     except Exception as e:
         logger.error(f"API error: {str(e)}")
@@ -1489,90 +3208,1374 @@ def api_bugs():
             'error': 'Failed to fetch bugs'
         }), 500
 
-@app.route('/bug/<int:bug_id>/delete', methods=['POST'])
-@login_required
-def delete_bug(bug_id):
-    """Delete a bug (only if created by current user or admin)"""
-    try:
+def stream_bugs_ndjson(query, params, fields):
+    """Stream query rows as newline-delimited JSON objects, encoded a batch at a time"""
+    encode = json.JSONEncoder(separators=(',', ':')).encode
+
+    def generate():
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            
-            # Check if user created this bug
-            cursor.execute('SELECT created_by, title FROM bugs WHERE id = ?', (bug_id,))
-            bug = cursor.fetchone()
-            
-            if not bug:
-                flash('Bug not found', 'error')
-                return redirect(url_for('dashboard'))
-            
-            if bug['created_by'] != session['user_id']:
-                flash('You can only delete bugs you created', 'error')
-                return redirect(url_for('view_bug', bug_id=bug_id))
-            
-            # Delete comments first (foreign key constraint)
-            cursor.execute('DELETE FROM comments WHERE bug_id = ?', (bug_id,))
-            
-            # Delete bug
-            cursor.execute('DELETE FROM bugs WHERE id = ?', (bug_id,))
-            
-            logger.info(f"Bug #{bug_id} '{bug['title']}' deleted by {session['user_email']}")
-            flash('Bug deleted successfully', 'success')
-            return redirect(url_for('dashboard'))
-    
+            cursor.row_factory = None
+            cursor.execute(query, params)
+            yield ''
+            while True:
+                rows = cursor.fetchmany(NDJSON_BATCH_ROWS)
+                if not rows:
+                    break
+                yield ''.join([encode(dict(zip(fields, row))) + '\n' for row in rows])
+
+    chunks = generate()
+    try:
+        # Run the query before committing to a 200 response
+        next(chunks)
     except Exception as e:
-        logger.error(f"Error deleting bug: {str(e)}")
-        flash('Error deleting bug. Please try again.', 'error')
-        return redirect(url_for('view_bug', bug_id=bug_id))
+        logger.error(f"API error: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to fetch bugs'}), 500
 
-@app.route('/uploads/<filename>')
-def uploaded_file(filename):
-    """Serve uploaded images"""
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    return Response(chunks, mimetype='application/x-ndjson')
 
-@app.route('/export/csv')
-@login_required
-def export_csv():
-    """Export all bugs to CSV format with embedded images"""
+@app.route('/api/users/search')
+@admin_required
+def api_user_search():
+    """Search-as-you-type user lookup for the assignee picker: /api/users/search?q=&role=&limit="""
+    search = (sanitize_input(request.args.get('q', ''), 255) or '').lower()
+    role = request.args.get('role', '')
+    try:
+        limit = min(max(1, int(request.args.get('limit', 20))), USER_SEARCH_MAX_LIMIT)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid limit'}), 400
+
+    role_clause = ' AND role = ?' if role else ''
+    role_params = [role] if role else []
     try:
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT b.id, b.title, b.description, b.priority, b.status,
-                       b.created_at, b.screenshot_path, creator.email as creator,
-                       assignee.email as assignee
-                FROM bugs b
-                LEFT JOIN users creator ON b.created_by = creator.id
-                LEFT JOIN users assignee ON b.assigned_to = assignee.id
-                ORDER BY b.created_at DESC
-            ''')
-            bugs = cursor.fetchall()
-            
-            # Create CSV content with image URLs
-            csv_content = "ID,Title,Description,Priority,Status,Created At,Created By,Assigned To,Screenshot\n"
-            for bug in bugs:
-                screenshot_link = ""
-                if bug['screenshot_path']:
-                    # Create full URL for the image
-                    screenshot_link = f"http://127.0.0.1:5000/uploads/{bug['screenshot_path']}"
-                csv_content += f"{bug['id']},\"{bug['title']}\",\"{bug['description']}\",{bug['priority']},{bug['status']},{bug['created_at']},{bug['creator']},{bug['assignee'] or 'Unassigned'},{screenshot_link}\n"
-            
-            from flask import Response
-            return Response(
-                csv_content,
-                mimetype="text/csv",
-                headers={"Content-disposition": "attachment; filename=bugs_export.csv"}
-            )
-    
+            # Prefix matches are a range scan on idx_users_email (emails are stored lower-cased);
+            # substring matches fill up whatever room is left
+            users = conn.execute(f'''
+                SELECT id, email, role FROM users
+                WHERE email >= ? AND email < ?{role_clause}
+                ORDER BY email
+                LIMIT ?
+            ''', [search, search + '\uffff'] + role_params + [limit]).fetchall()
+            if search and len(users) < limit:
+                users += conn.execute(f'''
+                    SELECT id, email, role FROM users
+                    WHERE instr(email, ?) > 1{role_clause}
+                    ORDER BY email
+                    LIMIT ?
+                ''', [search] + role_params + [limit - len(users)]).fetchall()
+
+        return jsonify({'success': True, 'users': [dict(row) for row in users]})
+
     except Exception as e:
-        logger.error(f"Export error: {str(e)}")
+        logger.error(f"User search error: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to search users'}), 500
+
+# ============== CHANGE FEED ==============
+
+CHANGES_DEFAULT_LIMIT = 100
+CHANGES_MAX_LIMIT = 1000
+CHANGES_MAX_WAIT = 30.0
+CHANGES_POLL_INTERVAL = 1.0  # re-check the database for changes written by other processes
+CHANGE_FIELDS = ('id', 'bug_id', 'action', 'user_id', 'user_email', 'old_value', 'new_value', 'created_at',
+                 'created_at_ms')
+CHANGE_BUG_FIELDS = ('id', 'title', 'priority', 'status', 'assigned_to', 'assignee_email', 'created_by', 'created_at')
+
+class ChangeNotifier:
+    """Wakes long-polling change-feed requests when this process records a change"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self.version = 0
+
+    def notify(self):
+        with self._condition:
+            self.version += 1
+            self._condition.notify_all()
+
+    def wait(self, version, timeout):
+        """Block until a change newer than `version` is recorded or the timeout expires"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.version != version, timeout)
+
+change_notifier = ChangeNotifier()
+
+def parse_change_cursor(value):
+    """Parse a '<history_id>.<deletion_id>' cursor (raises ValueError)"""
+    history_id, _, deletion_id = (value or '0').partition('.')
+    history_id, deletion_id = int(history_id), int(deletion_id or 0)
+    if history_id < 0 or deletion_id < 0:
+        raise ValueError('Invalid cursor')
+    return history_id, deletion_id
+
+def latest_change_cursor(conn):
+    """Cursor pointing after the newest change"""
+    history_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM bug_history').fetchone()[0]
+    deletion_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM bug_deletions').fetchone()[0]
+    return f'{history_id}.{deletion_id}'
+
+def read_changes(conn, history_after, deletion_after, limit):
+    """Read one page of changes after a cursor from a consistent snapshot.
+
+    History rows and deletion tombstones are two id sequences merged by time;
+    the cursor advances each one past the rows included in the page.
+    """
+    def timed(rows, source):
+        # (created_at_ms, id) merge keys, kept non-decreasing along each id sequence: a row
+        # stamped behind an earlier id (a clock step) sorts right after it instead of
+        # breaking merge()'s sorted input, and every page stays a prefix of both sequences
+        latest = 0
+        for row in rows:
+            latest = max(latest, row['created_at_ms'] or 0)
+            yield (latest, row['id']), source, row
+
+    conn.execute('BEGIN')
+    try:
+        history = conn.execute('''
+            SELECT bh.id, bh.bug_id, bh.action, bh.user_id, u.email AS user_email,
+                   bh.old_value, bh.new_value, bh.created_at, bh.created_at_ms
+            FROM bug_history bh
+            LEFT JOIN users u ON bh.user_id = u.id
+            WHERE bh.id > ? AND bh.action != 'viewed_bug'
+            ORDER BY bh.id
+            LIMIT ?
+        ''', (history_after, limit + 1)).fetchall()
+        deletions = conn.execute('''
+            SELECT d.id, d.bug_id, 'bug_deleted' AS action, d.user_id, u.email AS user_email,
+                   d.title AS old_value, NULL AS new_value, d.created_at, d.created_at_ms
+            FROM bug_deletions d
+            LEFT JOIN users u ON d.user_id = u.id
+            WHERE d.id > ?
+            ORDER BY d.id
+            LIMIT ?
+        ''', (deletion_after, limit + 1)).fetchall()
+
+        # Both queries read in id order, which is the order each cursor advances in
+        merged = list(heapq.merge(timed(history, 0), timed(deletions, 1), key=lambda item: item[0]))
+        page = merged[:limit]
+        has_more = len(merged) > limit
+
+        history_ids = [row['id'] for _, source, row in page if source == 0]
+        deletion_ids = [row['id'] for _, source, row in page if source == 1]
+        if not has_more:
+            # Nothing relevant is left; skip past trailing 'viewed_bug' rows as well
+            history_ids.append(conn.execute('SELECT COALESCE(MAX(id), 0) FROM bug_history').fetchone()[0])
+        cursor = f'{max(history_ids, default=history_after)}.{max(deletion_ids, default=deletion_after)}'
+
+        changes = [row for _, _, row in page]
+        deleted = {row['bug_id'] for _, source, row in page if source == 1}
+        bug_ids = list(dict.fromkeys(row['bug_id'] for row in changes if row['bug_id'] not in deleted))
+        bugs = []
+        for chunk in _chunked(bug_ids):
+            placeholders = ','.join('?' * len(chunk))
+            bugs += conn.execute(f'''
+                SELECT b.id, b.title, b.priority, b.status, b.assigned_to, assignee.email AS assignee_email,
+                       b.created_by, b.created_at
+                FROM bugs b
+                LEFT JOIN users assignee ON b.assigned_to = assignee.id
+                WHERE b.id IN ({placeholders})
+            ''', chunk).fetchall()
+    finally:
+        conn.rollback()
+
+    return {'cursor': cursor, 'has_more': has_more, 'changes': changes, 'bugs': bugs}
+
+@app.route('/api/changes')
+@login_required
+def api_changes():
+    """Incremental change feed: /api/changes?since=<cursor>&limit=&wait=&compact=1
+
+    since=latest returns only the current cursor. With wait=<seconds> the request
+    is held until a change arrives or the wait expires (long polling).
+    """
+    since = request.args.get('since', '0')
+    compact = request.args.get('compact', '') in ('1', 'true')
+    try:
+        limit = min(max(1, int(request.args.get('limit', CHANGES_DEFAULT_LIMIT))), CHANGES_MAX_LIMIT)
+        wait = min(max(0.0, float(request.args.get('wait', 0))), CHANGES_MAX_WAIT)
+        if since != 'latest':
+            history_after, deletion_after = parse_change_cursor(since)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid since, limit or wait parameter'}), 400
+
+    try:
+        if since == 'latest':
+            with get_db_connection() as conn:
+                return jsonify({'success': True, 'cursor': latest_change_cursor(conn), 'has_more': False,
+                                'changes': [], 'bugs': []})
+
+        deadline = time.monotonic() + wait
+        while True:
+            version = change_notifier.version
+            with get_db_connection() as conn:
+                result = read_changes(conn, history_after, deletion_after, limit)
+            remaining = deadline - time.monotonic()
+            if result['changes'] or remaining <= 0:
+                break
+            history_after, deletion_after = parse_change_cursor(result['cursor'])
+            change_notifier.wait(version, min(remaining, CHANGES_POLL_INTERVAL))
+
+        if compact:
+            return jsonify({
+                'success': True,
+                'cursor': result['cursor'],
+                'has_more': result['has_more'],
+                'fields': CHANGE_FIELDS,
+                'changes': [tuple(row[field] for field in CHANGE_FIELDS) for row in result['changes']],
+                'bug_fields': CHANGE_BUG_FIELDS,
+                'bugs': [tuple(row[field] for field in CHANGE_BUG_FIELDS) for row in result['bugs']]
+            })
+        return jsonify({
+            'success': True,
+            'cursor': result['cursor'],
+            'has_more': result['has_more'],
+            'changes': [dict(row) for row in result['changes']],
+            'bugs': [dict(row) for row in result['bugs']]
+        })
+
+    except Exception as e:
+        logger.error(f"Change feed error: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to fetch changes'}), 500
+
+# ============== LIVE EVENTS ==============
+
+SSE_HEARTBEAT_SECONDS = float(os.environ.get('SSE_HEARTBEAT_SECONDS', '15'))
+SSE_QUEUE_SIZE = int(os.environ.get('SSE_QUEUE_SIZE', '100'))
+SSE_MAX_CLIENTS = int(os.environ.get('SSE_MAX_CLIENTS', '5000'))
+
+def format_sse(event, data, event_id=None):
+    """Encode one Server-Sent Events message"""
+    message = f'event: {event}\n'
+    if event_id:
+        message += f'id: {event_id}\n'
+    return message + f'data: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+def dashboard_stats(conn):
+    """Bug counters shown on the dashboard, in one scan"""
+    row = conn.execute('''
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM(status = 'Open'), 0) AS open,
+               COALESCE(SUM(status = 'In Progress'), 0) AS in_progress,
+               COALESCE(SUM(status = 'Fixed'), 0) AS fixed,
+               COALESCE(SUM(priority = 'High'), 0) AS high_priority,
+               COALESCE(SUM(status = 'Closed'), 0) AS closed
+        FROM bugs
+    ''').fetchone()
+    return dict(row)
+
+def change_events(result):
+    """SSE messages for one page of the change feed: a 'bug' event per change, then 'stats'"""
+    bugs = {row['id']: dict(row) for row in result['bugs']}
+    messages = [format_sse('bug', dict(row, bug=bugs.get(row['bug_id']))) for row in result['changes']]
+    if 'stats' in result:
+        # The id lets a reconnecting browser resume from here via Last-Event-ID
+        messages.append(format_sse('stats', result['stats'], event_id=result['cursor']))
+    return messages
+
+class EventSubscriber:
+    """One connected /events stream: a bounded message queue and an overflow flag"""
+
+    __slots__ = ('messages', 'overflowed')
+
+    def __init__(self, queue_size):
+        self.messages = queue.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+class EventBroker:
+    """Fans change-feed events out to the connected /events streams.
+
+    A single thread per process tails the change feed (woken by change_notifier,
+    and polling for writes made by other processes) and puts each message into
+    every subscriber's bounded queue, so the cost of a change does not grow with
+    the number of open dashboards. A subscriber that falls a full queue behind
+    is dropped and told to resync rather than slowing everyone else down.
+    """
+
+    def __init__(self, queue_size=SSE_QUEUE_SIZE, max_clients=SSE_MAX_CLIENTS):
+        self.queue_size = queue_size
+        self.max_clients = max_clients
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self):
+        """Register a new stream; returns its EventSubscriber, or None when at capacity"""
+        subscriber = EventSubscriber(self.queue_size)
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                return None
+            self._subscribers.add(subscriber)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='event-broker', daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, messages):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                for message in messages:
+                    subscriber.messages.put_nowait(message)
+            except queue.Full:
+                subscriber.overflowed = True
+                self.unsubscribe(subscriber)
+
+    def _run(self):
+        """Tail the change feed while anyone is subscribed"""
+        cursor = None
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            version = change_notifier.version
+            try:
+                with get_db_connection() as conn:
+                    if cursor is None:
+                        cursor = latest_change_cursor(conn)
+                    result = read_changes(conn, *parse_change_cursor(cursor), CHANGES_MAX_LIMIT)
+                    if result['changes']:
+                        result['stats'] = dashboard_stats(conn)
+            except Exception as e:
+                logger.error(f"Event broker error: {str(e)}")
+                time.sleep(CHANGES_POLL_INTERVAL)
+                continue
+
+            if result['changes']:
+                self.publish(change_events(result))
+            cursor = result['cursor']
+            if not result['has_more']:
+                change_notifier.wait(version, CHANGES_POLL_INTERVAL)
+
+    def __len__(self):
+        return len(self._subscribers)
+
+event_broker = EventBroker()
+
+@app.route('/events')
+@login_required
+def events():
+    """Server-Sent Events stream of bug changes and dashboard counters"""
+    replay = []
+    last_event_id = request.headers.get('Last-Event-ID')
+    if last_event_id:
+        # Reconnecting browser: send what it missed (one page) before going live
+        try:
+            with get_db_connection() as conn:
+                result = read_changes(conn, *parse_change_cursor(last_event_id), CHANGES_MAX_LIMIT)
+                if result['changes']:
+                    result['stats'] = dashboard_stats(conn)
+                    replay = change_events(result)
+        except Exception as e:
+            logger.warning(f"Could not replay events after {last_event_id}: {str(e)}")
+
+    subscriber = event_broker.subscribe()
+    if subscriber is None:
+        logger.warning("Live event stream rejected: too many clients")
+        return Response('Too many live connections\n', status=503, mimetype='text/plain',
+                        headers={'Retry-After': '30'})
+
+    def stream():
+        try:
+            yield 'retry: 5000\n\n'
+            yield from replay
+            while not subscriber.overflowed:
+                try:
+                    yield subscriber.messages.get(timeout=SSE_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ': ping\n\n'
+            yield format_sse('resync', {})
+        finally:
+            event_broker.unsubscribe(subscriber)
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# ============== ANALYTICS ==============
+
+app.config['ANALYTICS_ENABLED'] = os.environ.get('ANALYTICS_ENABLED', 'true').lower() == 'true'
+ANALYTICS_BATCH = int(os.environ.get('ANALYTICS_BATCH', '5000'))
+ANALYTICS_POLL_SECONDS = 5.0  # pick up history written by other processes
+ANALYTICS_DEFAULT_DAYS = 30
+ANALYTICS_MAX_DAYS = 365
+ANALYTICS_TOP_ASSIGNEES = 20
+ANALYTICS_ACTIONS = ('bug_created', 'status_changed', 'priority_changed', 'assigned_to')
+# Entering one of these statuses resolves a bug; its age at that moment goes into the metric's histogram
+RESOLUTION_METRICS = {'Fixed': 'time_to_fix', 'Closed': 'time_to_close'}
+DAY_MS = 86400000
+
+def duration_bucket(elapsed_ms):
+    """Histogram bucket: 0 is under a minute, bucket b covers [2^(b-1), 2^b) minutes"""
+    return max(0, int(elapsed_ms // 60000)).bit_length()
+
+def _analytics_events(conn, where, params):
+    """History rows that feed the rollups, with the bug fields the rollups attribute them to"""
+    return conn.execute(f'''
+        SELECT bh.id, bh.action, bh.old_value, bh.new_value,
+               COALESCE(bh.created_at_ms, {EPOCH_MS_SQL.format(column='bh.created_at')}) AS at_ms,
+               b.status, b.priority, assignee.email AS assignee_email,
+               COALESCE(b.created_at_ms, {EPOCH_MS_SQL.format(column='b.created_at')}) AS bug_ms
+        FROM bug_history bh
+        JOIN bugs b ON bh.bug_id = b.id
+        LEFT JOIN users assignee ON b.assigned_to = assignee.id
+        WHERE {where} AND bh.action IN ({','.join('?' * len(ANALYTICS_ACTIONS))})
+        ORDER BY bh.id
+    ''', params + list(ANALYTICS_ACTIONS)).fetchall()
+
+def fold_analytics_events(events, daily, durations):
+    """Add history events to in-memory rollup deltas.
+
+    daily maps (day, dimension, key) to [created, entered, exited, resolved];
+    durations maps (day, metric, bucket) to [count, total_ms]. Priority and
+    assignee are the bug's at the time the event is folded in.
+    """
+    for event in events:
+        if event['at_ms'] is None:
+            continue
+        day = event['at_ms'] // DAY_MS
+        action = event['action']
+        if action == 'bug_created':
+            # Imported bugs are created with their final status, everything else starts Open
+            status = event['status'] if event['new_value'] == 'imported' else 'Open'
+            daily[(day, 'status', status)][0] += 1
+            daily[(day, 'priority', event['priority'])][0] += 1
+        elif action == 'status_changed':
+            status = (event['new_value'] or '').split(' | ', 1)[0]
+            if event['old_value']:
+                daily[(day, 'status', event['old_value'])][2] += 1
+            daily[(day, 'status', status)][1] += 1
+            metric = RESOLUTION_METRICS.get(status)
+            if metric:
+                daily[(day, 'priority', event['priority'])][3] += 1
+                daily[(day, 'assignee', event['assignee_email'] or 'Unassigned')][3] += 1
+                if event['bug_ms'] is not None:
+                    elapsed = max(0, event['at_ms'] - event['bug_ms'])
+                    histogram = durations[(day, metric, duration_bucket(elapsed))]
+                    histogram[0] += 1
+                    histogram[1] += elapsed
+        elif action == 'priority_changed':
+            if event['old_value']:
+                daily[(day, 'priority', event['old_value'])][2] += 1
+            daily[(day, 'priority', event['new_value'])][1] += 1
+        elif action == 'assigned_to':
+            daily[(day, 'assignee', event['new_value'] or 'Unassigned')][1] += 1
+
+def write_analytics(conn, daily, durations):
+    """Upsert rollup deltas"""
+    conn.executemany('''
+        INSERT INTO analytics_daily (day, dimension, key, created, entered, exited, resolved)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (day, dimension, key) DO UPDATE SET
+            created = created + excluded.created, entered = entered + excluded.entered,
+            exited = exited + excluded.exited, resolved = resolved + excluded.resolved
+    ''', [key + tuple(counts) for key, counts in daily.items() if key[2] is not None])
+    conn.executemany('''
+        INSERT INTO analytics_durations (day, metric, bucket, count, total_ms)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (day, metric, bucket) DO UPDATE SET
+            count = count + excluded.count, total_ms = total_ms + excluded.total_ms
+    ''', [key + tuple(values) for key, values in durations.items()])
+
+def _new_deltas():
+    return defaultdict(lambda: [0, 0, 0, 0]), defaultdict(lambda: [0, 0])
+
+def update_analytics(limit=ANALYTICS_BATCH):
+    """Fold history written since the last call into the rollups; returns (events, has_more).
+
+    The cursor moves in the same write transaction as the counters, so every
+    event is counted once even when several processes run this concurrently.
+    An idle poll only reads: the write lock is taken when there is history to fold.
+    """
+    with get_db_connection() as conn:
+        after = conn.execute('SELECT history_id FROM analytics_state WHERE id = 1').fetchone()[0]
+        if conn.execute('SELECT COALESCE(MAX(id), 0) FROM bug_history').fetchone()[0] <= after:
+            return 0, False
+
+        conn.execute('BEGIN IMMEDIATE')
+        after = conn.execute('SELECT history_id FROM analytics_state WHERE id = 1').fetchone()[0]
+        last_id = conn.execute('SELECT id FROM bug_history WHERE id > ? ORDER BY id LIMIT 1 OFFSET ?',
+                               (after, limit - 1)).fetchone()
+        has_more = last_id is not None
+        if not has_more:
+            last_id = conn.execute('SELECT COALESCE(MAX(id), ?) FROM bug_history', (after,)).fetchone()
+        last_id = max(after, last_id[0])
+
+        events = _analytics_events(conn, 'bh.id > ? AND bh.id <= ?', [after, last_id])
+        daily, durations = _new_deltas()
+        fold_analytics_events(events, daily, durations)
+        write_analytics(conn, daily, durations)
+        conn.execute('UPDATE analytics_state SET history_id = ?, updated_at = CURRENT_TIMESTAMP WHERE id = 1',
+                     (last_id,))
+        conn.commit()
+    return len(events), has_more
+
+def record_bug_deletion_analytics(conn, bug_id):
+    """Take a bug about to be deleted out of the backlog rollups.
+
+    Its history rows go with it, so the ones the consumer has not reached yet
+    are folded in here first; then the bug leaves its status and priority
+    today. Must run inside the deleting transaction, after it took the write lock.
+    """
+    after = conn.execute('SELECT history_id FROM analytics_state WHERE id = 1').fetchone()[0]
+    bug = conn.execute('SELECT status, priority FROM bugs WHERE id = ?', (bug_id,)).fetchone()
+    if bug is None:
+        return
+    daily, durations = _new_deltas()
+    fold_analytics_events(_analytics_events(conn, 'bh.bug_id = ? AND bh.id > ?', [bug_id, after]), daily, durations)
+    today = now_ms() // DAY_MS
+    daily[(today, 'status', bug['status'])][2] += 1
+    daily[(today, 'priority', bug['priority'])][2] += 1
+    write_analytics(conn, daily, durations)
+
+def rebuild_analytics():
+    """Clear the rollups and fold the whole history in again; returns the events folded"""
+    with get_db_connection() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('DELETE FROM analytics_daily')
+        conn.execute('DELETE FROM analytics_durations')
+        conn.execute('UPDATE analytics_state SET history_id = 0, updated_at = NULL WHERE id = 1')
+        conn.commit()
+    total, has_more = 0, True
+    while has_more:
+        count, has_more = update_analytics()
+        total += count
+    return total
+
+def _histogram_summary(buckets):
+    """count, mean and approximate percentiles (bucket upper bounds) in hours from {bucket: [count, total_ms]}"""
+    count = sum(values[0] for values in buckets.values())
+    if not count:
+        return {'count': 0, 'mean_hours': None, 'p50_hours': None, 'p90_hours': None, 'histogram': []}
+    histogram, percentiles, seen = [], {}, 0
+    for bucket in sorted(buckets):
+        seen += buckets[bucket][0]
+        upper_hours = (1 << bucket) / 60
+        histogram.append({'le_hours': round(upper_hours, 3), 'count': buckets[bucket][0]})
+        for name, fraction in (('p50_hours', 0.5), ('p90_hours', 0.9)):
+            if name not in percentiles and seen >= fraction * count:
+                percentiles[name] = round(upper_hours, 3)
+    total_ms = sum(values[1] for values in buckets.values())
+    return {'count': count, 'mean_hours': round(total_ms / count / 3600000, 2), **percentiles, 'histogram': histogram}
+
+def analytics_summary(conn, days=ANALYTICS_DEFAULT_DAYS):
+    """Trends over the last `days` days (UTC) read from the rollups only.
+
+    Reads a bounded number of rollup rows per day, so the cost does not depend
+    on the size of bug_history. Backlog per status is walked back from the
+    current counts using each day's net change.
+    """
+    today = now_ms() // DAY_MS
+    first_day = today - days + 1
+    day_labels = [datetime.fromtimestamp(day * 86400, timezone.utc).strftime('%Y-%m-%d')
+                  for day in range(first_day, today + 1)]
+
+    def series():
+        return [0] * days
+
+    inflow = {'total': series(), 'by_priority': defaultdict(series)}
+    entered_status = defaultdict(series)
+    net_status = defaultdict(series)
+    assignees = defaultdict(lambda: {'assigned': 0, 'resolved': 0})
+    for day, dimension, key, created, entered, exited, resolved in conn.execute('''
+        SELECT day, dimension, key, created, entered, exited, resolved
+        FROM analytics_daily WHERE day >= ? AND day <= ?
+    ''', (first_day, today)):
+        index = day - first_day
+        if dimension == 'status':
+            inflow['total'][index] += created
+            entered_status[key][index] += entered
+            net_status[key][index] += created + entered - exited
+        elif dimension == 'priority':
+            inflow['by_priority'][key][index] += created
+        elif dimension == 'assignee':
+            assignees[key]['assigned'] += entered
+            assignees[key]['resolved'] += resolved
+
+    # Days after the window (clock skew) are ignored; days inside it are undone newest first
+    current = dict(conn.execute('SELECT status, COUNT(*) FROM bugs GROUP BY status').fetchall())
+    backlog = {}
+    for status in sorted(set(current) | set(net_status)):
+        level, levels = current.get(status, 0), series()
+        for index in range(days - 1, -1, -1):
+            levels[index] = level
+            level -= net_status[status][index]
+        backlog[status] = levels
+
+    buckets = defaultdict(dict)
+    for metric, bucket, count, total_ms in conn.execute('''
+        SELECT metric, bucket, SUM(count), SUM(total_ms)
+        FROM analytics_durations WHERE day >= ? AND day <= ?
+        GROUP BY metric, bucket
+    ''', (first_day, today)):
+        buckets[metric][bucket] = [count, total_ms]
+
+    state = conn.execute('SELECT history_id, updated_at FROM analytics_state WHERE id = 1').fetchone()
+    top_assignees = sorted(assignees.items(), key=lambda item: (-item[1]['resolved'], -item[1]['assigned'], item[0]))
+    return {
+        'days': day_labels,
+        'inflow': {'total': inflow['total'], 'by_priority': dict(inflow['by_priority'])},
+        'resolved': {status: entered_status[status] for status in RESOLUTION_METRICS},
+        'backlog': backlog,
+        'assignees': [dict(assignee=key, **counts) for key, counts in top_assignees[:ANALYTICS_TOP_ASSIGNEES]],
+        'durations': {metric: _histogram_summary(buckets[metric]) for metric in RESOLUTION_METRICS.values()},
+        'history_id': state['history_id'] if state else 0,
+        'updated_at': state['updated_at'] if state else None,
+    }
+
+def parse_analytics_days(value):
+    """?days= as an int within 1..ANALYTICS_MAX_DAYS (raises ValueError)"""
+    days = int(value or ANALYTICS_DEFAULT_DAYS)
+    if not 1 <= days <= ANALYTICS_MAX_DAYS:
+        raise ValueError(f'days must be between 1 and {ANALYTICS_MAX_DAYS}')
+    return days
+
+class AnalyticsConsumer:
+    """Background thread keeping the rollups current.
+
+    Woken by change_notifier when this process records a change, and every
+    ANALYTICS_POLL_SECONDS for history written by other processes; catches
+    up in ANALYTICS_BATCH-sized transactions.
+    """
+
+    def __init__(self):
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='analytics-consumer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            version = change_notifier.version
+            try:
+                _, has_more = update_analytics()
+            except Exception as e:
+                logger.error(f"Analytics consumer error: {str(e)}")
+                has_more = False
+            if not has_more:
+                change_notifier.wait(version, ANALYTICS_POLL_SECONDS)
+
+analytics_consumer = AnalyticsConsumer()
+
+@app.before_request
+def start_analytics_consumer():
+    """Start the analytics consumer in processes that serve requests"""
+    if app.config['ANALYTICS_ENABLED'] and not app.testing:
+        analytics_consumer.start()
+
+@app.route('/api/analytics')
+@login_required
+def api_analytics():
+    """Bug inflow, resolutions, backlog, assignee and time-to-fix/close trends: /api/analytics?days="""
+    try:
+        days = parse_analytics_days(request.args.get('days'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    try:
+        with get_db_connection() as conn:
+            return jsonify({'success': True, **analytics_summary(conn, days)})
+    except Exception as e:
+        logger.error(f"Analytics API error: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to load analytics'}), 500
+
+@app.route('/analytics')
+@login_required
+def analytics():
+    """Analytics page: trends from the rollup tables"""
+    try:
+        days = parse_analytics_days(request.args.get('days'))
+    except ValueError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('analytics'))
+    try:
+        with get_db_connection() as conn:
+            summary = analytics_summary(conn, days)
+        return render_template('analytics.html', summary=summary, days=days)
+    except Exception as e:
+        logger.error(f"Analytics page error: {str(e)}")
+        flash('Error loading analytics. Please try again.', 'error')
+        return redirect(url_for('dashboard'))
+
+# ============== SIMILARITY INDEX ==============
+
+# Related bugs: a hashed TF-IDF index over bug text, memory-mapped from disk so
+# every worker shares one copy and starts warm (needs numpy)
+app.config['SIMILARITY_ENABLED'] = np is not None and os.environ.get('SIMILARITY_ENABLED', 'true').lower() == 'true'
+app.config['SIMILARITY_INDEX_DIR'] = os.environ.get('SIMILARITY_INDEX_DIR', os.path.splitext(DATABASE)[0] + '_similarity')
+SIMILARITY_FEATURES = 1 << 20  # hashed term dimensions
+SIMILARITY_FIELDS = (('title', 3.0), ('description', 1.0), ('steps', 1.0), ('actual_result', 1.0))
+SIMILARITY_MAX_CHARS = 4000  # per field
+SIMILARITY_QUERY_TERMS = 32  # highest-weighted terms of a query that are looked up
+SIMILARITY_QUERY_POSTINGS = 250_000  # per query; the most common terms are dropped beyond this
+SIMILARITY_MIN_SCORE = 0.1
+SIMILARITY_DUPLICATE_SCORE = 0.3
+SIMILARITY_RELATED = 5
+SIMILARITY_COMPACT_CHANGES = 2000  # changed bugs kept in memory before a new generation is written
+SIMILARITY_BUILD_CHUNK = 50_000  # bugs tokenized per merge while building
+SIMILARITY_NORM_BLOCK = 1 << 22  # posting entries per step when computing row norms
+SIMILARITY_POLL_SECONDS = 5.0  # pick up bugs written by other processes
+SIMILARITY_TEXT_ACTIONS = ('bug_created', 'title_changed', 'description_changed', 'bug_edited')
+SIMILARITY_ARRAYS = ('bug_ids', 'norms', 'idf', 'pointers', 'rows', 'weights')
+SIMILARITY_TOKEN = re.compile(r'[a-z0-9]{2,}')
+SIMILARITY_STOPWORDS = frozenset(
+    'an and are as at be but by can do does for from has have if in into is it its no not of on or so '
+    'that the then there these this to was were when which will with after before should would'.split()
+)
+
+# Posting lists by term over the bugs of one generation: rows of term t are
+# rows[pointers[t]:pointers[t + 1]], with their sublinear term frequencies in weights
+SimilarityBase = namedtuple('SimilarityBase', SIMILARITY_ARRAYS)
+# Bugs changed since the base was written, scored by brute force; rows index bug_ids
+SimilarityDelta = namedtuple('SimilarityDelta', 'bug_ids norms features rows weights')
+# What a query reads; replaced as a whole, so queries never need the lock
+SimilarityState = namedtuple('SimilarityState', 'base dead delta cursor generation')
+
+@lru_cache(maxsize=1 << 16)
+def _term_feature(token):
+    return zlib.crc32(token.encode()) & (SIMILARITY_FEATURES - 1)
+
+def text_vector(weighted_texts):
+    """Hash (text, weight) pairs into sorted feature ids and 1 + log(tf) weights"""
+    counts = defaultdict(float)
+    for text, weight in weighted_texts:
+        for token in SIMILARITY_TOKEN.findall((text or '')[:SIMILARITY_MAX_CHARS].lower()):
+            if token not in SIMILARITY_STOPWORDS:
+                counts[_term_feature(token)] += weight
+    features = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+    weights = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    order = np.argsort(features)
+    return features[order], 1 + np.log(weights[order])
+
+def bug_text_vector(bug):
+    return text_vector((bug[field], weight) for field, weight in SIMILARITY_FIELDS)
+
+def _vector_entries(vectors):
+    """Concatenate vectors into (rows, features, weights) entry arrays"""
+    lengths = np.fromiter((len(features) for features, _ in vectors), dtype=np.int64, count=len(vectors))
+    rows = np.repeat(np.arange(len(vectors), dtype=np.int64), lengths)
+    features = np.concatenate([features for features, _ in vectors]) if vectors else np.empty(0, np.int32)
+    weights = np.concatenate([weights for _, weights in vectors]) if vectors else np.empty(0, np.float32)
+    return rows, features, weights.astype(np.float32)
+
+def _row_norms(rows, features, weights, idf, count):
+    norms = np.sqrt(np.bincount(rows, weights=(weights * idf[features]) ** 2, minlength=count)).astype(np.float32)
+    norms[norms == 0] = 1  # bugs without terms never match anything
+    return norms
+
+def _posting_norms(pointers, rows, weights, idf, count):
+    """Row norms from posting lists, a block of entries at a time to bound temporary memory"""
+    squares = np.zeros(count)
+    for start in range(0, len(rows), SIMILARITY_NORM_BLOCK):
+        entries = np.arange(start, min(start + SIMILARITY_NORM_BLOCK, len(rows)))
+        features = np.searchsorted(pointers, entries, side='right') - 1
+        squares += np.bincount(rows[entries], weights=(weights[entries] * idf[features]) ** 2, minlength=count)
+    norms = np.sqrt(squares).astype(np.float32)
+    norms[norms == 0] = 1
+    return norms
+
+def empty_similarity_base():
+    return SimilarityBase(bug_ids=np.empty(0, np.int64), norms=np.empty(0, np.float32),
+                          idf=np.ones(SIMILARITY_FEATURES, np.float32),
+                          pointers=np.zeros(SIMILARITY_FEATURES + 1, np.int64),
+                          rows=np.empty(0, np.int32), weights=np.empty(0, np.float32))
+
+def merge_similarity_base(base, dead, bug_ids, vectors):
+    """A new base with the rows of `base` not marked dead plus the vectors of bug_ids.
+
+    The base's posting lists are already grouped by term, so nothing large is
+    sorted: each added entry is slotted in after the kept entries of its term,
+    and the kept entries fill the remaining slots in their existing order.
+    """
+    live = ~dead if dead is not None else np.ones(len(base.bug_ids), dtype=bool)
+    bug_ids = np.asarray(bug_ids, dtype=np.int64)
+    merged_ids = np.sort(np.concatenate([base.bug_ids[live], bug_ids]))
+    # Rows follow bug id order, so the row of a bug can be found by bisection
+    base_rows = np.searchsorted(merged_ids, base.bug_ids).astype(np.int32)
+    added_rows, features, weights = _vector_entries(vectors)
+    by_feature = np.argsort(features, kind='stable')
+    features, weights = features[by_feature], weights[by_feature]
+    added_rows = np.searchsorted(merged_ids, bug_ids)[added_rows[by_feature]].astype(np.int32)
+
+    # kept_at[t]: kept base entries before the posting list of term t ends
+    keep = live[base.rows]
+    kept_cumulative = np.cumsum(keep, dtype=np.int64 if len(keep) >= 1 << 31 else np.int32)
+    kept_at = (np.where(base.pointers > 0, kept_cumulative[np.maximum(base.pointers - 1, 0)], 0)
+               if len(keep) else np.zeros_like(base.pointers))
+    pointers = np.zeros(SIMILARITY_FEATURES + 1, dtype=np.int64)
+    pointers[1:] = kept_at[1:] + np.cumsum(np.bincount(features, minlength=SIMILARITY_FEATURES))
+
+    slots = kept_at[features.astype(np.int64) + 1] + np.arange(len(features))
+    added = np.zeros(int(pointers[-1]), dtype=bool)
+    added[slots] = True
+    rows = np.empty(len(added), dtype=np.int32)
+    rows[slots] = added_rows
+    rows[~added] = base_rows[base.rows[keep]]
+    merged_weights = np.empty(len(added), dtype=np.float32)
+    merged_weights[slots] = weights
+    merged_weights[~added] = base.weights[keep]
+
+    count = len(merged_ids)
+    idf = (np.log((1 + count) / (1 + np.diff(pointers))) + 1).astype(np.float32)
+    return SimilarityBase(bug_ids=merged_ids, norms=_posting_norms(pointers, rows, merged_weights, idf, count),
+                          idf=idf, pointers=pointers, rows=rows, weights=merged_weights)
+
+class SimilarityIndexStale(Exception):
+    """The index on disk was built from another database, or one since restored from a backup"""
+
+class SimilarityIndex:
+    """Top-k cosine similarity between bugs over a hashed TF-IDF matrix.
+
+    The bulk of the matrix is an immutable on-disk generation, memory-mapped
+    read-only. Bugs created, edited or deleted since then are caught up from
+    bug_history and bug_deletions: their old rows are masked out and their
+    current text is scored from a small in-memory delta. Once enough bugs
+    have changed, base and delta are merged into a new generation on disk.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._state = None
+        self._pending = {}  # bug id -> current vector, or None once deleted
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self._state is not None
+
+    @property
+    def size(self):
+        state = self._state
+        if state is None:
+            return 0
+        removed = int(state.dead.sum()) if state.dead is not None else 0
+        return len(state.base.bug_ids) - removed + len(state.delta.bug_ids)
+
+    def _meta_path(self):
+        return os.path.join(self.directory, 'meta.json')
+
+    def load(self):
+        """Map the newest generation on disk unless it is already in use; False when there is none.
+
+        Also how a worker picks up generations written by other workers.
+        """
+        with self._lock:
+            try:
+                with open(self._meta_path()) as f:
+                    meta = json.load(f)
+                if meta.get('features') != SIMILARITY_FEATURES:
+                    logger.warning("Similarity index on disk uses another feature size; it will be rebuilt")
+                    return False
+                if self._state is not None and self._state.generation == meta['generation']:
+                    return True
+                generation = os.path.join(self.directory, meta['generation'])
+                base = SimilarityBase(*(np.load(os.path.join(generation, f'{name}.npy'), mmap_mode='r')
+                                        for name in SIMILARITY_ARRAYS))
+            except FileNotFoundError:
+                return False
+            self._pending = {}
+            self._publish(base, tuple(meta['cursor']), meta['generation'])
+            logger.info(f"Similarity index loaded: {len(base.bug_ids)} bugs from generation {meta['generation']}")
+            return True
+
+    def build(self, conn):
+        """Index every bug from one snapshot and write it as a new generation"""
+        start = time.perf_counter()
+        conn.execute('BEGIN')
+        try:
+            cursor = (conn.execute('SELECT COALESCE(MAX(id), 0) FROM bug_history').fetchone()[0],
+                      conn.execute('SELECT COALESCE(MAX(id), 0) FROM bug_deletions').fetchone()[0])
+            base = empty_similarity_base()
+            bugs = conn.execute('SELECT id, title, description, steps, actual_result FROM bugs')
+            while True:
+                chunk = bugs.fetchmany(SIMILARITY_BUILD_CHUNK)
+                if not chunk:
+                    break
+                base = merge_similarity_base(base, None, [bug['id'] for bug in chunk],
+                                             [bug_text_vector(bug) for bug in chunk])
+        finally:
+            conn.rollback()
+
+        with self._lock:
+            self._pending = {}
+            self._save(base, cursor)
+        logger.info(f"Similarity index built: {len(base.bug_ids)} bugs in {time.perf_counter() - start:.1f}s")
+        return len(base.bug_ids)
+
+    def refresh(self, conn):
+        """Apply bugs changed since the index cursor; returns how many were re-indexed or dropped"""
+        with self._lock:
+            state = self._state
+            history_after, deletion_after = state.cursor
+            conn.execute('BEGIN')
+            try:
+                cursor = (conn.execute('SELECT COALESCE(MAX(id), 0) FROM bug_history').fetchone()[0],
+                          conn.execute('SELECT COALESCE(MAX(id), 0) FROM bug_deletions').fetchone()[0])
+                if cursor == state.cursor:
+                    return 0
+                if cursor[0] < history_after or cursor[1] < deletion_after:
+                    raise SimilarityIndexStale(f'index cursor {state.cursor} is ahead of the database {cursor}')
+                placeholders = ','.join('?' * len(SIMILARITY_TEXT_ACTIONS))
+                changed = [row[0] for row in conn.execute(f'''
+                    SELECT DISTINCT bug_id FROM bug_history
+                    WHERE id > ? AND id <= ? AND action IN ({placeholders})
+                ''', (history_after, cursor[0], *SIMILARITY_TEXT_ACTIONS))]
+                deleted = [row[0] for row in conn.execute(
+                    'SELECT bug_id FROM bug_deletions WHERE id > ? AND id <= ?', (deletion_after, cursor[1]))]
+                vectors = {}
+                for chunk in _chunked(changed):
+                    for bug in conn.execute(f'''
+                        SELECT id, title, description, steps, actual_result FROM bugs
+                        WHERE id IN ({','.join('?' * len(chunk))})
+                    ''', chunk):
+                        vectors[bug['id']] = bug_text_vector(bug)
+            finally:
+                conn.rollback()
+
+            for bug_id in changed + deleted:
+                self._pending[bug_id] = vectors.get(bug_id)
+            if len(self._pending) >= SIMILARITY_COMPACT_CHANGES:
+                self._compact(cursor)
+            else:
+                self._publish(state.base, cursor, state.generation)
+            return len(changed) + len(deleted)
+
+    def compact(self):
+        """Write pending changes out as a new generation now; False when there were none"""
+        with self._lock:
+            if not self._pending:
+                return False
+            self._compact(self._state.cursor)
+            return True
+
+    def _publish(self, base, cursor, generation):
+        """Swap in a new state from a base and the pending changes (lock held)"""
+        dead = None
+        if self._pending:
+            changed = np.fromiter(self._pending.keys(), dtype=np.int64, count=len(self._pending))
+            rows = np.searchsorted(base.bug_ids, changed)
+            found = rows < len(base.bug_ids)
+            found[found] = base.bug_ids[rows[found]] == changed[found]
+            dead = np.zeros(len(base.bug_ids), dtype=bool)
+            dead[rows[found]] = True
+
+        live = [(bug_id, vector) for bug_id, vector in self._pending.items() if vector is not None]
+        rows, features, weights = _vector_entries([vector for _, vector in live])
+        delta = SimilarityDelta(bug_ids=np.array([bug_id for bug_id, _ in live], dtype=np.int64),
+                                norms=_row_norms(rows, features, weights, base.idf, len(live)),
+                                features=features, rows=rows, weights=weights)
+        self._state = SimilarityState(base, dead, delta, cursor, generation)
+
+    def _compact(self, cursor):
+        """Merge the live base rows and the pending changes into a new generation (lock held)"""
+        pending = [(bug_id, vector) for bug_id, vector in self._pending.items() if vector is not None]
+        merged = merge_similarity_base(self._state.base, self._state.dead, [bug_id for bug_id, _ in pending],
+                                       [vector for _, vector in pending])
+        self._pending = {}
+        self._save(merged, cursor)
+
+    def _save(self, base, cursor):
+        """Write a base as a new generation, switch to it and drop generations before the previous one (lock held)"""
+        os.makedirs(self.directory, exist_ok=True)
+        generation = f'{now_ms()}-{os.getpid()}'
+        path = os.path.join(self.directory, generation)
+        os.makedirs(path)
+        for name in SIMILARITY_ARRAYS:
+            np.save(os.path.join(path, f'{name}.npy'), getattr(base, name))
+
+        meta = {'generation': generation, 'cursor': list(cursor), 'features': SIMILARITY_FEATURES,
+                'bugs': len(base.bug_ids), 'created_at': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}
+        previous = None
+        try:
+            with open(self._meta_path()) as f:
+                previous = json.load(f)['generation']
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        temp_path = f'{self._meta_path()}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(temp_path, self._meta_path())
+
+        # Other workers may still be mapping the previous generation; everything older can go
+        for entry in os.listdir(self.directory):
+            if entry not in (generation, previous) and os.path.isdir(os.path.join(self.directory, entry)):
+                shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)
+
+        # Map the files just written rather than keeping the arrays in private memory
+        mapped = SimilarityBase(*(np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+                                  for name in SIMILARITY_ARRAYS))
+        self._publish(mapped, cursor, generation)
+
+    def query(self, vectors, k=SIMILARITY_RELATED, exclude=None, min_score=SIMILARITY_MIN_SCORE):
+        """Top-k [(bug_id, score)] for each query vector, best first, all from one snapshot of the index"""
+        state = self._state
+        if state is None:
+            return [[] for _ in vectors]
+        exclude = exclude or [None] * len(vectors)
+        return [self._top_k(state, features, tf, k, excluded, min_score)
+                for (features, tf), excluded in zip(vectors, exclude)]
+
+    @staticmethod
+    def _top_k(state, features, tf, k, exclude, min_score):
+        """Score one query against base and delta.
+
+        Only the query's SIMILARITY_QUERY_TERMS highest-weighted terms are
+        looked up, rarest first, and the commonest of those are dropped once
+        SIMILARITY_QUERY_POSTINGS posting entries would be read: the cost of a
+        query stays bounded however many bugs share its words.
+        """
+        base, delta = state.base, state.delta
+        scaled = tf * base.idf[features]
+        norm = float(np.sqrt((scaled ** 2).sum())) or 1.0
+        if len(features) > SIMILARITY_QUERY_TERMS:
+            top = np.argpartition(scaled, -SIMILARITY_QUERY_TERMS)[-SIMILARITY_QUERY_TERMS:]
+            features, scaled = features[top], scaled[top]
+        starts = base.pointers[features]
+        lengths = base.pointers[features + 1] - starts
+        order = np.argsort(lengths, kind='stable')
+        order = order[np.cumsum(lengths[order]) <= max(SIMILARITY_QUERY_POSTINGS, lengths[order[:1]].sum())]
+        features, starts, lengths = features[order], starts[order], lengths[order]
+        weights = scaled[order] * base.idf[features] / norm
+
+        # Gather the posting lists and add up each bug's dot product with the query
+        entries = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        rows = base.rows[entries]
+        count = len(base.bug_ids)
+        # Without any posting entries bincount returns ints, which would truncate the delta scores
+        scores = np.bincount(rows, weights=base.weights[entries] * np.repeat(weights, lengths) / base.norms[rows],
+                             minlength=count + len(delta.bug_ids)).astype(np.float64, copy=False)
+        if state.dead is not None:
+            scores[:count][state.dead] = 0
+        if len(delta.bug_ids) and len(features):
+            by_feature = np.argsort(features)
+            position = np.minimum(np.searchsorted(features[by_feature], delta.features), len(features) - 1)
+            matched = np.where(features[by_feature][position] == delta.features, weights[by_feature][position], 0)
+            scores[count:] = np.bincount(delta.rows, weights=matched * delta.weights,
+                                         minlength=len(delta.bug_ids)) / delta.norms
+
+        # Selecting from the few bugs above the threshold beats partitioning every score
+        candidates = np.flatnonzero(scores >= max(min_score, 1e-9))
+        if len(candidates) > k + 1:
+            candidates = candidates[np.argpartition(scores[candidates], -(k + 1))[-(k + 1):]]
+        matches = []
+        for row in candidates[np.argsort(-scores[candidates], kind='stable')]:
+            bug_id = int(base.bug_ids[row] if row < count else delta.bug_ids[row - count])
+            if bug_id != exclude:
+                matches.append((bug_id, round(float(scores[row]), 4)))
+        return matches[:k]
+
+class SimilarityIndexer:
+    """Background thread that loads or builds the similarity index, then keeps it current.
+
+    Woken by change_notifier when this process records a change, and every
+    SIMILARITY_POLL_SECONDS for bugs written by other processes.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='similarity-indexer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            version = change_notifier.version
+            try:
+                with get_db_connection() as conn:
+                    if not self.index.load():
+                        self.index.build(conn)
+                    try:
+                        self.index.refresh(conn)
+                    except SimilarityIndexStale as e:
+                        logger.warning(f"Rebuilding similarity index: {str(e)}")
+                        self.index.build(conn)
+            except Exception as e:
+                logger.error(f"Similarity indexer error: {str(e)}")
+            change_notifier.wait(version, SIMILARITY_POLL_SECONDS)
+
+similarity_index = SimilarityIndex(app.config['SIMILARITY_INDEX_DIR'])
+similarity_indexer = SimilarityIndexer(similarity_index)
+
+@app.before_request
+def start_similarity_indexer():
+    """Start the similarity indexer in processes that serve requests"""
+    if app.config['SIMILARITY_ENABLED'] and not app.testing:
+        similarity_indexer.start()
+
+def related_bugs(conn, bug, k=SIMILARITY_RELATED):
+    """Bugs most similar to `bug` as (BugPanelRow, score) pairs; empty until the index is ready"""
+    if not app.config['SIMILARITY_ENABLED'] or not similarity_index.ready:
+        return []
+    matches = similarity_index.query([bug_text_vector(bug)], k, exclude=[bug['id']])[0]
+    if not matches:
+        return []
+    rows = BUG_PANEL.fetchall(conn, f'''
+        SELECT {BUG_PANEL.columns}
+        FROM bugs b
+        LEFT JOIN users assignee ON b.assigned_to = assignee.id
+        WHERE b.id IN ({','.join('?' * len(matches))})
+    ''', [bug_id for bug_id, _ in matches])
+    by_id = {row.id: row for row in rows}
+    return [(by_id[bug_id], score) for bug_id, score in matches if bug_id in by_id]
+
+# ============== BULK IMPORT ==============
+
+IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', '5000'))
+IMPORT_MAX_REPORTED_ERRORS = 1000
+IMPORT_FORMATS = {'jsonl', 'csv'}
+
+def parse_import_rows(stream, fmt):
+    """Yield (row_number, fields, parse_error) from a JSON Lines or CSV text stream"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for fields in reader:
+            yield reader.line_num, fields, None
+        return
+
+    for row_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            fields = json.loads(line)
+        except ValueError as e:
+            yield row_number, None, f'Invalid JSON: {str(e)}'
+            continue
+        if not isinstance(fields, dict):
+            yield row_number, None, 'Each line must be a JSON object'
+            continue
+        yield row_number, fields, None
+
+def _insert_bug_chunk(conn, bugs, user_id):
+    """Insert validated bugs and their history rows in a single transaction"""
+    conn.execute('BEGIN IMMEDIATE')
+    created_at_ms = now_ms()
+    conn.executemany('''
+        INSERT INTO bugs (title, description, steps, expected_result, actual_result, screenshot_url, priority, status,
+                          created_by, created_at_ms)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [(bug['title'], bug['description'], bug['steps'], bug['expected_result'], bug['actual_result'],
+           bug['screenshot_url'], bug['priority'], bug['status'], user_id, created_at_ms) for bug in bugs])
+
+    # The write lock is held, so AUTOINCREMENT ids of this chunk are consecutive
+    last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+    first_id = last_id - len(bugs) + 1
+    conn.executemany('''
+        INSERT INTO bug_history (bug_id, user_id, action, old_value, new_value, created_at_ms)
+        VALUES (?, ?, 'bug_created', NULL, 'imported', ?)
+    ''', [(bug_id, user_id, created_at_ms) for bug_id in range(first_id, last_id + 1)])
+    conn.commit()
+    change_notifier.notify()
+    return len(bugs)
+
+def import_bugs(conn, rows, user_id, chunk_size=IMPORT_CHUNK_SIZE):
+    """Validate rows with the new_bug() rules and insert them in chunked transactions.
+
+    Returns (imported_count, errors) where errors is a list of {'row', 'error'} dicts.
+    """
+    imported = 0
+    errors = []
+    chunk = []
+
+    for row_number, fields, parse_error in rows:
+        if parse_error:
+            errors.append({'row': row_number, 'error': parse_error})
+            continue
+
+        bug, error = validate_bug_fields(fields)
+        status = _field_text(fields, 'status', 'Open') or 'Open'
+        if not error and status not in VALID_STATUSES:
+            error = 'Invalid status'
+        if error:
+            errors.append({'row': row_number, 'error': error})
+            continue
+
+        bug['status'] = status
+        chunk.append(bug)
+        if len(chunk) >= chunk_size:
+            imported += _insert_bug_chunk(conn, chunk, user_id)
+            chunk = []
+
+    if chunk:
+        imported += _insert_bug_chunk(conn, chunk, user_id)
+
+    return imported, errors
+
+def detect_import_format(filename, mimetype):
+    """Pick the import format from the query string, file name or content type"""
+    if request.args.get('format'):
+        return request.args.get('format').lower()
+    if (filename or '').lower().endswith('.csv') or mimetype == 'text/csv':
+        return 'csv'
+    return 'jsonl'
+
+@app.route('/api/bugs/import', methods=['POST'])
+@admin_required
+def api_import_bugs():
+    """Bulk import bugs from JSON Lines or CSV (Admin only)"""
+    upload = request.files.get('file')
+    if upload and upload.filename:
+        fmt = detect_import_format(upload.filename, upload.mimetype)
+        payload = upload.read()
+    else:
+        fmt = detect_import_format(None, request.mimetype)
+        payload = request.get_data()
+
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({'success': False, 'error': f"Unsupported format '{fmt}'. Use jsonl or csv."}), 400
+
+    try:
+        stream = io.StringIO(payload.decode('utf-8-sig'), newline='')
+    except UnicodeDecodeError:
+        return jsonify({'success': False, 'error': 'Import file must be UTF-8 encoded'}), 400
+
+    try:
+        with get_db_connection() as conn:
+            start = time.perf_counter()
+            imported, errors = import_bugs(conn, parse_import_rows(stream, fmt), session['user_id'])
+            elapsed = time.perf_counter() - start
+
+        logger.info(f"Bulk import by {session['user_email']}: {imported} bugs, {len(errors)} rejected in {elapsed:.2f}s")
+        return jsonify({
+            'success': True,
+            'imported': imported,
+            'failed': len(errors),
+            'errors': errors[:IMPORT_MAX_REPORTED_ERRORS],
+            'errors_truncated': len(errors) > IMPORT_MAX_REPORTED_ERRORS
+        })
+
+    except Exception as e:
+        logger.error(f"Bulk import error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Import failed. Rows from completed chunks were kept.'
+        }), 500
+
+@app.route('/bug/<int:bug_id>/delete', methods=['POST'])
+@login_required
+def delete_bug(bug_id):
+    """Delete a bug (only if created by current user or admin)"""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            
+            # Check if user created this bug
+            cursor.execute('SELECT created_by, title FROM bugs WHERE id = ?', (bug_id,))
+            bug = cursor.fetchone()
+            
+            if not bug:
+                flash('Bug not found', 'error')
+                return redirect(url_for('dashboard'))
+            
+            if bug['created_by'] != session['user_id']:
+                flash('You can only delete bugs you created', 'error')
+                return redirect(url_for('view_bug', bug_id=bug_id))
+            
+            # Take the write lock first so the analytics cursor cannot move underneath
+            cursor.execute('BEGIN IMMEDIATE')
+            record_bug_deletion_analytics(conn, bug_id)
+            
+            # Delete comments and history first (foreign key constraint)
+            cursor.execute('DELETE FROM comments WHERE bug_id = ?', (bug_id,))
+            cursor.execute('DELETE FROM bug_history WHERE bug_id = ?', (bug_id,))
+            
+            # Delete bug, leaving a tombstone for the change feed
+            cursor.execute('DELETE FROM bugs WHERE id = ?', (bug_id,))
+            cursor.execute('INSERT INTO bug_deletions (bug_id, user_id, title, created_at_ms) VALUES (?, ?, ?, ?)',
+                         (bug_id, session['user_id'], bug['title'], now_ms()))
+            conn.commit()
+            change_notifier.notify()
+            
+            logger.info(f"Bug #{bug_id} '{bug['title']}' deleted by {session['user_email']}")
+            flash('Bug deleted successfully', 'success')
+            return redirect(url_for('dashboard'))
+    
+    except Exception as e:
+        logger.error(f"Error deleting bug: {str(e)}")
+        flash('Error deleting bug. Please try again.', 'error')
+        return redirect(url_for('view_bug', bug_id=bug_id))
+
+@app.route('/uploads/<filename>')
+def uploaded_file(filename):
+    """Serve uploaded images"""
+    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+
+@app.route('/export/csv')
+@login_required
+def export_csv():
+    """Export bugs (optionally ?from=&to= created dates) to CSV, streamed from a snapshot
+    so writers are never blocked"""
+    upload_url = url_for('uploaded_file', filename='', _external=True)
+    try:
+        range_sql, range_params = date_range_sql('b.created_at_ms', *parse_date_range(request.args))
+    except ValueError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('dashboard'))
+
+    def generate():
+        with get_snapshot_connection() as conn:
+            cursor = conn.execute(f'''
+                SELECT b.id, b.title, b.description, b.priority, b.status,
+                       b.created_at, b.screenshot_path, creator.email as creator,
+                       assignee.email as assignee
+                FROM bugs b
+                LEFT JOIN users creator ON b.created_by = creator.id
+                LEFT JOIN users assignee ON b.assigned_to = assignee.id
+                WHERE 1=1{range_sql}
+                ORDER BY b.created_at_ms DESC, b.id DESC
+            ''', range_params)
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(['ID', 'Title', 'Description', 'Priority', 'Status', 'Created At',
+                             'Created By', 'Assigned To', 'Screenshot'])
+            while True:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                writer.writerows(
+                    (bug['id'], bug['title'], bug['description'], bug['priority'], bug['status'],
+                     bug['created_at'], bug['creator'], bug['assignee'] or 'Unassigned',
+                     upload_url + bug['screenshot_path'] if bug['screenshot_path'] else '')
+                    for bug in rows)
+
+    chunks = generate()
+    try:
+        # Run the query before committing to a 200 response
+        header = next(chunks)
+    except Exception as e:
+        logger.error(f"Export error: {str(e)}")
         flash('Error exporting data. Please try again.', 'error')
         return redirect(url_for('dashboard'))
 
+    def stream():
+        yield header
+        yield from chunks
+
+    return Response(
+        stream(),
+        mimetype="text/csv",
+        headers={"Content-disposition": "attachment; filename=bugs_export.csv"}
+    )
+
 @app.route('/export/excel')
 @login_required
 def export_excel():
-    """Export all bugs to Excel format with formatting"""
+    """Export bugs (optionally ?from=&to= created dates) to Excel format with formatting"""
     try:
         # Try to import openpyxl, if not available, fall back to CSV
         try:
@@ -1581,132 +4584,137 @@ def export_excel():
             from openpyxl.utils import get_column_letter
         except ImportError:
             flash('Excel export not available. Please install openpyxl: pip install openpyxl', 'warning')
-            return redirect(url_for('export_csv'))
+            return redirect(url_for('export_csv', **request.args))
         
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+        try:
+            range_sql, range_params = date_range_sql('b.created_at_ms', *parse_date_range(request.args))
+        except ValueError as e:
+            flash(str(e), 'error')
+            return redirect(url_for('dashboard'))
+        
+        # Read from a snapshot and release it before the (slow) workbook build
+        with get_snapshot_connection() as conn:
+            bugs = conn.execute(f'''
                 SELECT b.id, b.title, b.description, b.priority, b.status,
                        b.created_at, b.screenshot_path, b.screenshot_url,
                        creator.email as creator, assignee.email as assignee
                 FROM bugs b
                 LEFT JOIN users creator ON b.created_by = creator.id
                 LEFT JOIN users assignee ON b.assigned_to = assignee.id
-                ORDER BY b.created_at DESC
-            ''')
-            bugs = cursor.fetchall()
+                WHERE 1=1{range_sql}
+                ORDER BY b.created_at_ms DESC, b.id DESC
+            ''', range_params).fetchall()
+        
+        # Create workbook
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Bug Report"
+        
+        # Header style
+        header_fill = PatternFill(start_color="6366f1", end_color="6366f1", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF", size=12)
+        border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        
+        # Headers
+        headers = ['ID', 'Title', 'Description', 'Priority', 'Status', 'Created At', 
+                  'Created By', 'Assigned To', 'Screenshot URL']
+        for col_num, header in enumerate(headers, 1):
+            cell = ws.cell(row=1, column=col_num)
+            cell.value = header
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = Alignment(horizontal='center', vertical='center')
+            cell.border = border
+        
+        # Data rows with formatting
+        for row_num, bug in enumerate(bugs, 2):
+            # Priority colors
+            priority_colors = {
+                'High': 'fee2e2',
+                'Medium': 'fef3c7',
+                'Low': 'dcfce7'
+            }
             
-            # Create workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Bug Report"
+            # Status colors
+            status_colors = {
+                'Open': 'fecaca',
+                'In Progress': 'fed7aa',
+                'Fixed': 'bbf7d0',
+                'Closed': 'd1d5db'
+            }
             
-            # Header style
-            header_fill = PatternFill(start_color="6366f1", end_color="6366f1", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF", size=12)
-            border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
+            # Screenshot link
+            screenshot_link = ""
+            if bug['screenshot_path']:
+                screenshot_link = f"http://127.0.0.1:5000/uploads/{bug['screenshot_path']}"
+            elif bug['screenshot_url']:
+                screenshot_link = bug['screenshot_url']
             
-            # Headers
-            headers = ['ID', 'Title', 'Description', 'Priority', 'Status', 'Created At', 
-                      'Created By', 'Assigned To', 'Screenshot URL']
-            for col_num, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col_num)
-                cell.value = header
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = border
+            data = [
+                bug['id'],
+                bug['title'],
+                bug['description'],
+                bug['priority'],
+                bug['status'],
+                bug['created_at'],
+                bug['creator'],
+                bug['assignee'] or 'Unassigned',
+                screenshot_link
+            ]
             
-            # Data rows with formatting
-            for row_num, bug in enumerate(bugs, 2):
-                # Priority colors
-                priority_colors = {
-                    'High': 'fee2e2',
-                    'Medium': 'fef3c7',
-                    'Low': 'dcfce7'
-                }
-                
-                # Status colors
-                status_colors = {
-                    'Open': 'fecaca',
-                    'In Progress': 'fed7aa',
-                    'Fixed': 'bbf7d0',
-                    'Closed': 'd1d5db'
-                }
+            for col_num, value in enumerate(data, 1):
+                cell = ws.cell(row=row_num, column=col_num)
+                cell.value = value
+                cell.border = border
+                cell.alignment = Alignment(vertical='top', wrap_text=True)
                 
-                # Screenshot link
-                screenshot_link = ""
-                if bug['screenshot_path']:
-                    screenshot_link = f"http://127.0.0.1:5000/uploads/{bug['screenshot_path']}"
-                elif bug['screenshot_url']:
-                    screenshot_link = bug['screenshot_url']
+                # Apply priority color
+                if col_num == 4:  # Priority column
+                    cell.fill = PatternFill(start_color=priority_colors.get(value, 'FFFFFF'),
+                                           end_color=priority_colors.get(value, 'FFFFFF'),
+                                           fill_type="solid")
+                    cell.font = Font(bold=True)
                 
-                data = [
-                    bug['id'],
-                    bug['title'],
-                    bug['description'],
-                    bug['priority'],
-                    bug['status'],
-                    bug['created_at'],
-                    bug['creator'],
-                    bug['assignee'] or 'Unassigned',
-                    screenshot_link
-                ]
+                # Apply status color
+                if col_num == 5:  # Status column
+                    cell.fill = PatternFill(start_color=status_colors.get(value, 'FFFFFF'),
+                                           end_color=status_colors.get(value, 'FFFFFF'),
+                                           fill_type="solid")
+                    cell.font = Font(bold=True)
                 
-                for col_num, value in enumerate(data, 1):
-                    cell = ws.cell(row=row_num, column=col_num)
-                    cell.value = value
-                    cell.border = border
-                    cell.alignment = Alignment(vertical='top', wrap_text=True)
-                    
-                    # Apply priority color
-                    if col_num == 4:  # Priority column
-                        cell.fill = PatternFill(start_color=priority_colors.get(value, 'FFFFFF'),
-                                               end_color=priority_colors.get(value, 'FFFFFF'),
-                                               fill_type="solid")
-                        cell.font = Font(bold=True)
-                    
-                    # Apply status color
-                    if col_num == 5:  # Status column
-                        cell.fill = PatternFill(start_color=status_colors.get(value, 'FFFFFF'),
-                                               end_color=status_colors.get(value, 'FFFFFF'),
-                                               fill_type="solid")
-                        cell.font = Font(bold=True)
-                    
-                    # Make screenshot URL clickable
-                    if col_num == 9 and value:
-                        cell.hyperlink = value
-                        cell.font = Font(color="0563C1", underline="single")
-            
-            # Adjust column widths
-            column_widths = [8, 30, 50, 12, 15, 20, 25, 25, 40]
-            for col_num, width in enumerate(column_widths, 1):
-                ws.column_dimensions[get_column_letter(col_num)].width = width
-            
-            # Row heights
-            ws.row_dimensions[1].height = 25
-            for row in range(2, len(bugs) + 2):
-                ws.row_dimensions[row].height = 60
-            
-            # Save to BytesIO
-            excel_file = io.BytesIO()
-            wb.save(excel_file)
-            excel_file.seek(0)
-            
-            from flask import send_file
-            return send_file(
-                excel_file,
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                as_attachment=True,
-                download_name=f'bugs_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-            )
-    
+                # Make screenshot URL clickable
+                if col_num == 9 and value:
+                    cell.hyperlink = value
+                    cell.font = Font(color="0563C1", underline="single")
+        
+        # Adjust column widths
+        column_widths = [8, 30, 50, 12, 15, 20, 25, 25, 40]
+        for col_num, width in enumerate(column_widths, 1):
+            ws.column_dimensions[get_column_letter(col_num)].width = width
+        
+        # Row heights
+        ws.row_dimensions[1].height = 25
+        for row in range(2, len(bugs) + 2):
+            ws.row_dimensions[row].height = 60
+        
+        # Save to BytesIO
+        excel_file = io.BytesIO()
+        wb.save(excel_file)
+        excel_file.seek(0)
+        
+        from flask import send_file
+        return send_file(
+            excel_file,
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            as_attachment=True,
+            download_name=f'bugs_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+        )
+
     except Exception as e:
         logger.error(f"Excel export error: {str(e)}")
         flash('Error exporting to Excel. Please try again.', 'error')
@@ -1714,6 +4722,7 @@ def export_excel():
 
 @app.route('/api/check-duplicates', methods=['POST'])
 @login_required
+@rate_limit('check_duplicates')
 def check_duplicates():
     """Check for similar bug titles to detect potential duplicates"""
     try:
@@ -1725,6 +4734,27 @@ def check_duplicates():
         
         with get_db_connection() as conn:
             cursor = conn.cursor()
+
+            if app.config['SIMILARITY_ENABLED'] and similarity_index.ready:
+                # Best title matches over all bugs, keeping the ones still open
+                vector = text_vector([(title, SIMILARITY_FIELDS[0][1])])
+                matches = similarity_index.query([vector], k=20, min_score=SIMILARITY_DUPLICATE_SCORE)[0]
+                if not matches:
+                    return jsonify({'similar_bugs': []})
+                cursor.execute(f'''
+                    SELECT id, title, status, priority, created_at
+                    FROM bugs
+                    WHERE id IN ({','.join('?' * len(matches))}) AND status != 'Closed'
+                ''', [bug_id for bug_id, _ in matches])
+                by_id = {bug['id']: bug for bug in cursor.fetchall()}
+                return jsonify({'similar_bugs': [{
+                    'id': bug_id,
+                    'title': by_id[bug_id]['title'],
+                    'status': by_id[bug_id]['status'],
+                    'priority': by_id[bug_id]['priority'],
+                    'created_at': by_id[bug_id]['created_at'][:16],
+                    'score': score
+                } for bug_id, score in matches if bug_id in by_id][:5]})
             
             # Simple similarity check - find bugs with matching words
             words = set(title.split())
@@ -1735,7 +4765,7 @@ def check_duplicates():
                 SELECT id, title, status, priority, created_at 
                 FROM bugs 
                 WHERE status != 'Closed'
-                ORDER BY created_at DESC 
+                ORDER BY created_at_ms DESC, id DESC 
                 LIMIT 100
             ''')
             all_bugs = cursor.fetchall()
@@ -1762,39 +4792,94 @@ def check_duplicates():
         logger.error(f"Duplicate check error: {str(e)}")
         return jsonify({'similar_bugs': []})
 
+def history_filters(args):
+    """Parse the before/limit/action/actor/collapse args of a history timeline request (raises ValueError)"""
+    before = parse_page_cursor(args['before']) if args.get('before') else None
+    limit = min(max(1, int(args.get('limit', HISTORY_PAGE_SIZE))), HISTORY_MAX_PAGE_SIZE)
+    actions = [action for action in args.getlist('action') if action]
+    if any(action not in HISTORY_ACTIONS for action in actions):
+        raise ValueError('unknown action')
+    actor = args.get('actor', '').strip().lower()
+    collapse = args.get('collapse', '1').lower() not in ('0', 'false', 'no')
+    return before, limit, actions, actor, collapse
+
+def actor_history_page(conn, bug_id, before, limit, actions, actor, collapse):
+    """history_page with the actor given by email; an unknown actor has no history"""
+    actor_id = None
+    if actor:
+        user = conn.execute('SELECT id FROM users WHERE email = ?', (actor,)).fetchone()
+        if not user:
+            return [], None
+        actor_id = user['id']
+    return history_page(conn, bug_id, before, limit, actions, actor_id, collapse)
+
 @app.route('/bug/<int:bug_id>/history')
 @login_required
 def bug_history(bug_id):
-    """View complete history of a bug"""
+    """View the history of a bug, newest first; older entries are loaded on demand.
+
+    With ?fragment=1 only the entries of the requested page are rendered, for
+    the page's "Load older" button.
+    """
+    try:
+        filters = history_filters(request.args)
+    except ValueError:
+        flash('Invalid history filter', 'error')
+        return redirect(url_for('bug_history', bug_id=bug_id))
+    before, limit, actions, actor, collapse = filters
+
     try:
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Get bug details
-            cursor.execute('SELECT * FROM bugs WHERE id = ?', (bug_id,))
-            bug = cursor.fetchone()
+            bug = conn.execute('SELECT id, title FROM bugs WHERE id = ?', (bug_id,)).fetchone()
             
             if not bug:
                 flash('Bug not found', 'error')
                 return redirect(url_for('dashboard'))
             
-            # Get history records
-            cursor.execute('''
-                SELECT bh.*, u.email as user_email
-                FROM bug_history bh
-                LEFT JOIN users u ON bh.user_id = u.id
-                WHERE bh.bug_id = ?
-                ORDER BY bh.created_at DESC
-            ''', (bug_id,))
-            history = cursor.fetchall()
+            history, older = actor_history_page(conn, bug_id, *filters)
+            history_times = format_datetimes([created_time(record) for record in history])
+            first_times = format_datetimes([record.first_created_at_ms if record.first_created_at_ms is not None
+                                            else record.first_created_at for record in history])
             
-            return render_template('bug_history.html', bug=bug, history=history)
+            template = '_history_entries.html' if request.args.get('fragment') else 'bug_history.html'
+            return render_template(template, bug=bug, history=history, history_times=history_times,
+                                   first_times=first_times, older=older, history_actions=HISTORY_ACTIONS,
+                                   actions=actions, actor=actor, collapse=collapse, filtered=bool(actions or actor))
     
     except Exception as e:
         logger.error(f"History view error: {str(e)}")
         flash('Error loading history. Please try again.', 'error')
         return redirect(url_for('dashboard'))
 
+@app.route('/api/bugs/<int:bug_id>/history')
+@login_required
+def api_bug_history(bug_id):
+    """History of a bug: /api/bugs/<id>/history?before=<cursor>&limit=&action=&actor=&collapse=
+
+    Newest first. `action` may repeat; `actor` is a user email; collapse=0
+    returns every row instead of folding runs of identical events. `older` is
+    the cursor for the next page, or null at the first event.
+    """
+    try:
+        filters = history_filters(request.args)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid before, limit or action parameter'}), 400
+
+    try:
+        with get_db_connection() as conn:
+            if not conn.execute('SELECT 1 FROM bugs WHERE id = ?', (bug_id,)).fetchone():
+                return jsonify({'success': False, 'error': 'Bug not found'}), 404
+            history, older = actor_history_page(conn, bug_id, *filters)
+        return jsonify({
+            'success': True,
+            'older': older,
+            'history': [{field: value for field, value in entry._asdict().items() if field != 'scan_position'}
+                        for entry in history]
+        })
+    except Exception as e:
+        logger.error(f"Error loading history for bug {bug_id}: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to fetch history'}), 500
+
 
 @app.route('/health')
 def health_check():
@@ -1816,6 +4901,468 @@ def health_check():
             'error': str(e)
         }), 500
 
+@app.route('/metrics')
+def metrics():
+    """Request instrumentation in Prometheus text format"""
+    if not app.config['METRICS_ENABLED']:
+        return Response('Metrics are disabled. Set METRICS_ENABLED=true to enable.\n',
+                        status=404, mimetype='text/plain')
+    return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# ============== TEMPLATE CACHE AND WARM-UP ==============
+
+# Compiled templates are kept on disk and shared by all workers, so a restart
+# does not recompile them. Unset, TEMPLATE_CACHE_DIR falls back to Jinja's
+# per-user directory under the system temp dir; empty turns the cache off
+TEMPLATE_CACHE_DIR = os.environ.get('TEMPLATE_CACHE_DIR')
+if TEMPLATE_CACHE_DIR != '':
+    try:
+        if TEMPLATE_CACHE_DIR:
+            os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"Template bytecode cache disabled: {str(e)}")
+
+def warm_up():
+    """Precompile every template and prime the database, URL map, hashing pool and asset bundles.
+
+    Run once per worker before it takes traffic, so the first requests do not
+    pay for compilation and lazy start-up. Returns the seconds spent per step.
+    """
+    def prime_templates():
+        names = app.jinja_env.list_templates(filter_func=lambda name: name.endswith('.html'))
+        for name in names:
+            app.jinja_env.get_template(name)
+        return f'{len(names)} templates'
+
+    def prime_database():
+        with get_db_connection() as conn:
+            # Loads the schema and pulls the hot pages of bugs and its indexes into the OS cache
+            conn.execute('SELECT version FROM data_version WHERE id = 1').fetchone()
+            dashboard_stats(conn)
+        return DATABASE
+
+    def prime_url_map():
+        with app.test_request_context():
+            url_for('dashboard')
+        return f'{len(list(app.url_map.iter_rules()))} rules'
+
+    def prime_password_pool():
+        hash_password('warm-up')
+        return f'{password_hasher.workers} workers'
+
+    def prime_assets():
+        if not app.config['ASSETS_ENABLED']:
+            return 'disabled'
+        manifest = load_asset_manifest() or build_assets()
+        use_asset_manifest(manifest)
+        return f'{len(manifest)} bundles'
+
+    def prime_similarity_index():
+        if not app.config['SIMILARITY_ENABLED']:
+            return 'disabled'
+        if not similarity_index.load():
+            return 'not built yet'
+        return f'{similarity_index.size} bugs'
+
+    timings = {}
+    for step, prime in (('templates', prime_templates), ('database', prime_database),
+                        ('url_map', prime_url_map), ('password_pool', prime_password_pool),
+                        ('assets', prime_assets), ('similarity', prime_similarity_index)):
+        start = time.perf_counter()
+        try:
+            detail = prime()
+        except Exception as e:
+            # A failed step only costs the first request some latency; never block start-up on it
+            logger.warning(f"Warm-up step {step} failed: {str(e)}")
+            detail = f'failed: {str(e)}'
+        timings[step] = (time.perf_counter() - start, detail)
+
+    logger.info("Warm-up done in " + ', '.join(f'{step} {seconds * 1000:.0f} ms' for step, (seconds, _) in timings.items()))
+    return timings
+
+# ============== DATABASE MAINTENANCE ==============
+
+MAINTENANCE_TASKS = ('optimize', 'analyze', 'checkpoint', 'incremental_vacuum', 'backup')
+MAINTENANCE_CHECK_SECONDS = 60
+
+def parse_maintenance_window(spec):
+    """Parse an 'HH:MM-HH:MM' local-time window (may wrap past midnight)"""
+    start, _, end = spec.partition('-')
+    start = datetime.strptime(start.strip(), '%H:%M').time()
+    end = datetime.strptime(end.strip(), '%H:%M').time()
+    return start, end
+
+def in_maintenance_window(now, window):
+    start, end = window
+    if start <= end:
+        return start <= now.time() < end
+    return now.time() >= start or now.time() < end
+
+def _maintenance_timestamp():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+def backup_database(backup_dir, retention):
+    """Online hot backup through the sqlite3 backup API, keeping the newest `retention` files"""
+    os.makedirs(backup_dir, exist_ok=True)
+    prefix = os.path.splitext(os.path.basename(DATABASE))[0] + '-'
+    name = f"{prefix}{datetime.now().strftime('%Y%m%d-%H%M%S')}.db"
+    path = os.path.join(backup_dir, name)
+    partial = path + '.partial'
+
+    source = sqlite3.connect(f'file:{quote(os.path.abspath(DATABASE))}?mode=ro', uri=True, timeout=10.0)
+    target = sqlite3.connect(partial)
+    try:
+        # A single step copies everything inside one read transaction: writers carry
+        # on under WAL, and their commits cannot restart the copy as they would a
+        # backup taken in several steps
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    os.replace(partial, path)
+
+    backups = sorted(f for f in os.listdir(backup_dir) if f.startswith(prefix) and f.endswith('.db'))
+    for old in backups[:-retention] if retention > 0 else []:
+        os.remove(os.path.join(backup_dir, old))
+    return f"{name} ({os.path.getsize(path) / (1024 * 1024):.1f} MB)"
+
+def run_maintenance_task(conn, task, deadline):
+    """Run one maintenance task; returns a short detail string"""
+    if task == 'optimize':
+        conn.execute('PRAGMA optimize')
+        return 'ok'
+
+    if task == 'analyze':
+        # Sample at most this many rows per index so ANALYZE stays cheap on large tables
+        conn.execute(f"PRAGMA analysis_limit = {app.config['MAINTENANCE_ANALYSIS_LIMIT']}")
+        conn.execute('ANALYZE')
+        conn.commit()
+        return f"analysis_limit={app.config['MAINTENANCE_ANALYSIS_LIMIT']}"
+
+    if task == 'checkpoint':
+        # PASSIVE never waits on readers or writers; what it cannot copy is left for the next run
+        _, wal_pages, checkpointed = conn.execute('PRAGMA wal_checkpoint(PASSIVE)').fetchone()
+        return f'{checkpointed}/{wal_pages} WAL pages checkpointed'
+
+    if task == 'incremental_vacuum':
+        if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+            return 'skipped: auto_vacuum is not INCREMENTAL (run "flask maintenance --full-vacuum" once)'
+        initial = free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        # Small steps, each its own short write transaction, until the freelist is empty or time is up.
+        # executescript() runs the pragma to completion; execute() would release a single page.
+        while free_pages and time.monotonic() < deadline:
+            conn.executescript(f'PRAGMA incremental_vacuum({min(free_pages, 1000)})')
+            free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        return f'{initial - free_pages} pages released, {free_pages} left'
+
+    if task == 'backup':
+        return backup_database(app.config['BACKUP_DIR'], app.config['BACKUP_RETENTION'])
+
+    raise ValueError(f'Unknown maintenance task: {task}')
+
+def run_maintenance(tasks=MAINTENANCE_TASKS, budget_seconds=None, trigger='manual', run_id=None):
+    """Run maintenance tasks in order within a time budget and record the run.
+
+    A task that would start after the budget is used up is skipped; a failing
+    task is reported and does not stop the ones after it. Returns the report.
+    """
+    budget_seconds = app.config['MAINTENANCE_BUDGET_SECONDS'] if budget_seconds is None else budget_seconds
+    deadline = time.monotonic() + budget_seconds
+    report = []
+
+    conn = sqlite3.connect(DATABASE, timeout=30.0)
+    try:
+        if run_id is None:
+            run_id = conn.execute(
+                "INSERT INTO maintenance_runs (started_at, trigger_name, status) VALUES (?, ?, 'running')",
+                (_maintenance_timestamp(), trigger)
+            ).lastrowid
+            conn.commit()
+
+        for task in tasks:
+            if time.monotonic() >= deadline:
+                report.append({'task': task, 'status': 'skipped', 'seconds': 0.0, 'detail': 'time budget used up'})
+                continue
+            task_start = time.perf_counter()
+            try:
+                detail = run_maintenance_task(conn, task, deadline)
+                status = 'skipped' if detail.startswith('skipped') else 'ok'
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Maintenance task {task} failed: {str(e)}")
+                detail, status = str(e), 'failed'
+            report.append({'task': task, 'status': status, 'seconds': round(time.perf_counter() - task_start, 3),
+                           'detail': detail})
+            logger.info(f"Maintenance {task}: {status} in {report[-1]['seconds']:.3f}s ({detail})")
+
+        failed = any(item['status'] == 'failed' for item in report)
+        conn.execute('UPDATE maintenance_runs SET finished_at = ?, status = ?, report = ? WHERE id = ?',
+                     (_maintenance_timestamp(), 'failed' if failed else 'ok', json.dumps(report), run_id))
+        conn.commit()
+    finally:
+        conn.close()
+    return report
+
+class MaintenanceScheduler:
+    """Background thread that runs maintenance once per interval inside the off-peak window.
+
+    Every worker process may run a scheduler; a run is claimed by inserting its
+    maintenance_runs row under a write lock, so only one of them does the work.
+    """
+
+    def __init__(self):
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='maintenance', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _claim_run(self):
+        """Record a scheduled run unless one started within the interval; returns its id or None"""
+        interval = timedelta(hours=app.config['MAINTENANCE_INTERVAL_HOURS'])
+        conn = sqlite3.connect(DATABASE, timeout=30.0, isolation_level=None)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            last = conn.execute(
+                "SELECT MAX(started_at) FROM maintenance_runs WHERE trigger_name = 'scheduler'"
+            ).fetchone()[0]
+            if last and datetime.strptime(last, '%Y-%m-%d %H:%M:%S') > datetime.now() - interval:
+                conn.execute('ROLLBACK')
+                return None
+            run_id = conn.execute(
+                "INSERT INTO maintenance_runs (started_at, trigger_name, status) VALUES (?, 'scheduler', 'running')",
+                (_maintenance_timestamp(),)
+            ).lastrowid
+            conn.execute('COMMIT')
+            return run_id
+        finally:
+            conn.close()
+
+    def _run(self):
+        window = parse_maintenance_window(app.config['MAINTENANCE_WINDOW'])
+        while not self._stop.wait(MAINTENANCE_CHECK_SECONDS):
+            try:
+                if not in_maintenance_window(datetime.now(), window):
+                    continue
+                run_id = self._claim_run()
+                if run_id:
+                    run_maintenance(trigger='scheduler', run_id=run_id)
+            except Exception as e:
+                logger.error(f"Maintenance scheduler error: {str(e)}")
+
+maintenance_scheduler = MaintenanceScheduler()
+
+@app.before_request
+def start_maintenance_scheduler():
+    """Start the maintenance scheduler in processes that serve requests"""
+    if app.config['MAINTENANCE_ENABLED'] and not app.testing:
+        maintenance_scheduler.start()
+
+# ============== TIMESTAMP BACKFILL ==============
+
+TIMESTAMP_BACKFILL_BATCH = int(os.environ.get('TIMESTAMP_BACKFILL_BATCH', '5000'))
+TIMESTAMP_BACKFILL_PAUSE = float(os.environ.get('TIMESTAMP_BACKFILL_PAUSE', '0.05'))
+
+def pending_timestamp_backfill():
+    """Rows per table whose created_at_ms is still missing"""
+    with get_db_connection() as conn:
+        return {table: conn.execute(f'SELECT COUNT(*) FROM {table} WHERE created_at_ms IS NULL').fetchone()[0]
+                for table in TIMESTAMP_MS_TABLES}
+
+def backfill_timestamps(batch_size=TIMESTAMP_BACKFILL_BATCH, pause=TIMESTAMP_BACKFILL_PAUSE, progress=None):
+    """Fill created_at_ms from created_at for rows written before the column existed.
+
+    Walks each table in id order with one short write transaction per batch and
+    a pause in between, so it can run while the application serves requests.
+    Interrupting and re-running is safe. Returns the rows updated per table.
+    """
+    updated = {}
+    with get_db_connection() as conn:
+        for table in TIMESTAMP_MS_TABLES:
+            updated[table] = 0
+            last_id = 0
+            while True:
+                # NULL keys sort first in idx_*_created_at_ms, so this is an index range scan
+                ids = conn.execute(f'''
+                    SELECT id FROM {table} WHERE created_at_ms IS NULL AND id > ? ORDER BY id LIMIT ?
+                ''', (last_id, batch_size)).fetchall()
+                if not ids:
+                    break
+                cursor = conn.execute(f'''
+                    UPDATE {table} SET created_at_ms = {EPOCH_MS_SQL.format(column='created_at')}
+                    WHERE id BETWEEN ? AND ? AND created_at_ms IS NULL
+                ''', (ids[0][0], ids[-1][0]))
+                conn.commit()
+                updated[table] += cursor.rowcount
+                # Rows with an unparseable created_at stay NULL; moving past them keeps this finite
+                last_id = ids[-1][0]
+                if progress:
+                    progress(table, updated[table])
+                if pause:
+                    time.sleep(pause)
+    return updated
+
+_timestamp_backfill_lock = threading.Lock()
+_timestamp_backfill_thread = None
+
+def _run_timestamp_backfill():
+    try:
+        pending = pending_timestamp_backfill()
+        if any(pending.values()):
+            logger.info(f"Backfilling created_at_ms for {sum(pending.values())} rows")
+            updated = backfill_timestamps()
+            logger.info(f"Timestamp backfill done: {updated}")
+    except Exception as e:
+        logger.error(f"Timestamp backfill failed: {str(e)}")
+
+@app.before_request
+def start_timestamp_backfill():
+    """Backfill created_at_ms in the background, once per process that serves requests"""
+    global _timestamp_backfill_thread
+    if _timestamp_backfill_thread is not None or app.testing:
+        return
+    with _timestamp_backfill_lock:
+        if _timestamp_backfill_thread is None:
+            _timestamp_backfill_thread = threading.Thread(target=_run_timestamp_backfill,
+                                                          name='timestamp-backfill', daemon=True)
+            _timestamp_backfill_thread.start()
+
+# ============== CLI COMMANDS ==============
+
+@app.cli.command('import-bugs')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--user', 'user_email', required=True, help='Email of the user recorded as creator')
+@click.option('--format', 'fmt', type=click.Choice(sorted(IMPORT_FORMATS)), help='Defaults to the file extension')
+@click.option('--chunk-size', default=IMPORT_CHUNK_SIZE, show_default=True, help='Rows per transaction')
+def import_bugs_command(path, user_email, fmt, chunk_size):
+    """Bulk import bugs from a JSON Lines or CSV file."""
+    fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    with get_db_connection() as conn:
+        user = conn.execute('SELECT id FROM users WHERE email = ?', (user_email.lower(),)).fetchone()
+        if not user:
+            raise click.ClickException(f'No user with email {user_email}')
+
+        start = time.perf_counter()
+        with open(path, encoding='utf-8-sig', newline='') as stream:
+            imported, errors = import_bugs(conn, parse_import_rows(stream, fmt), user['id'], chunk_size)
+        elapsed = time.perf_counter() - start
+
+    for error in errors[:IMPORT_MAX_REPORTED_ERRORS]:
+        click.echo(f"[SKIP] row {error['row']}: {error['error']}", err=True)
+    click.echo(f"[OK] Imported {imported} bugs in {elapsed:.2f}s ({len(errors)} rejected)")
+
+@app.cli.command('maintenance')
+@click.option('--task', 'tasks', multiple=True, type=click.Choice(MAINTENANCE_TASKS),
+              help='Run only these tasks (repeatable); defaults to all of them')
+@click.option('--budget', type=float, help='Time budget in seconds [default: MAINTENANCE_BUDGET_SECONDS]')
+@click.option('--full-vacuum', is_flag=True,
+              help='Switch to incremental auto-vacuum and rebuild the file first (blocks writers)')
+@click.option('--history', 'history', type=int, default=0, help='Show the last N runs instead of running')
+def maintenance_command(tasks, budget, full_vacuum, history):
+    """Run database maintenance now and print the timing of each task."""
+    if history:
+        with get_db_connection() as conn:
+            runs = conn.execute('SELECT * FROM maintenance_runs ORDER BY id DESC LIMIT ?', (history,)).fetchall()
+        for run in runs:
+            click.echo(f"#{run['id']} {run['started_at']} -> {run['finished_at'] or '...'} "
+                       f"{run['trigger_name']} {run['status']}")
+            for item in json.loads(run['report'] or '[]'):
+                click.echo(f"    {item['task']:<20} {item['status']:<8} {item['seconds']:>8.3f}s  {item['detail']}")
+        return
+
+    if full_vacuum:
+        start = time.perf_counter()
+        conn = sqlite3.connect(DATABASE, timeout=30.0, isolation_level=None)
+        try:
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            conn.execute('VACUUM')
+        finally:
+            conn.close()
+        click.echo(f"[OK] VACUUM with incremental auto-vacuum in {time.perf_counter() - start:.2f}s")
+
+    report = run_maintenance(tasks or MAINTENANCE_TASKS, budget_seconds=budget)
+    for item in report:
+        click.echo(f"[{item['status'].upper()}] {item['task']:<20} {item['seconds']:>8.3f}s  {item['detail']}")
+    click.echo(f"[DONE] {sum(item['seconds'] for item in report):.2f}s total")
+    if any(item['status'] == 'failed' for item in report):
+        raise SystemExit(1)
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    """Bundle, minify, fingerprint and precompress the stylesheets."""
+    start = time.perf_counter()
+    manifest = build_assets()
+    use_asset_manifest(manifest)
+    for bundle, name in manifest.items():
+        sizes = ', '.join(f"{ext or 'raw'} {os.path.getsize(os.path.join(ASSETS_DIR, name + ext)) / 1024:.1f} KB"
+                          for ext in ('', '.gz', '.br') if os.path.exists(os.path.join(ASSETS_DIR, name + ext)))
+        click.echo(f"[OK] {bundle} -> {name} ({sizes})")
+    click.echo(f"[DONE] {len(manifest)} bundles in {time.perf_counter() - start:.2f}s")
+
+@app.cli.command('warm-up')
+def warm_up_command():
+    """Precompile templates into the shared bytecode cache and prime the caches."""
+    for step, (seconds, detail) in warm_up().items():
+        click.echo(f"[{'WARN' if detail.startswith('failed') else 'OK'}] {step:<14} {seconds * 1000:>8.1f} ms  {detail}")
+
+@app.cli.command('backfill-timestamps')
+@click.option('--batch-size', default=TIMESTAMP_BACKFILL_BATCH, show_default=True, help='Rows per transaction')
+@click.option('--pause', default=TIMESTAMP_BACKFILL_PAUSE, show_default=True,
+              help='Seconds to sleep between batches, leaving room for other writers')
+def backfill_timestamps_command(batch_size, pause):
+    """Fill the created_at_ms columns of rows created before they existed."""
+    start = time.perf_counter()
+    for table, count in pending_timestamp_backfill().items():
+        click.echo(f"[INFO] {table}: {count} rows pending")
+    updated = backfill_timestamps(batch_size, pause,
+                                  progress=lambda table, count: click.echo(f"\r[..] {table}: {count}", nl=False))
+    click.echo('')
+    for table, count in updated.items():
+        click.echo(f"[OK] {table}: {count} rows updated")
+    click.echo(f"[DONE] {time.perf_counter() - start:.2f}s")
+
+@app.cli.command('analytics')
+@click.option('--rebuild', is_flag=True, help='Clear the rollups and fold the whole history in again')
+def analytics_command(rebuild):
+    """Bring the analytics rollups up to date with bug history."""
+    start = time.perf_counter()
+    if rebuild:
+        total = rebuild_analytics()
+    else:
+        total, has_more = 0, True
+        while has_more:
+            count, has_more = update_analytics()
+            total += count
+    click.echo(f"[OK] Folded {total} history events into the rollups in {time.perf_counter() - start:.2f}s")
+
+@app.cli.command('similarity-index')
+@click.option('--rebuild', is_flag=True, help='Index every bug again instead of catching up the saved index')
+def similarity_index_command(rebuild):
+    """Build or catch up the related-bugs similarity index on disk."""
+    if np is None:
+        raise click.ClickException('numpy is not installed')
+    start = time.perf_counter()
+    with get_db_connection() as conn:
+        if rebuild or not similarity_index.load():
+            click.echo(f"[OK] Indexed {similarity_index.build(conn)} bugs")
+        else:
+            try:
+                click.echo(f"[OK] Re-indexed {similarity_index.refresh(conn)} changed or deleted bugs")
+                similarity_index.compact()
+            except SimilarityIndexStale as e:
+                click.echo(f"[WARN] {str(e)}; rebuilding")
+                click.echo(f"[OK] Indexed {similarity_index.build(conn)} bugs")
+    click.echo(f"[DONE] {similarity_index.size} bugs in {app.config['SIMILARITY_INDEX_DIR']} "
+               f"({time.perf_counter() - start:.2f}s)")
+
 # ============== APPLICATION STARTUP ==============
 
 if __name__ == '__main__':
@@ -1828,6 +5375,10 @@ if __name__ == '__main__':
         # Ensure all tables exist even if database exists
         init_db()
     
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        # Reloader child: the process that actually serves requests
+        warm_up()
+    
     print("[START] Starting Bug Reporting Tool v3.1.0...")
     print("[INFO] Access the application at: http://127.0.0.1:5000")
     print("=" * 50)
@@ -0,0 +1,1127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Bug Tracker Benchmarks
+
+Synthetic data generation and end-to-end benchmarks for the hot routes.
+
+    python benchmark.py generate --db bench.db --scale 0.01
+    python benchmark.py run --db bench.db --save-baseline baseline.json
+    python benchmark.py run --db bench.db --baseline baseline.json
+    python benchmark.py load --url http://127.0.0.1:5000 --concurrency 16 --duration 30
+    python benchmark.py login --db bench.db --modes inline,pool
+    python benchmark.py export-concurrency --db bench.db
+    python benchmark.py render-assignees --users 1000 --bugs 2000
+    python benchmark.py cold-start --db bench.db
+    python benchmark.py format-datetime --rows 10000
+    python benchmark.py projection --db bench.db
+    python benchmark.py similarity --db bench.db
+    python benchmark.py stream --db bench.db
+"""
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+BENCH_PASSWORD = 'Benchmark1'
+BENCH_ADMIN_EMAIL = 'user1@example.com'
+
+WORDS = (
+    'login button crash error page timeout upload image profile dashboard export csv excel '
+    'search filter status priority assign comment history session cookie oauth google github '
+    'avatar theme dark light mobile layout broken slow missing null pointer exception database '
+    'lock save delete edit form validation email password reset redirect loop cache stale '
+    'render template api json response header encoding unicode date timezone sort order'
+).split()
+PRIORITIES = (('Low', 3), ('Medium', 5), ('High', 2))
+STATUSES = (('Open', 4), ('In Progress', 2), ('Fixed', 2), ('Closed', 2))
+HISTORY_ACTIONS = (
+    ('viewed_bug', 60), ('comment_added', 12), ('status_changed', 10), ('assigned_to', 8),
+    ('priority_changed', 4), ('title_changed', 2), ('description_changed', 2), ('bug_edited', 2)
+)
+
+
+def load_app(db_path):
+    """Import the application against the given database"""
+    os.environ['DATABASE_PATH'] = os.path.abspath(db_path)
+    import app as bug_app
+    bug_app.app.config['TESTING'] = True
+    bug_app.app.config['RATE_LIMIT_ENABLED'] = False  # every benchmark client shares one IP and user
+    return bug_app
+
+
+def weighted(choices):
+    """Expand (value, weight) pairs into a list for random.choice"""
+    return [value for value, weight in choices for _ in range(weight)]
+
+
+def sentence(rng, min_words, max_words):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))).capitalize()
+
+
+def timestamp(dt):
+    return dt.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def epoch_ms(dt):
+    """created_at_ms for a naive UTC datetime, matching what the app derives from timestamp(dt)"""
+    return int(dt.replace(microsecond=0, tzinfo=timezone.utc).timestamp()) * 1000
+
+
+def batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ============== DATA GENERATION ==============
+
+def generate(args):
+    """Fill the schema with a seeded, realistic data set"""
+    scale = args.scale
+    n_users = max(2, int(args.users * scale))
+    n_bugs = max(1, int(args.bugs * scale))
+    n_history = int(args.history * scale)
+    n_comments = int(args.comments * scale)
+    n_images = int(args.images * scale)
+
+    if os.path.exists(args.db) and not args.force:
+        print(f"[ERROR] {args.db} already exists (use --force to overwrite)")
+        return 1
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+
+    bug_app = load_app(args.db)
+    bug_app.init_db()
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+
+    conn = sqlite3.connect(args.db)
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA journal_mode = MEMORY')
+
+    now = datetime.now().replace(microsecond=0)
+    epoch = now - timedelta(days=730)
+    span = (now - epoch).total_seconds()
+
+    # Users: one shared hash keeps generation fast and lets every account log in
+    password_hash = bug_app.hash_password(BENCH_PASSWORD)
+    users = (
+        (f'user{i}@example.com', password_hash, 'admin' if i == 1 or i % 50 == 0 else 'debugger',
+         f'User {i}', timestamp(epoch + timedelta(seconds=span * i / n_users / 4)))
+        for i in range(1, n_users + 1)
+    )
+    for batch in batched(users, 10000):
+        conn.executemany('INSERT INTO users (email, password, role, full_name, created_at) VALUES (?, ?, ?, ?, ?)', batch)
+    conn.commit()
+    print(f"[OK] {n_users:,} users")
+
+    upload_dir = args.upload_dir or os.path.splitext(args.db)[0] + '_uploads'
+    images = generate_images(rng, n_images, upload_dir)
+    if images:
+        print(f"[OK] {len(images):,} images in {upload_dir}")
+
+    priorities = weighted(PRIORITIES)
+    statuses = weighted(STATUSES)
+    bug_times = sorted(rng.random() for _ in range(n_bugs))
+
+    def bug_rows():
+        for i in range(n_bugs):
+            created = epoch + timedelta(seconds=span * bug_times[i])
+            yield (
+                sentence(rng, 4, 10),
+                sentence(rng, 20, 120),
+                '\n'.join(f'{step}. {sentence(rng, 3, 8)}' for step in range(1, rng.randint(2, 6))),
+                sentence(rng, 5, 20),
+                sentence(rng, 5, 20),
+                rng.choice(images) if images and rng.random() < 0.05 else None,
+                rng.choice(priorities),
+                rng.choice(statuses),
+                rng.randint(1, n_users) if rng.random() < 0.7 else None,
+                rng.randint(1, n_users),
+                timestamp(created),
+                epoch_ms(created)
+            )
+
+    for batch in batched(bug_rows(), 10000):
+        conn.executemany('''
+            INSERT INTO bugs (title, description, steps, expected_result, actual_result, screenshot_path,
+                              priority, status, assigned_to, created_by, created_at, created_at_ms)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', batch)
+        conn.commit()
+    print(f"[OK] {n_bugs:,} bugs")
+
+    def event_clock(count):
+        """Yield (bug_id, created datetime) in time order, only for bugs that already exist"""
+        position = bug_times[0]
+        step = (1.0 - position) / max(count, 1)
+        for _ in range(count):
+            position = min(position + rng.uniform(0, 2 * step), 1.0)
+            bug_id = rng.randint(1, max(1, bisect_right(bug_times, position)))
+            yield bug_id, epoch + timedelta(seconds=span * position)
+
+    def comment_rows():
+        for bug_id, created in event_clock(n_comments):
+            yield (bug_id, rng.randint(1, n_users), sentence(rng, 3, 40), timestamp(created), epoch_ms(created))
+
+    for batch in batched(comment_rows(), 20000):
+        conn.executemany('INSERT INTO comments (bug_id, user_id, comment, created_at, created_at_ms) VALUES (?, ?, ?, ?, ?)', batch)
+        conn.commit()
+    print(f"[OK] {n_comments:,} comments")
+
+    actions = weighted(HISTORY_ACTIONS)
+    status_names = [name for name, _ in STATUSES]
+    priority_names = [name for name, _ in PRIORITIES]
+
+    def history_rows():
+        for bug_id, created in event_clock(n_history):
+            user_id = rng.randint(1, n_users)
+            action = rng.choice(actions)
+            old_value = new_value = None
+            if action == 'viewed_bug':
+                new_value = f'user{user_id}@example.com'
+            elif action == 'comment_added':
+                new_value = sentence(rng, 3, 30)
+            elif action == 'status_changed':
+                old_value, new_value = rng.sample(status_names, 2)
+            elif action == 'assigned_to':
+                new_value = f'user{rng.randint(1, n_users)}@example.com'
+            elif action == 'priority_changed':
+                old_value, new_value = rng.sample(priority_names, 2)
+            elif action == 'title_changed':
+                old_value, new_value = sentence(rng, 4, 8), sentence(rng, 4, 8)
+            yield (bug_id, user_id, action, old_value, new_value, timestamp(created), epoch_ms(created))
+
+    for batch in batched(history_rows(), 50000):
+        conn.executemany('''
+            INSERT INTO bug_history (bug_id, user_id, action, old_value, new_value, created_at, created_at_ms)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', batch)
+        conn.commit()
+    print(f"[OK] {n_history:,} history rows")
+
+    conn.execute('ANALYZE')
+    conn.commit()
+    conn.execute('PRAGMA journal_mode = WAL')  # back to the mode the application runs in
+    conn.close()
+    print(f"[DONE] Generated {args.db} in {time.perf_counter() - start:.1f}s "
+          f"(login: {BENCH_ADMIN_EMAIL} / {BENCH_PASSWORD})")
+    return 0
+
+
+def generate_images(rng, count, upload_dir):
+    """Write small PNG screenshots for bugs to reference"""
+    if count <= 0:
+        return []
+    from PIL import Image, ImageDraw
+
+    os.makedirs(upload_dir, exist_ok=True)
+    names = []
+    for i in range(count):
+        name = f'bench_{i:06d}.png'
+        image = Image.new('RGB', (320, 200), tuple(rng.randint(0, 255) for _ in range(3)))
+        ImageDraw.Draw(image).text((10, 10), f'Screenshot {i}', fill=(255, 255, 255))
+        image.save(os.path.join(upload_dir, name))
+        names.append(name)
+    return names
+
+
+# ============== IN-PROCESS BENCHMARKS ==============
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(name, latencies, elapsed, peak_bytes=None, extra=None):
+    """Build a result record from per-request latencies (seconds)"""
+    latencies = sorted(latencies)
+    result = {
+        'name': name,
+        'requests': len(latencies),
+        'throughput_rps': len(latencies) / elapsed if elapsed else 0.0,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+    }
+    if peak_bytes is not None:
+        result['peak_mb'] = peak_bytes / (1024 * 1024)
+    if extra:
+        result.update(extra)
+    return result
+
+
+def print_results(results, baseline=None, tolerance=0.10):
+    """Print a results table, with deltas against a baseline when given"""
+    columns = ('requests', 'throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'peak_mb')
+    print(f"\n{'benchmark':<28}" + ''.join(f'{column:>16}' for column in columns))
+    print('-' * (28 + 16 * len(columns)))
+    regressions = []
+    previous = {row['name']: row for row in (baseline or {}).get('results', [])}
+    for row in results:
+        print(f"{row['name']:<28}" + ''.join(
+            f"{row[column]:>16.2f}" if isinstance(row.get(column), float) else f"{row.get(column, '-'):>16}"
+            for column in columns))
+        before = previous.get(row['name'])
+        if not before:
+            continue
+        deltas = []
+        for column, higher_is_better in (('throughput_rps', True), ('p50_ms', False), ('p95_ms', False), ('peak_mb', False)):
+            if not before.get(column) or column not in row:
+                continue
+            change = (row[column] - before[column]) / before[column]
+            deltas.append(f'{column} {change:+.1%}')
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                regressions.append(f"{row['name']}: {column} {before[column]:.2f} -> {row[column]:.2f}")
+        print(f"{'':<28}  vs baseline: {', '.join(deltas)}")
+    if regressions:
+        print(f"\n[WARN] {len(regressions)} regression(s) beyond {tolerance:.0%}:")
+        for line in regressions:
+            print(f'   {line}')
+    return regressions
+
+
+def login(client, email=BENCH_ADMIN_EMAIL, password=BENCH_PASSWORD):
+    response = client.post('/login', data={'email': email, 'password': password})
+    if response.status_code != 302:
+        raise SystemExit(f'[ERROR] Could not log in as {email} (status {response.status_code})')
+
+
+def route_plan(conn, rng):
+    """Requests to drive per benchmark, built from ids present in the database"""
+    max_bug = conn.execute('SELECT MAX(id) FROM bugs').fetchone()[0] or 1
+    titles = [row[0] for row in conn.execute('SELECT title FROM bugs ORDER BY RANDOM() LIMIT 50')]
+    return {
+        'dashboard': lambda: ('GET', '/dashboard', None),
+        'dashboard_filtered': lambda: ('GET', '/dashboard?status=Open&priority=High&search=login', None),
+        'view_bug': lambda: ('GET', f'/bug/{rng.randint(1, max_bug)}', None),
+        'api_bugs': lambda: ('GET', '/api/bugs?status=Open', None),
+        'api_bugs_ndjson': lambda: ('GET', '/api/bugs?status=Open&format=ndjson', None),
+        'api_bugs_columnar': lambda: ('GET', '/api/bugs?status=Open&format=columnar&fields=id,title,status,priority,created_at_ms', None),
+        'check_duplicates': lambda: ('POST', '/api/check-duplicates', {'title': rng.choice(titles or ['login page broken'])}),
+        'export_csv': lambda: ('GET', '/export/csv', None),
+        'export_excel': lambda: ('GET', '/export/excel', None),
+    }
+
+
+HEAVY_ROUTES = {'export_csv', 'export_excel', 'dashboard', 'api_bugs', 'api_bugs_ndjson', 'api_bugs_columnar'}
+
+
+def drive(client, request_factory, iterations):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        method, path, payload = request_factory()
+        t0 = time.perf_counter()
+        response = client.open(path, method=method, json=payload)
+        response.get_data()
+        latencies.append(time.perf_counter() - t0)
+        if response.status_code >= 400:
+            raise SystemExit(f'[ERROR] {method} {path} returned {response.status_code}')
+    return latencies, time.perf_counter() - start
+
+
+def run(args):
+    """Drive the hot routes through the Flask test client"""
+    bug_app = load_app(args.db)
+    rng = random.Random(args.seed)
+    client = bug_app.app.test_client()
+    login(client)
+    with sqlite3.connect(args.db) as conn:
+        plan = route_plan(conn, rng)
+
+    selected = args.routes.split(',') if args.routes else list(plan)
+    results = []
+    for name in selected:
+        if name not in plan:
+            raise SystemExit(f"[ERROR] Unknown route '{name}' (choose from {', '.join(plan)})")
+        if name == 'export_excel' and importlib.util.find_spec('openpyxl') is None:
+            print('[SKIP] export_excel: openpyxl is not installed')
+            continue
+        iterations = args.heavy_iterations if name in HEAVY_ROUTES else args.iterations
+        drive(client, plan[name], 1)  # warm-up
+        latencies, elapsed = drive(client, plan[name], iterations)
+
+        # Peak Python allocations for a single request, measured separately from timing
+        tracemalloc.start()
+        drive(client, plan[name], 1)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        results.append(summarize(name, latencies, elapsed, peak))
+        print(f"[OK] {name}: {results[-1]['p50_ms']:.1f} ms p50")
+
+    return report(args, results)
+
+
+def report(args, results):
+    """Print results, compare to a baseline and optionally save them"""
+    baseline = None
+    if getattr(args, 'baseline', None):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = print_results(results, baseline, args.tolerance)
+    if resource:
+        print(f"\n[INFO] Process max RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+
+    if getattr(args, 'save_baseline', None):
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'created_at': datetime.now().isoformat(), 'args': vars(args) | {'func': None},
+                       'results': results}, f, indent=2, default=str)
+        print(f"[OK] Baseline saved to {args.save_baseline}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+# ============== HTTP LOAD MODE ==============
+
+def load(args):
+    """Concurrent HTTP load against a running server"""
+    import requests
+
+    rng = random.Random(args.seed)
+    with sqlite3.connect(args.db) as conn:
+        plan = route_plan(conn, rng)
+    selected = args.routes.split(',') if args.routes else ['dashboard', 'view_bug', 'api_bugs', 'check_duplicates']
+    latencies = {name: [] for name in selected}
+    errors = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def worker(seed):
+        local_rng = random.Random(seed)
+        session = requests.Session()
+        session.post(f'{args.url}/login', data={'email': args.email, 'password': args.password},
+                     allow_redirects=False, timeout=30)
+        while time.perf_counter() < deadline:
+            name = local_rng.choice(selected)
+            method, path, payload = plan[name]()
+            t0 = time.perf_counter()
+            try:
+                response = session.request(method, args.url + path, json=payload, allow_redirects=False, timeout=60)
+                elapsed = time.perf_counter() - t0
+                with lock:
+                    if response.status_code >= 400:
+                        errors.append(response.status_code)
+                    latencies[name].append(elapsed)
+            except requests.RequestException as e:
+                with lock:
+                    errors.append(type(e).__name__)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(args.seed + i,)) for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    results = [summarize(f'http_{name}', values, elapsed) for name, values in latencies.items()]
+    results.append(summarize('http_total', [v for values in latencies.values() for v in values], elapsed))
+    if errors:
+        print(f"[WARN] {len(errors)} failed requests (first: {errors[0]})")
+    return report(args, results)
+
+
+# ============== LOGIN MODE ==============
+
+def login_bench(args):
+    """Mixed login + page traffic, with password hashing inline vs in the process pool"""
+    bug_app = load_app(args.db)
+    rng = random.Random(args.seed)
+    with sqlite3.connect(args.db) as conn:
+        plan = route_plan(conn, rng)
+        emails = [row[0] for row in conn.execute('SELECT email FROM users ORDER BY id LIMIT 200')]
+    if not emails:
+        raise SystemExit('[ERROR] No users found; run "generate" first')
+
+    original = bug_app.password_hasher
+    modes = {'inline': 0, 'pool': args.workers}
+    results = []
+    try:
+        for mode in args.modes.split(','):
+            if mode not in modes:
+                raise SystemExit(f"[ERROR] Unknown mode '{mode}' (choose from {', '.join(modes)})")
+            bug_app.password_hasher = bug_app.PasswordHashPool(modes[mode], args.queue, args.queue_wait, 30)
+            results += login_mix(bug_app, plan, emails, args, mode)
+            bug_app.password_hasher.shutdown()
+    finally:
+        bug_app.password_hasher = original
+    return report(args, results)
+
+
+def login_mix(bug_app, plan, emails, args, mode):
+    """Run login threads and page threads side by side for args.duration seconds"""
+    latencies = {'login': [], 'page': []}
+    statuses = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    # Start the pool workers before timing so process start-up is not measured
+    bug_app.hash_password('warm-up')
+
+    def login_worker(seed):
+        local_rng = random.Random(seed)
+        client = bug_app.app.test_client()
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            response = client.post('/login', data={'email': local_rng.choice(emails), 'password': BENCH_PASSWORD})
+            elapsed = time.perf_counter() - t0
+            with lock:
+                latencies['login'].append(elapsed)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            client.get('/logout')
+
+    def page_worker(seed):
+        local_rng = random.Random(seed)
+        client = bug_app.app.test_client()
+        login(client)
+        while time.perf_counter() < deadline:
+            method, path, payload = plan[local_rng.choice(('view_bug', 'check_duplicates'))]()
+            t0 = time.perf_counter()
+            client.open(path, method=method, json=payload).get_data()
+            with lock:
+                latencies['page'].append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=login_worker, args=(args.seed + i,)) for i in range(args.login_threads)]
+    threads += [threading.Thread(target=page_worker, args=(args.seed + 1000 + i,)) for i in range(args.page_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    shed = statuses.get(503, 0)
+    print(f"[OK] {mode}: {len(latencies['login'])} logins ({shed} shed with 503), {len(latencies['page'])} page requests")
+    return [summarize(f'{mode}_{kind}', values, elapsed) for kind, values in latencies.items()]
+
+
+# ============== EXPORT CONCURRENCY MODE ==============
+
+def export_concurrency(args):
+    """Bug-creation latency on its own and while exports stream from a snapshot"""
+    bug_app = load_app(args.db)
+    scenarios = [('idle', None, None)]
+    for export in args.exports.split(','):
+        if export == 'excel' and importlib.util.find_spec('openpyxl') is None:
+            print('[SKIP] excel: openpyxl is not installed')
+            continue
+        scenarios += [(f'{export}_{mode}', export, mode) for mode in args.snapshot_modes.split(',')]
+
+    results = []
+    for name, export, mode in scenarios:
+        latencies, elapsed, exports = writes_during_export(bug_app, export, mode, args)
+        results.append(summarize(f'writes_{name}', latencies, elapsed, extra={'exports': exports}))
+        print(f"[OK] {name}: {len(latencies)} bugs created, {exports} exports completed")
+
+    idle = results[0]
+    if (os.cpu_count() or 1) < 2:
+        print('[INFO] Single CPU: the export process also competes with the writers for CPU time')
+    for row in results[1:]:
+        print(f"[INFO] {row['name']}: throughput {row['throughput_rps'] / idle['throughput_rps']:.0%} of idle, "
+              f"p99 {row['p99_ms']:.1f} ms vs {idle['p99_ms']:.1f} ms idle")
+    return report(args, results)
+
+
+def export_worker(db_path, export, mode, deadline, delay, completed):
+    """Loop an export until the (wall clock) deadline, reading it like a slow client"""
+    bug_app = load_app(db_path)
+    bug_app.EXPORT_SNAPSHOT_MODE = mode
+    # Hash inline: pool workers would keep this child process from exiting
+    bug_app.password_hasher = bug_app.PasswordHashPool(0, 1, 0, 30)
+    client = bug_app.app.test_client()
+    login(client)
+    while time.time() < deadline:
+        response = client.get(f'/export/{export}', buffered=False)
+        for _ in response.response:
+            time.sleep(delay)  # keeps the snapshot open for the whole download
+            if time.time() >= deadline:
+                break
+        else:
+            completed.value += 1
+        response.close()
+
+
+def writes_during_export(bug_app, export, mode, args):
+    """Create bugs from writer threads for args.duration seconds, with an export looping alongside.
+
+    The export runs in its own process, like another server worker, so the
+    writers only compete with it for the database and not for the GIL.
+    """
+    latencies = []
+    failures = []
+    lock = threading.Lock()
+    context = multiprocessing.get_context('spawn')
+    completed = context.Value('i', 0)
+    exporter = None
+    if export:
+        exporter = context.Process(
+            target=export_worker, args=(args.db, export, mode, time.time() + args.duration + 2,
+                                        args.export_delay, completed))
+        exporter.start()
+        time.sleep(2)  # let the worker start and begin its first export
+    deadline = time.perf_counter() + args.duration
+
+    def writer(seed):
+        client = bug_app.app.test_client()
+        login(client)
+        sequence = 0
+        while time.perf_counter() < deadline:
+            sequence += 1
+            t0 = time.perf_counter()
+            response = client.post('/bug/new', data={
+                'title': f'Benchmark write {seed}-{sequence}',
+                'description': 'Created by the export concurrency benchmark',
+                'priority': 'Low'
+            })
+            with lock:
+                if response.status_code != 302:
+                    failures.append(response.status_code)
+                latencies.append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=writer, args=(args.seed + i,)) for i in range(args.writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if exporter:
+        exporter.join()
+    if failures:
+        print(f"[WARN] {len(failures)} failed writes (first status: {failures[0]})")
+    return latencies, elapsed, completed.value
+
+
+# ============== ASSIGNEE PICKER RENDERING ==============
+
+# The bug table's admin column before and after the shared assignee picker
+LEGACY_ASSIGNEE_TEMPLATE = """
+{% for bug in bugs %}<tr><td>{{ bug.title }}</td><td>
+<form method="POST" action="/bug/{{ bug.id }}/assign"><select name="assigned_to" onchange="this.form.submit()">
+<option value="">Assign to...</option>
+{% for user in users %}<option value="{{ user.id }}" {% if bug.assigned_to == user.id %}selected{% endif %}>{{ user.email }}</option>
+{% endfor %}</select></form></td></tr>
+{% endfor %}"""
+
+SHARED_ASSIGNEE_TEMPLATE = """
+{% for bug in bugs %}<tr><td>{{ bug.title }}</td><td>
+<input type="text" class="assignee-picker" list="assignee-options" value="{{ bug.assignee_email or '' }}"
+ data-current="{{ bug.assignee_email or '' }}" onchange="assignFromPicker({{ bug.id }}, this)"></td></tr>
+{% endfor %}
+<script type="application/json" id="assignee-data">{{ assignees|tojson }}</script>"""
+
+
+def render_assignees(args):
+    """Render time and HTML size of per-row assignee <select>s vs one shared user list"""
+    bug_app = load_app(args.db)
+    rng = random.Random(args.seed)
+    users = [{'id': i, 'email': f'user{i}@example.com', 'role': 'debugger'} for i in range(1, args.users + 1)]
+    bugs = []
+    for i in range(1, args.bugs + 1):
+        assignee = rng.choice(users) if rng.random() < 0.7 else None
+        bugs.append({'id': i, 'title': sentence(rng, 3, 8), 'assigned_to': assignee and assignee['id'],
+                     'assignee_email': assignee and assignee['email']})
+    assignees = [(user['id'], user['email'], user['role']) for user in users]
+
+    variants = {
+        'legacy_select': (LEGACY_ASSIGNEE_TEMPLATE, {'bugs': bugs, 'users': users}),
+        'shared_picker': (SHARED_ASSIGNEE_TEMPLATE, {'bugs': bugs, 'assignees': assignees}),
+    }
+    results = []
+    for name, (source, context) in variants.items():
+        template = bug_app.app.jinja_env.from_string(source)
+        latencies, size = [], 0
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            t0 = time.perf_counter()
+            size = len(template.render(**context).encode('utf-8'))
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+
+        # Peak memory from one more render, traced separately since tracing slows rendering down
+        tracemalloc.start()
+        template.render(**context)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results.append(summarize(name, latencies, elapsed, peak, extra={'html_mb': size / (1024 * 1024)}))
+        print(f"[OK] {name}: {size / (1024 * 1024):.2f} MB of HTML per render")
+
+    legacy, shared = results
+    print(f"[INFO] {args.users} users x {args.bugs} bugs: shared picker renders "
+          f"{legacy['p50_ms'] / shared['p50_ms']:.0f}x faster and "
+          f"{legacy['html_mb'] / shared['html_mb']:.0f}x smaller")
+    return report(args, results)
+
+
+# ============== COLD START ==============
+
+COLD_START_SCENARIOS = ('cold', 'bytecode', 'warm')
+
+
+def cold_start_worker(db_path, cache_dir, warm, results):
+    """Fresh interpreter: import the app (and warm it up), then time the first request of each page"""
+    os.environ['TEMPLATE_CACHE_DIR'] = cache_dir
+    start = time.perf_counter()
+    bug_app = load_app(db_path)
+    if warm:
+        bug_app.warm_up()
+    timings = {'ready': time.perf_counter() - start}
+
+    client = bug_app.app.test_client()
+    with sqlite3.connect(db_path) as conn:
+        bug_id = conn.execute('SELECT MIN(id) FROM bugs').fetchone()[0] or 1
+    requests = (('login_page', 'GET', '/login', None),
+                ('login', 'POST', '/login', {'email': BENCH_ADMIN_EMAIL, 'password': BENCH_PASSWORD}),
+                ('dashboard', 'GET', '/dashboard', None),
+                ('view_bug', 'GET', f'/bug/{bug_id}', None),
+                ('profile', 'GET', '/profile', None))
+    for name, method, path, form in requests:
+        t0 = time.perf_counter()
+        response = client.open(path, method=method, data=form)
+        response.get_data()
+        timings[name] = time.perf_counter() - t0
+        if response.status_code >= 400 or (name == 'login' and response.status_code != 302):
+            timings['error'] = f'{method} {path} returned {response.status_code}'
+            break
+    bug_app.password_hasher.shutdown()  # atexit hooks do not run in multiprocessing children
+    results.put(timings)
+
+
+def cold_start(args):
+    """First-request latency after start-up: no bytecode cache, cache only, cache plus warm_up()"""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    shared_cache = tempfile.mkdtemp(prefix='bench_jinja_')
+
+    def start_worker(cache_dir, warm):
+        worker = context.Process(target=cold_start_worker, args=(args.db, cache_dir, warm, results))
+        worker.start()
+        timings = results.get(timeout=300)
+        worker.join()
+        if 'error' in timings:
+            raise SystemExit(f"[ERROR] {timings['error']}")
+        return timings
+
+    try:
+        start_worker(shared_cache, True)  # fills the shared bytecode cache
+        samples = {scenario: [] for scenario in COLD_START_SCENARIOS}
+        for _ in range(args.runs):
+            for scenario in COLD_START_SCENARIOS:
+                empty_cache = tempfile.mkdtemp(prefix='bench_jinja_') if scenario == 'cold' else None
+                samples[scenario].append(start_worker(empty_cache or shared_cache, scenario == 'warm'))
+                if empty_cache:
+                    shutil.rmtree(empty_cache, ignore_errors=True)
+    finally:
+        shutil.rmtree(shared_cache, ignore_errors=True)
+
+    results = []
+    steps = list(samples['cold'][0])
+    print(f"\n{'first request (p50 ms)':<24}" + ''.join(f'{scenario:>12}' for scenario in COLD_START_SCENARIOS))
+    for step in steps:
+        row = []
+        for scenario in COLD_START_SCENARIOS:
+            latencies = [timings[step] for timings in samples[scenario]]
+            results.append(summarize(f'{scenario}_{step}', latencies, sum(latencies)))
+            row.append(results[-1]['p50_ms'])
+        print(f'{step:<24}' + ''.join(f'{value:>12.1f}' for value in row))
+    return report(args, results)
+
+
+# ============== TIME FORMATTING ==============
+
+def legacy_format_datetime(dt_string):
+    """format_datetime as it was before parsing was cached and 'now' computed once per request"""
+    try:
+        dt = datetime.strptime(dt_string, '%Y-%m-%d %H:%M:%S')
+        now = datetime.now()
+        diff = now - dt
+        if diff.days == 0:
+            if diff.seconds < 60:
+                return "Just now"
+            elif diff.seconds < 3600:
+                minutes = diff.seconds // 60
+                return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+            else:
+                hours = diff.seconds // 3600
+                return f"{hours} hour{'s' if hours != 1 else ''} ago"
+        elif diff.days == 1:
+            return "Yesterday"
+        elif diff.days < 7:
+            return f"{diff.days} days ago"
+        else:
+            return dt.strftime('%b %d, %Y')
+    except Exception:
+        return dt_string[:16]
+
+
+def format_datetime_bench(args):
+    """Formatting a column of timestamps: legacy filter vs cached filter vs batch"""
+    bug_app = load_app(args.db)
+    rng = random.Random(args.seed)
+    now = datetime.now()
+    values = [timestamp(now - timedelta(seconds=rng.randint(0, args.days * 86400))) for _ in range(args.rows)]
+
+    variants = {
+        'legacy_per_row': lambda: [legacy_format_datetime(value) for value in values],
+        'cached_per_row': lambda: [bug_app.format_datetime(value) for value in values],
+        'batch_column': lambda: bug_app.format_datetimes(values),
+    }
+    results = []
+    for name, render in variants.items():
+        if name != 'legacy_per_row':
+            bug_app.parse_timestamp.cache_clear()  # the first iteration parses every value cold
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            with bug_app.app.app_context():  # one 'now' per simulated request
+                t0 = time.perf_counter()
+                render()
+                latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+        results.append(summarize(name, latencies, elapsed, extra={'rows': args.rows}))
+        print(f"[OK] {name}: {args.rows} rows, first {latencies[0] * 1000:.1f} ms, p50 {results[-1]['p50_ms']:.1f} ms")
+    return report(args, results)
+
+
+# ============== COLUMN PROJECTION ==============
+
+# What the dashboard read before projections: every column, as sqlite3.Row
+LEGACY_COLUMNS = {
+    'BUG_LIST': 'b.*, creator.email AS creator_email, assignee.email AS assignee_email',
+    'BUG_PANEL': 'b.*, assignee.email AS assignee_email',
+    'ACTIVITY_ENTRY': 'bh.*, u.email AS user_email, b.title AS bug_title',
+    'NOTIFICATION_ENTRY': 'bh.*, actor.email AS actor_email, b.title AS bug_title',
+}
+
+
+class RowProjection:
+    """Stands in for app.Projection with SELECT * style columns and sqlite3.Row results"""
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    def fetchall(self, conn, sql, params=()):
+        return conn.execute(sql, params).fetchall()
+
+
+def projection_bench(args):
+    """Dashboard bug list rows and whole dashboard requests: b.* + sqlite3.Row vs projections"""
+    bug_app = load_app(args.db)
+    projected = {name: getattr(bug_app, name) for name in LEGACY_COLUMNS}
+    legacy = {name: RowProjection(columns) for name, columns in LEGACY_COLUMNS.items()}
+    client = bug_app.app.test_client()
+    login(client)
+
+    def bug_list(projection):
+        with bug_app.get_db_connection() as conn:
+            return projection.fetchall(conn, f'''
+                SELECT {projection.columns}
+                FROM bugs b
+                LEFT JOIN users creator ON b.created_by = creator.id
+                LEFT JOIN users assignee ON b.assigned_to = assignee.id
+                ORDER BY b.created_at_ms DESC, b.id DESC
+            ''')
+
+    def dashboard(_projection):
+        response = client.get('/dashboard')
+        response.get_data()
+        if response.status_code != 200:
+            raise SystemExit(f'[ERROR] /dashboard returned {response.status_code}')
+
+    results = []
+    for variant, projections in (('legacy', legacy), ('projected', projected)):
+        for name, step in (('rows', bug_list), ('dashboard', dashboard)):
+            for attribute, projection in projections.items():
+                setattr(bug_app, attribute, projection)
+            label = f'{name}_{variant}'
+            latencies, row_count = [], 0
+            start = time.perf_counter()
+            for _ in range(args.iterations):
+                t0 = time.perf_counter()
+                rows = step(projections['BUG_LIST'])
+                latencies.append(time.perf_counter() - t0)
+                row_count = len(rows) if rows is not None else row_count
+                del rows
+            elapsed = time.perf_counter() - start
+
+            # Peak memory from one more pass, traced separately since tracing slows everything down
+            tracemalloc.start()
+            rows = step(projections['BUG_LIST'])
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            del rows
+
+            extra = {}
+            if name == 'rows':
+                extra['rows_per_s'] = row_count / statistics.median(latencies)
+                print(f"[OK] {label}: {row_count:,} rows, {extra['rows_per_s']:,.0f} rows/s, "
+                      f"{peak / (1024 * 1024):.1f} MB held")
+            else:
+                print(f"[OK] {label}: p50 {statistics.median(latencies) * 1000:.1f} ms, "
+                      f"peak {peak / (1024 * 1024):.1f} MB per request")
+            results.append(summarize(label, latencies, elapsed, peak, extra=extra))
+
+    for attribute, projection in projected.items():
+        setattr(bug_app, attribute, projection)
+    return report(args, results)
+
+
+# ============== SIMILARITY INDEX ==============
+
+def similarity_bench(args):
+    """Related-bugs index: build, cold load, and top-k query latency one at a time and in batches"""
+    index_dir = tempfile.mkdtemp(prefix='similarity-')
+    os.environ['SIMILARITY_INDEX_DIR'] = index_dir
+    bug_app = load_app(args.db)
+    if bug_app.np is None:
+        raise SystemExit('[ERROR] numpy is not installed')
+    index = bug_app.similarity_index
+    rng = random.Random(args.seed)
+    try:
+        with bug_app.get_db_connection() as conn:
+            start = time.perf_counter()
+            count = index.build(conn)
+            build_seconds = time.perf_counter() - start
+            ids = [row[0] for row in conn.execute('SELECT id FROM bugs')]
+            sample = rng.sample(ids, min(args.queries, len(ids)))
+            bugs = []
+            for chunk in bug_app._chunked(sample):
+                bugs += conn.execute(f'''
+                    SELECT id, title, description, steps, actual_result FROM bugs
+                    WHERE id IN ({','.join('?' * len(chunk))})
+                ''', chunk).fetchall()
+        disk_mb = sum(os.path.getsize(os.path.join(root, name))
+                      for root, _, names in os.walk(index_dir) for name in names) / (1024 * 1024)
+        print(f"[OK] built: {count:,} bugs in {build_seconds:.1f}s, {disk_mb:.1f} MB on disk")
+
+        start = time.perf_counter()
+        cold = bug_app.SimilarityIndex(index_dir)
+        cold.load()
+        print(f"[OK] cold load (memory-mapped): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        vectors = [bug_app.bug_text_vector(bug) for bug in bugs]
+        exclude = [bug['id'] for bug in bugs]
+        results = []
+        for name, size in (('single', 1), (f'batch_{args.batch}', args.batch)):
+            latencies = []
+            start = time.perf_counter()
+            for offset in range(0, len(vectors), size):
+                t0 = time.perf_counter()
+                index.query(vectors[offset:offset + size], exclude=exclude[offset:offset + size])
+                latencies.append(time.perf_counter() - t0)
+            elapsed = time.perf_counter() - start
+            results.append(summarize(name, latencies, elapsed, extra={'queries_per_s': len(vectors) / elapsed}))
+            print(f"[OK] {name}: {len(vectors) / elapsed:,.0f} queries/s, p50 {results[-1]['p50_ms']:.2f} ms per call")
+        return report(args, results)
+    finally:
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+
+# ============== STREAMED DASHBOARD ==============
+
+def stream_bench(args):
+    """Dashboard time to first byte, total time and peak memory: buffered render vs streamed"""
+    bug_app = load_app(args.db)
+    client = bug_app.app.test_client()
+    login(client)
+    client.get('/dashboard').get_data()  # consumes the login flash and warms the caches
+
+    def fetch():
+        """(seconds to the first body byte, seconds to the last, bytes) of one request"""
+        t0 = time.perf_counter()
+        response = client.get(args.path, headers={'Accept-Encoding': 'identity'}, buffered=False)
+        if response.status_code != 200:
+            raise SystemExit(f'[ERROR] {args.path} returned {response.status_code}')
+        first_byte, size = None, 0
+        try:
+            for chunk in response.response:
+                if chunk and first_byte is None:
+                    first_byte = time.perf_counter() - t0
+                size += len(chunk)
+        finally:
+            response.close()
+        return first_byte, time.perf_counter() - t0, size
+
+    results = []
+    for mode, streaming in (('buffered', False), ('streamed', True)):
+        bug_app.app.config['DASHBOARD_STREAMING'] = streaming
+        first_bytes, latencies = [], []
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            first_byte, total, size = fetch()
+            first_bytes.append(first_byte)
+            latencies.append(total)
+        elapsed = time.perf_counter() - start
+
+        # Peak memory from one more pass, traced separately since tracing slows everything down
+        tracemalloc.start()
+        fetch()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        label = f'dashboard_{mode}'
+        extra = {'ttfb_p50_ms': statistics.median(first_bytes) * 1000, 'body_mb': size / (1024 * 1024)}
+        print(f"[OK] {label}: first byte {extra['ttfb_p50_ms']:.1f} ms, last byte "
+              f"{statistics.median(latencies) * 1000:.1f} ms, {extra['body_mb']:.1f} MB, "
+              f"peak {peak / (1024 * 1024):.1f} MB per request")
+        results.append(summarize(label, latencies, elapsed, peak, extra=extra))
+
+    buffered, streamed = results
+    print(f"[INFO] Streaming: first byte {buffered['ttfb_p50_ms'] / streamed['ttfb_p50_ms']:.0f}x sooner, "
+          f"peak memory {buffered['peak_mb'] / streamed['peak_mb']:.0f}x lower")
+    return report(args, results)
+
+
+# ============== CLI ==============
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Bug Tracker data generator and benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_reporting(sub):
+        sub.add_argument('--baseline', help='compare against a saved baseline JSON file')
+        sub.add_argument('--save-baseline', help='write results to a baseline JSON file')
+        sub.add_argument('--tolerance', type=float, default=0.10, help='regression tolerance (default 0.10)')
+        sub.add_argument('--fail-on-regression', action='store_true', help='exit non-zero on regressions')
+
+    gen = subparsers.add_parser('generate', help='fill a database with synthetic data')
+    gen.add_argument('--db', default='bench.db')
+    gen.add_argument('--users', type=int, default=10_000)
+    gen.add_argument('--bugs', type=int, default=500_000)
+    gen.add_argument('--history', type=int, default=5_000_000)
+    gen.add_argument('--comments', type=int, default=1_000_000)
+    gen.add_argument('--images', type=int, default=500)
+    gen.add_argument('--scale', type=float, default=1.0, help='multiply all volumes (e.g. 0.01 for a quick run)')
+    gen.add_argument('--upload-dir', help='where to write screenshots (default: <db>_uploads next to the database; '
+                                           'pass static/uploads for a live server to serve them)')
+    gen.add_argument('--seed', type=int, default=42)
+    gen.add_argument('--force', action='store_true', help='overwrite an existing database')
+    gen.set_defaults(func=generate)
+
+    bench = subparsers.add_parser('run', help='benchmark routes through the Flask test client')
+    bench.add_argument('--db', default='bench.db')
+    bench.add_argument('--routes', help='comma-separated subset of routes')
+    bench.add_argument('--iterations', type=int, default=50)
+    bench.add_argument('--heavy-iterations', type=int, default=5, help='iterations for dashboard, api and exports')
+    bench.add_argument('--seed', type=int, default=42)
+    add_reporting(bench)
+    bench.set_defaults(func=run)
+
+    http = subparsers.add_parser('load', help='concurrent HTTP load against a running server')
+    http.add_argument('--db', default='bench.db', help='database used to pick realistic bug ids and titles')
+    http.add_argument('--url', default='http://127.0.0.1:5000')
+    http.add_argument('--email', default=BENCH_ADMIN_EMAIL)
+    http.add_argument('--password', default=BENCH_PASSWORD)
+    http.add_argument('--routes', help='comma-separated subset of routes')
+    http.add_argument('--concurrency', type=int, default=8)
+    http.add_argument('--duration', type=float, default=30.0, help='seconds')
+    http.add_argument('--seed', type=int, default=42)
+    add_reporting(http)
+    http.set_defaults(func=load)
+
+    logins = subparsers.add_parser('login', help='login throughput and tail latency under mixed traffic')
+    logins.add_argument('--db', default='bench.db')
+    logins.add_argument('--modes', default='inline,pool', help='comma-separated: inline, pool')
+    logins.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1), help='pool processes')
+    logins.add_argument('--queue', type=int, default=32, help='max pending hashes in pool mode')
+    logins.add_argument('--queue-wait', type=float, default=2.0, help='seconds to wait for a queue slot')
+    logins.add_argument('--login-threads', type=int, default=8)
+    logins.add_argument('--page-threads', type=int, default=4)
+    logins.add_argument('--duration', type=float, default=15.0, help='seconds per mode')
+    logins.add_argument('--seed', type=int, default=42)
+    add_reporting(logins)
+    logins.set_defaults(func=login_bench)
+
+    exports = subparsers.add_parser('export-concurrency', help='bug-creation latency while exports run')
+    exports.add_argument('--db', default='bench.db')
+    exports.add_argument('--exports', default='csv,excel', help='comma-separated: csv, excel')
+    exports.add_argument('--snapshot-modes', default='wal,backup', help='comma-separated: wal, backup')
+    exports.add_argument('--writers', type=int, default=4)
+    exports.add_argument('--duration', type=float, default=10.0, help='seconds per scenario')
+    exports.add_argument('--export-delay', type=float, default=0.01, help='seconds the client waits per chunk')
+    exports.add_argument('--seed', type=int, default=42)
+    add_reporting(exports)
+    exports.set_defaults(func=export_concurrency)
+
+    assignees = subparsers.add_parser('render-assignees', help='dashboard assignee picker render cost at scale')
+    assignees.add_argument('--db', default='bench.db', help='only used to load the app')
+    assignees.add_argument('--users', type=int, default=1000)
+    assignees.add_argument('--bugs', type=int, default=2000)
+    assignees.add_argument('--iterations', type=int, default=3)
+    assignees.add_argument('--seed', type=int, default=42)
+    add_reporting(assignees)
+    assignees.set_defaults(func=render_assignees)
+
+    cold = subparsers.add_parser('cold-start', help='first-request latency with and without the template cache and warm-up')
+    cold.add_argument('--db', default='bench.db')
+    cold.add_argument('--runs', type=int, default=5, help='fresh processes per scenario')
+    add_reporting(cold)
+    cold.set_defaults(func=cold_start)
+
+    formats = subparsers.add_parser('format-datetime', help='relative-time formatting of a timestamp column')
+    formats.add_argument('--db', default='bench.db', help='only used to load the app')
+    formats.add_argument('--rows', type=int, default=10_000)
+    formats.add_argument('--days', type=int, default=30, help='spread timestamps over this many days')
+    formats.add_argument('--iterations', type=int, default=20)
+    formats.add_argument('--seed', type=int, default=42)
+    add_reporting(formats)
+    formats.set_defaults(func=format_datetime_bench)
+
+    projection = subparsers.add_parser('projection', help='dashboard rows and requests: SELECT b.* vs column projections')
+    projection.add_argument('--db', default='bench.db')
+    projection.add_argument('--iterations', type=int, default=5)
+    add_reporting(projection)
+    projection.set_defaults(func=projection_bench)
+
+    similarity = subparsers.add_parser('similarity', help='related-bugs index: build time and top-k query latency')
+    similarity.add_argument('--db', default='bench.db')
+    similarity.add_argument('--queries', type=int, default=500)
+    similarity.add_argument('--batch', type=int, default=50, help='queries per batched call')
+    similarity.add_argument('--seed', type=int, default=42)
+    add_reporting(similarity)
+    similarity.set_defaults(func=similarity_bench)
+
+    streaming = subparsers.add_parser('stream', help='dashboard time to first byte and peak memory: buffered vs streamed')
+    streaming.add_argument('--db', default='bench.db')
+    streaming.add_argument('--path', default='/dashboard', help='dashboard URL, with any filters')
+    streaming.add_argument('--iterations', type=int, default=5)
+    add_reporting(streaming)
+    streaming.set_defaults(func=stream_bench)
+
+    return parser
+
+
+if __name__ == '__main__':
+    arguments = build_parser().parse_args()
+    sys.exit(arguments.func(arguments))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Local OAuth Provider Stub
+
+Stands in for Google and GitHub so the OAuth login flow can be exercised
+offline. Point the app at it with:
+
+    OAUTHLIB_INSECURE_TRANSPORT=1 \\
+    GOOGLE_CLIENT_ID=stub GOOGLE_CLIENT_SECRET=stub \\
+    GOOGLE_AUTH_URI=http://127.0.0.1:8765/google/authorize \\
+    GOOGLE_TOKEN_URI=http://127.0.0.1:8765/google/token \\
+    GOOGLE_USERINFO_URI=http://127.0.0.1:8765/google/userinfo \\
+    GITHUB_CLIENT_ID=stub GITHUB_CLIENT_SECRET=stub \\
+    GITHUB_AUTH_URI=http://127.0.0.1:8765/github/authorize \\
+    GITHUB_TOKEN_URI=http://127.0.0.1:8765/github/token \\
+    GITHUB_API_URL=http://127.0.0.1:8765/github/api \\
+    python run.py
+
+    python oauth_stub.py --port 8765 --delay 0.5
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+GOOGLE_USER = {'sub': 'stub-google-1', 'email': 'google.user@example.com', 'name': 'Google Stub User'}
+GITHUB_USER = {'id': 4242, 'login': 'stub-octocat', 'name': 'GitHub Stub User', 'email': None}
+GITHUB_EMAILS = [{'email': 'octocat@example.com', 'primary': True, 'verified': True}]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    fail_status = None
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def respond(self):
+        """Simulate upstream latency or failures, then serve the endpoint"""
+        time.sleep(self.delay)
+        if self.fail_status:
+            return self.send_json({'error': 'stub failure'}, self.fail_status)
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path.endswith('/authorize'):
+            # Skip the consent screen and bounce straight back to the app
+            redirect = query['redirect_uri'][0] + '?' + urlencode({'code': 'stub-code', 'state': query.get('state', [''])[0]})
+            self.send_response(302)
+            self.send_header('Location', redirect)
+            self.end_headers()
+        elif url.path.endswith('/token'):
+            self.send_json({'access_token': 'stub-token', 'token_type': 'Bearer', 'expires_in': 3600})
+        elif url.path == '/google/userinfo':
+            self.send_json(GOOGLE_USER)
+        elif url.path == '/github/api/user':
+            self.send_json(GITHUB_USER)
+        elif url.path == '/github/api/user/emails':
+            self.send_json(GITHUB_EMAILS)
+        else:
+            self.send_json({'error': 'not found'}, 404)
+
+    def do_GET(self):
+        self.respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.respond()
+
+    def log_message(self, fmt, *args):
+        print(f"[STUB] {self.command} {self.path} ({fmt % args})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stub for the Google and GitHub OAuth endpoints')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0, help='seconds to wait before every response')
+    parser.add_argument('--fail-status', type=int, help='answer every request with this HTTP status')
+    args = parser.parse_args()
+
+    StubHandler.delay = args.delay
+    StubHandler.fail_status = args.fail_status
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), StubHandler)
+    print(f"[START] OAuth stub listening on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,13 @@ Bug Tracker Application Launcher
 import sys
 import os
 
+# SERVER=gevent serves each connection on a greenlet, so thousands of idle
+# /events streams do not need a thread each. Patching must precede other imports.
+USE_GEVENT = os.environ.get('SERVER', '').lower() == 'gevent'
+if USE_GEVENT:
+    from gevent import monkey
+    monkey.patch_all()
+
 # Add project to path
 sys.path.insert(0, os.path.dirname(__file__))
 
@@ -14,9 +21,14 @@ if __name__ == '__main__':
         print("[*] Starting Bug Tracker Application...")
         print("[*] Loading dependencies...")
         
-        from app import app
+        from app import app, warm_up
         print("[OK] App loaded successfully")
         
+        # Compile templates and start the hashing pool before taking traffic. With the
+        # reloader only the child process (WERKZEUG_RUN_MAIN) serves requests.
+        if USE_GEVENT or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+            warm_up()
+        
         # Run the Flask app
         print("\n" + "="*60)
         print("[START] Bug Tracker is running!")
@@ -33,12 +45,17 @@ if __name__ == '__main__':
         print("   Get Gemini API key: https://makersuite.google.com/app/apikey")
         print("="*60 + "\n")
         
-        app.run(
-            debug=True,
-            host='0.0.0.0',
-            port=5000,
-            use_reloader=True
-        )
+        if USE_GEVENT:
+            from gevent.pywsgi import WSGIServer
+            print("[INFO] Serving with gevent")
+            WSGIServer(('0.0.0.0', 5000), app).serve_forever()
+        else:
+            app.run(
+                debug=True,
+                host='0.0.0.0',
+                port=5000,
+                use_reloader=True
+            )
         
     except Exception as e:
         print("\n[ERROR] Error starting application:")
@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+
+# Configure the app before it is imported: no hashing pool, no background indexers,
+# a scratch database and no log file, so a test run never touches the working tree
+os.environ.setdefault('DATABASE_PATH', os.path.join(tempfile.mkdtemp(prefix='bug_tracker_tests_'), 'import.db'))
+os.environ.setdefault('PASSWORD_HASH_WORKERS', '0')
+os.environ.setdefault('SIMILARITY_ENABLED', 'false')
+os.environ.setdefault('ANALYTICS_ENABLED', 'false')
+os.environ.setdefault('TEMPLATE_CACHE_DIR', '')
+os.environ.setdefault('LOG_FILE', '')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import app as bug_tracker
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh, initialised database; yields the app module"""
+    monkeypatch.setattr(bug_tracker, 'DATABASE', str(tmp_path / 'bug_tracker.db'))
+    bug_tracker.init_db()
+    with bug_tracker.get_db_connection() as conn:
+        conn.executemany("INSERT INTO users (id, email, password, role) VALUES (?, ?, 'x', ?)",
+                         [(1, 'admin@example.com', 'admin'), (2, 'dev@example.com', 'debugger'),
+                          (3, 'other@example.com', 'debugger')])
+    return bug_tracker
+
+
+def add_bug(conn, title='Crash on save', status='Open', priority='High', assigned_to=None, created_at_ms=0):
+    cursor = conn.execute('''
+        INSERT INTO bugs (title, description, priority, status, assigned_to, created_by, created_at_ms)
+        VALUES (?, 'Steps', ?, ?, ?, 1, ?)
+    ''', (title, priority, status, assigned_to, created_at_ms))
+    return cursor.lastrowid
+
+
+def add_history(conn, bug_id, action, created_at_ms, user_id=1, old_value=None, new_value=None):
+    cursor = conn.execute('''
+        INSERT INTO bug_history (bug_id, user_id, action, old_value, new_value, created_at_ms)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (bug_id, user_id, action, old_value, new_value, created_at_ms))
+    return cursor.lastrowid
+
+
+@pytest.fixture
+def client(db):
+    db.app.testing = True
+    return db.app.test_client()
+
+
+def login(client, user_id=1, email='admin@example.com', role='admin'):
+    """Sign the test client in without going through the password form"""
+    with client.session_transaction() as session:
+        session.update(user_id=user_id, user_email=email, user_role=role)
@@ -0,0 +1,72 @@
+"""Analytics rollups: the history consumer and the trends read from them"""
+import pytest
+
+from conftest import add_bug, add_history, login
+
+
+def analytics_snapshot(db):
+    with db.get_db_connection() as conn:
+        return ([tuple(row) for row in conn.execute('SELECT * FROM analytics_daily ORDER BY day, dimension, key')],
+                [tuple(row) for row in conn.execute('SELECT * FROM analytics_durations ORDER BY day, metric, bucket')],
+                conn.execute('SELECT history_id FROM analytics_state WHERE id = 1').fetchone()[0])
+
+
+def test_update_analytics_folds_each_event_once(db):
+    day_ms = 24 * 3600 * 1000
+    with db.get_db_connection() as conn:
+        bug_id = add_bug(conn, status='Fixed', created_at_ms=day_ms)
+        add_history(conn, bug_id, 'bug_created', day_ms)
+        add_history(conn, bug_id, 'status_changed', day_ms + 3600 * 1000, old_value='Open', new_value='Fixed')
+
+    assert db.update_analytics() == (2, False)
+    folded = analytics_snapshot(db)
+    assert folded[2] > 0 and folded[0]
+
+    # Nothing new: a no-op that leaves the rollups and the cursor as they were
+    assert db.update_analytics() == (0, False)
+    assert analytics_snapshot(db) == folded
+
+    # Rows the rollups ignore still move the cursor, without counting anything twice
+    with db.get_db_connection() as conn:
+        add_history(conn, bug_id, 'viewed_bug', day_ms + 7200 * 1000, user_id=2)
+    assert db.update_analytics() == (0, False)
+    after_view = analytics_snapshot(db)
+    assert after_view[:2] == folded[:2] and after_view[2] > folded[2]
+    assert db.update_analytics() == (0, False)
+    assert analytics_snapshot(db) == after_view
+
+
+def test_update_analytics_batches_resume_where_they_stopped(db):
+    with db.get_db_connection() as conn:
+        for n in range(5):
+            add_history(conn, add_bug(conn, created_at_ms=1000 + n), 'bug_created', 1000 + n)
+
+    assert db.update_analytics(limit=2) == (2, True)
+    assert db.update_analytics(limit=2) == (2, True)
+    assert db.update_analytics(limit=2) == (1, False)
+    assert db.update_analytics(limit=2) == (0, False)
+    with db.get_db_connection() as conn:
+        assert conn.execute("SELECT SUM(created) FROM analytics_daily WHERE dimension = 'status'").fetchone()[0] == 5
+
+
+def test_api_analytics_reads_the_rollups(db, client):
+    now = db.now_ms()
+    with db.get_db_connection() as conn:
+        bug_id = add_bug(conn, status='Fixed', priority='Low', created_at_ms=now - 2000)
+        add_history(conn, bug_id, 'bug_created', now - 2000)
+        add_history(conn, bug_id, 'status_changed', now - 1000, old_value='Open', new_value='Fixed')
+    db.update_analytics()
+    login(client)
+
+    summary = client.get('/api/analytics?days=7').get_json()
+    assert summary['success'] and len(summary['days']) == 7
+    assert summary['inflow']['total'][-1] == 1 and summary['inflow']['by_priority']['Low'][-1] == 1
+    assert summary['resolved']['Fixed'][-1] == 1
+    # The backlog walks back from today's counts: the bug was not there a week ago
+    assert summary['backlog']['Fixed'] == [0] * 6 + [1]
+
+
+@pytest.mark.parametrize('days', ['0', '100000', 'week'])
+def test_api_analytics_rejects_bad_windows(db, client, days):
+    login(client)
+    assert client.get(f'/api/analytics?days={days}').status_code == 400
@@ -0,0 +1,84 @@
+"""/api/bugs: field selection and the json, ndjson and columnar formats"""
+import json
+
+import pytest
+
+from conftest import add_bug, login
+
+
+@pytest.fixture
+def bugs(db):
+    with db.get_db_connection() as conn:
+        add_bug(conn, title='Oldest bug', priority='Low', created_at_ms=1000)
+        add_bug(conn, title='Middle bug', status='Fixed', created_at_ms=2000)
+        add_bug(conn, title='Newest bug', created_at_ms=3000)
+    return db
+
+
+def get_bugs(client, query=''):
+    return client.get(f'/api/bugs?{query}', headers={'Accept-Encoding': 'identity'})
+
+
+def test_json_returns_the_selected_fields_newest_first(bugs, client):
+    login(client)
+    result = get_bugs(client, 'fields=title, status,title').get_json()
+    assert result['count'] == 3
+    assert result['bugs'] == [{'title': 'Newest bug', 'status': 'Open'}, {'title': 'Middle bug', 'status': 'Fixed'},
+                              {'title': 'Oldest bug', 'status': 'Open'}]
+
+
+def test_json_defaults_to_every_field(bugs, client):
+    login(client)
+    bug = get_bugs(client, 'priority=Low').get_json()['bugs'][0]
+    assert set(bug) == set(bugs.API_BUG_FIELDS)
+    assert (bug['title'], bug['creator_email'], bug['created_at_ms']) == ('Oldest bug', 'admin@example.com', 1000)
+
+
+def test_ndjson_streams_one_object_per_line(bugs, client, monkeypatch):
+    monkeypatch.setattr(bugs, 'NDJSON_BATCH_ROWS', 2)
+    login(client)
+    response = get_bugs(client, 'format=ndjson&fields=id,title')
+
+    assert response.mimetype == 'application/x-ndjson'
+    body = response.get_data(as_text=True)
+    assert body.endswith('\n')
+    assert [json.loads(line) for line in body.splitlines()] == \
+        [{'id': 3, 'title': 'Newest bug'}, {'id': 2, 'title': 'Middle bug'}, {'id': 1, 'title': 'Oldest bug'}]
+
+
+def test_ndjson_matches_json(bugs, client):
+    login(client)
+    lines = get_bugs(client, 'format=ndjson&status=Open').get_data(as_text=True).splitlines()
+    assert [json.loads(line) for line in lines] == get_bugs(client, 'status=Open').get_json()['bugs']
+
+
+def test_columnar_encodes_repeated_values_through_dictionaries(bugs, client):
+    login(client)
+    result = get_bugs(client, 'format=columnar&fields=id,status,priority').get_json()
+
+    assert result['count'] == 3 and result['fields'] == ['id', 'status', 'priority']
+    assert result['columns'] == {'id': [3, 2, 1], 'status': [0, 1, 0], 'priority': [0, 0, 1]}
+    assert result['dictionaries'] == {'status': ['Open', 'Fixed'], 'priority': ['High', 'Low']}
+
+    # Decoding the columns gives the json rows back
+    rows = [{field: result['dictionaries'][field][value] if field in result['dictionaries'] else value
+             for field, value in zip(result['fields'], values)}
+            for values in zip(*(result['columns'][field] for field in result['fields']))]
+    assert rows == get_bugs(client, 'fields=id,status,priority').get_json()['bugs']
+
+
+def test_columnar_without_rows(bugs, client):
+    login(client)
+    result = get_bugs(client, 'format=columnar&fields=id,status&status=Closed').get_json()
+    assert result['count'] == 0
+    assert result['columns'] == {'id': [], 'status': []} and result['dictionaries'] == {'status': []}
+
+
+@pytest.mark.parametrize('query, error', [
+    ('format=xml', 'format must be one of: json, ndjson, columnar'),
+    ('fields=title,password', 'Unknown fields: password'),
+])
+def test_bad_format_or_fields(bugs, client, query, error):
+    login(client)
+    response = get_bugs(client, query)
+    assert response.status_code == 400 and response.get_json()['error'] == error
@@ -0,0 +1,111 @@
+"""Bulk import of bugs from JSON Lines and CSV"""
+import io
+import json
+
+import pytest
+
+from conftest import login
+
+
+def jsonl(*rows):
+    return '\n'.join(row if isinstance(row, str) else json.dumps(row) for row in rows).encode()
+
+
+def good_bug(n, **fields):
+    return dict({'title': f'Imported bug {n}', 'description': 'Steps to reproduce'}, **fields)
+
+
+def imported_bugs(db):
+    with db.get_db_connection() as conn:
+        return conn.execute('''
+            SELECT b.id, b.title, b.status, b.priority, b.created_by, h.action, h.new_value, h.user_id
+            FROM bugs b LEFT JOIN bug_history h ON h.bug_id = b.id ORDER BY b.id
+        ''').fetchall()
+
+
+def post_import(client, body, query='', content_type='application/x-ndjson'):
+    return client.post(f'/api/bugs/import{query}', data=body, content_type=content_type)
+
+
+def test_import_reports_each_bad_row_and_keeps_the_rest(db, client):
+    login(client)
+    body = jsonl(good_bug(1), '{not json', '[1, 2]', {'title': 'Bug', 'description': 'Too short'},
+                 good_bug(5, status='Exploded'), good_bug(6, priority='Urgent'), '', good_bug(8, status='Fixed'))
+
+    result = post_import(client, body).get_json()
+    assert result['success'] and result['imported'] == 2 and result['failed'] == 5
+    assert [error['row'] for error in result['errors']] == [2, 3, 4, 5, 6]
+    assert result['errors'][0]['error'].startswith('Invalid JSON')
+    assert result['errors'][1]['error'] == 'Each line must be a JSON object'
+    assert result['errors'][3]['error'] == 'Invalid status'
+    assert not result['errors_truncated']
+
+    rows = imported_bugs(db)
+    assert [(row['title'], row['status'], row['priority']) for row in rows] == \
+        [('Imported bug 1', 'Open', 'Medium'), ('Imported bug 8', 'Fixed', 'Medium')]
+
+
+def test_every_imported_bug_gets_a_created_history_row(db, client):
+    login(client)
+    post_import(client, jsonl(*[good_bug(n) for n in range(7)]))
+
+    rows = imported_bugs(db)
+    assert len(rows) == 7
+    assert all((row['action'], row['new_value'], row['user_id'], row['created_by']) ==
+               ('bug_created', 'imported', 1, 1) for row in rows)
+
+
+def test_import_commits_in_chunks(db, monkeypatch):
+    chunks = []
+    insert_chunk = db._insert_bug_chunk
+
+    def recording_insert(conn, bugs, user_id):
+        chunks.append(len(bugs))
+        return insert_chunk(conn, bugs, user_id)
+
+    monkeypatch.setattr(db, '_insert_bug_chunk', recording_insert)
+    rows = db.parse_import_rows(io.StringIO(jsonl(*[good_bug(n) for n in range(7)]).decode()), 'jsonl')
+    with db.get_db_connection() as conn:
+        assert db.import_bugs(conn, rows, 1, chunk_size=3) == (7, [])
+
+    assert chunks == [3, 3, 1]
+    # Ids within and across chunks line up with their history rows
+    assert [row['title'] for row in imported_bugs(db)] == [f'Imported bug {n}' for n in range(7)]
+
+
+def test_import_csv_upload(db, client):
+    login(client)
+    # Spreadsheet exports start with a byte order mark
+    body = 'title,description,priority,status\nCSV bug one,Details,High,\nbad,Details,Low,Open\n'
+    response = client.post('/api/bugs/import', content_type='multipart/form-data',
+                           data={'file': (io.BytesIO(('\ufeff' + body).encode()), 'bugs.csv')})
+
+    result = response.get_json()
+    assert result['imported'] == 1 and result['errors'] == [{'row': 3, 'error': 'Title must be at least 5 characters long'}]
+    assert [(row['title'], row['priority'], row['status']) for row in imported_bugs(db)] == [('CSV bug one', 'High', 'Open')]
+
+
+@pytest.mark.parametrize('body, query, error', [
+    (b'{}', '?format=xml', "Unsupported format 'xml'. Use jsonl or csv."),
+    (b'\xff\xfe\x00', '', 'Import file must be UTF-8 encoded'),
+])
+def test_import_rejects_unreadable_files(db, client, body, query, error):
+    login(client)
+    response = post_import(client, body, query)
+    assert response.status_code == 400 and response.get_json()['error'] == error
+
+
+def test_import_is_admin_only(db, client):
+    login(client, user_id=2, email='dev@example.com', role='debugger')
+    assert post_import(client, jsonl(good_bug(1))).status_code == 302
+    assert imported_bugs(db) == []
+
+
+def test_import_command(db, tmp_path):
+    path = tmp_path / 'bugs.jsonl'
+    path.write_bytes(jsonl(good_bug(1), good_bug(2, priority='Urgent')))
+
+    result = db.app.test_cli_runner().invoke(args=['import-bugs', str(path), '--user', 'DEV@example.com'])
+    assert result.exit_code == 0, result.output
+    assert '[OK] Imported 1 bugs' in result.output and '[SKIP] row 2: Invalid priority level' in result.output
+    assert [row['created_by'] for row in imported_bugs(db)] == [2]
@@ -0,0 +1,87 @@
+"""Bulk status changes and assignment"""
+import pytest
+
+from conftest import add_bug, login
+
+
+def test_bulk_triage_only_logs_bugs_that_change(db):
+    with db.get_db_connection() as conn:
+        open_bug = add_bug(conn, assigned_to=3)
+        fixed_bug = add_bug(conn, status='Fixed', assigned_to=2)
+        unassigned_bug = add_bug(conn)
+
+    with db.get_db_connection() as conn:
+        result = db.bulk_triage(conn, [open_bug, fixed_bug, unassigned_bug, 404], user_id=1,
+                                status='Fixed', status_note='release 2.1', change_assignee=True, assigned_to=2)
+
+    assert result == {'updated': [open_bug, fixed_bug, unassigned_bug], 'missing': [404]}
+    with db.get_db_connection() as conn:
+        bugs = conn.execute('SELECT id, status, assigned_to FROM bugs ORDER BY id').fetchall()
+        history = conn.execute('SELECT bug_id, action, old_value, new_value FROM bug_history ORDER BY id').fetchall()
+
+    assert [tuple(bug) for bug in bugs] == [(open_bug, 'Fixed', 2), (fixed_bug, 'Fixed', 2),
+                                            (unassigned_bug, 'Fixed', 2)]
+    assert sorted(tuple(row) for row in history) == [
+        (open_bug, 'assigned_to', None, 'dev@example.com'),
+        (open_bug, 'status_changed', 'Open', 'Fixed | note: release 2.1'),
+        (unassigned_bug, 'assigned_to', None, 'dev@example.com'),
+        (unassigned_bug, 'status_changed', 'Open', 'Fixed | note: release 2.1'),
+    ]
+
+
+def test_bulk_triage_rejects_unknown_assignee_without_changes(db):
+    with db.get_db_connection() as conn:
+        bug_id = add_bug(conn)
+
+    with db.get_db_connection() as conn:
+        with pytest.raises(ValueError):
+            db.bulk_triage(conn, [bug_id], user_id=1, status='Closed', change_assignee=True, assigned_to=404)
+
+    with db.get_db_connection() as conn:
+        assert conn.execute('SELECT status FROM bugs WHERE id = ?', (bug_id,)).fetchone()[0] == 'Open'
+        assert conn.execute('SELECT COUNT(*) FROM bug_history').fetchone()[0] == 0
+
+
+def test_bulk_history_matches_the_single_bug_routes(db, client):
+    login(client)
+    with db.get_db_connection() as conn:
+        single, bulk = add_bug(conn, assigned_to=3), add_bug(conn, assigned_to=3)
+
+    client.post(f'/bug/{single}/assign', data={'assigned_to': '2'})
+    client.post(f'/bug/{single}/status', data={'status': 'Fixed', 'status_note': 'verified'})
+    response = client.post('/api/bugs/bulk', json={'bug_ids': [bulk], 'status': 'Fixed', 'note': 'verified',
+                                                    'assigned_to': 2})
+    assert response.get_json() == {'success': True, 'updated': [bulk], 'missing': []}
+
+    with db.get_db_connection() as conn:
+        def history(bug_id):
+            return sorted(tuple(row) for row in conn.execute(
+                'SELECT action, old_value, new_value FROM bug_history WHERE bug_id = ?', (bug_id,)))
+        assert history(bulk) == history(single)
+
+
+@pytest.mark.parametrize('payload, error', [
+    ({'bug_ids': [1], 'status': 'Fixed', 'note': {'text': 'x'}}, 'note must be a string'),
+    ({'bug_ids': [1], 'status': 'Fixed', 'note': 7}, 'note must be a string'),
+    ({'bug_ids': [1], 'status': 'Done'}, 'Invalid status'),
+    ({'bug_ids': [], 'status': 'Fixed'}, 'Select at least one bug'),
+    ({'bug_ids': [1]}, 'Provide a status and/or assigned_to'),
+])
+def test_bulk_api_rejects_bad_requests(db, client, payload, error):
+    login(client)
+    with db.get_db_connection() as conn:
+        add_bug(conn)
+
+    response = client.post('/api/bugs/bulk', json=payload)
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': error}
+
+
+def test_only_admins_bulk_assign(db, client):
+    login(client, user_id=2, email='dev@example.com', role='debugger')
+    with db.get_db_connection() as conn:
+        bug_id = add_bug(conn)
+
+    response = client.post('/api/bugs/bulk', json={'bug_ids': [bug_id], 'assigned_to': 2})
+    assert response.status_code == 403
+    assert client.post('/api/bugs/bulk', json={'bug_ids': [bug_id], 'status': 'Fixed'}).status_code == 200
@@ -0,0 +1,65 @@
+"""The /api/changes feed: merge order, cursors and the compact format"""
+import pytest
+
+from conftest import add_bug, add_history, login
+
+
+def test_read_changes_merges_history_and_deletions_by_time(db):
+    with db.get_db_connection() as conn:
+        bug_id = add_bug(conn)
+        gone_id = add_bug(conn, title='Duplicate')
+        add_history(conn, bug_id, 'bug_created', 1000)
+        add_history(conn, gone_id, 'bug_created', 1001)
+        add_history(conn, bug_id, 'status_changed', 1003, old_value='Open', new_value='Fixed')
+        conn.execute("INSERT INTO bug_deletions (bug_id, user_id, title, created_at_ms) VALUES (?, 1, 'Duplicate', 1002)",
+                     (gone_id,))
+        # Views are not changes, also when they are the newest rows
+        add_history(conn, bug_id, 'viewed_bug', 1004, user_id=2)
+
+    seen, cursor = [], '0'
+    while True:
+        with db.get_db_connection() as conn:
+            result = db.read_changes(conn, *db.parse_change_cursor(cursor), limit=2)
+        seen += [(row['bug_id'], row['action']) for row in result['changes']]
+        cursor = result['cursor']
+        if not result['has_more']:
+            break
+
+    assert seen == [(bug_id, 'bug_created'), (gone_id, 'bug_created'), (gone_id, 'bug_deleted'),
+                    (bug_id, 'status_changed')]
+    with db.get_db_connection() as conn:
+        assert cursor == db.latest_change_cursor(conn)
+        assert db.read_changes(conn, *db.parse_change_cursor(cursor), limit=2)['changes'] == []
+
+
+def test_read_changes_returns_current_bugs_but_not_deleted_ones(db):
+    with db.get_db_connection() as conn:
+        bug_id = add_bug(conn, status='Fixed')
+        add_history(conn, bug_id, 'bug_created', 1000)
+        conn.execute("INSERT INTO bug_deletions (bug_id, user_id, title, created_at_ms) VALUES (99, 1, 'Old', 1001)")
+    with db.get_db_connection() as conn:
+        result = db.read_changes(conn, 0, 0, limit=10)
+
+    assert [(bug['id'], bug['status']) for bug in result['bugs']] == [(bug_id, 'Fixed')]
+
+
+@pytest.mark.parametrize('value', ['-1.0', '3.-2', 'x', '1.y'])
+def test_parse_change_cursor_rejects_invalid_cursors(db, value):
+    with pytest.raises(ValueError):
+        db.parse_change_cursor(value)
+
+
+def test_compact_rows_match_their_field_header(db, client):
+    login(client)
+    with db.get_db_connection() as conn:
+        bug_id = add_bug(conn)
+        add_history(conn, bug_id, 'bug_created', 1000)
+        conn.execute("INSERT INTO bug_deletions (bug_id, user_id, title, created_at_ms) VALUES (99, 1, 'Old', 1001)")
+
+    full = client.get('/api/changes?since=0').get_json()
+    compact = client.get('/api/changes?since=0&compact=1').get_json()
+
+    assert compact['cursor'] == full['cursor']
+    assert all(len(row) == len(compact['fields']) for row in compact['changes'])
+    assert [dict(zip(compact['fields'], row)) for row in compact['changes']] == full['changes']
+    assert [dict(zip(compact['bug_fields'], row)) for row in compact['bugs']] == full['bugs']
@@ -0,0 +1,90 @@
+"""Comments on the bug page: keyset pages and the older-comments API"""
+import re
+
+import pytest
+
+from conftest import add_bug, login
+
+
+def walk(fetch):
+    """Follow `older` cursors from the newest page to the end; returns the pages"""
+    pages, before = [], None
+    while True:
+        items, before = fetch(before)
+        pages.append(items)
+        if before is None:
+            return pages
+
+
+def commented_bug(db, count):
+    with db.get_db_connection() as conn:
+        bug_id = add_bug(conn)
+        conn.executemany('INSERT INTO comments (bug_id, user_id, comment, created_at_ms) VALUES (?, 2, ?, ?)',
+                         [(bug_id, f'comment {n}', 1000 + n) for n in range(count)])
+    return bug_id
+
+
+def test_comment_page_walks_every_comment_once_in_order(db):
+    with db.get_db_connection() as conn:
+        bug_id = add_bug(conn)
+        # Two comments share a millisecond: the id breaks the tie
+        stamps = [1000, 2000, 2000, 3000, 4000]
+        for n, created_at_ms in enumerate(stamps):
+            conn.execute('INSERT INTO comments (bug_id, user_id, comment, created_at_ms) VALUES (?, 2, ?, ?)',
+                         (bug_id, f'comment {n}', created_at_ms))
+
+        pages = walk(lambda before: db.comment_page(
+            conn, bug_id, before and db.parse_page_cursor(before), limit=2))
+
+    assert [[c.comment for c in page] for page in pages] == [
+        ['comment 3', 'comment 4'], ['comment 1', 'comment 2'], ['comment 0']]
+
+
+def test_comment_page_without_comments(db):
+    with db.get_db_connection() as conn:
+        assert db.comment_page(conn, add_bug(conn)) == ([], None)
+
+
+def test_parse_page_cursor_rejects_garbage(db):
+    assert db.parse_page_cursor('1700000000000.42') == (1700000000000, 42)
+    with pytest.raises(ValueError):
+        db.parse_page_cursor('yesterday')
+
+
+def test_api_pages_back_through_every_comment(db, client):
+    bug_id = commented_bug(db, 7)
+    login(client)
+
+    seen, before = [], ''
+    while True:
+        page = client.get(f'/api/bugs/{bug_id}/comments?limit=3&before={before}').get_json()
+        assert page['success'] and page['total'] == 7
+        seen = [comment['comment'] for comment in page['comments']] + seen
+        before = page['older']
+        if before is None:
+            break
+
+    assert seen == [f'comment {n}' for n in range(7)]
+
+
+@pytest.mark.parametrize('query', ['before=soon', 'before=12', 'limit=many'])
+def test_api_rejects_bad_cursors(db, client, query):
+    bug_id = commented_bug(db, 1)
+    login(client)
+    response = client.get(f'/api/bugs/{bug_id}/comments?{query}')
+    assert response.status_code == 400
+
+
+def test_api_unknown_bug(db, client):
+    login(client)
+    assert client.get('/api/bugs/404/comments').status_code == 404
+
+
+def test_bug_page_renders_the_newest_page(db, client):
+    bug_id = commented_bug(db, db.COMMENTS_PAGE_SIZE + 3)
+    login(client)
+
+    page = client.get(f'/bug/{bug_id}').get_data(as_text=True)
+    shown = sorted(int(n) for n in re.findall(r'>\s*comment (\d+)\s*<', page))
+    assert shown == list(range(3, db.COMMENTS_PAGE_SIZE + 3))
+    assert 'Load older comments (3 more)' in page
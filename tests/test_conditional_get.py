@@ -0,0 +1,120 @@
+"""Conditional GETs answered from the data version, and response compression"""
+import gzip
+import time
+import zlib
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import add_bug, login
+
+
+@pytest.fixture
+def bugs(db):
+    with db.get_db_connection() as conn:
+        for n in range(60):
+            add_bug(conn, title=f'Compressible bug {n}', created_at_ms=1000 + n)
+    return db
+
+
+def get(client, path, etag=None, encoding='identity'):
+    headers = {'Accept-Encoding': encoding}
+    if etag:
+        headers['If-None-Match'] = etag
+    return client.get(path, headers=headers)
+
+
+def test_unchanged_data_is_answered_with_304(bugs, client):
+    login(client)
+    first = get(client, '/api/bugs')
+    etag = first.headers['ETag']
+    assert first.status_code == 200 and etag.startswith('W/')
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+
+    again = get(client, '/api/bugs', etag)
+    assert again.status_code == 304 and again.data == b''
+    assert again.headers['ETag'] == etag
+
+
+def test_any_write_changes_the_etag(bugs, client):
+    login(client)
+    etag = get(client, '/api/bugs').headers['ETag']
+    with bugs.get_db_connection() as conn:
+        conn.execute("UPDATE users SET role = 'debugger' WHERE id = 3")
+
+    response = get(client, '/api/bugs', etag)
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+
+
+def test_etags_differ_by_viewer_and_url(bugs, client):
+    login(client)
+    etag = get(client, '/api/bugs').headers['ETag']
+    assert get(client, '/api/bugs?status=Open', etag).status_code == 200
+
+    login(client, user_id=2, email='dev@example.com', role='debugger')
+    assert get(client, '/api/bugs', etag).status_code == 200
+
+
+def test_errors_and_pending_flashes_are_not_cached(bugs, client):
+    login(client)
+    assert 'ETag' not in get(client, '/api/bugs?format=xml').headers
+
+    with client.session_transaction() as session:
+        session['_flashes'] = [('success', 'Saved')]
+    assert 'ETag' not in get(client, '/dashboard').headers
+
+
+def test_dashboard_etag_expires_with_its_relative_times(bugs, client, monkeypatch):
+    # Only the app's clock moves; the session cookie keeps the real one
+    clock = SimpleNamespace(**{name: getattr(time, name) for name in ('perf_counter', 'monotonic', 'sleep')})
+    monkeypatch.setattr(bugs, 'time', clock)
+    login(client)
+    clock.time = lambda: 60 * 1000 + 5
+    etag = get(client, '/dashboard').headers['ETag']
+    assert get(client, '/dashboard', etag).status_code == 304
+
+    clock.time = lambda: 60 * 1001 + 5
+    assert get(client, '/dashboard', etag).status_code == 200
+
+
+def test_large_responses_are_gzipped(bugs, client):
+    login(client)
+    plain = get(client, '/api/bugs')
+    compressed = get(client, '/api/bugs', encoding='gzip')
+
+    assert 'Content-Encoding' not in plain.headers
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert len(compressed.data) < len(plain.data)
+    assert gzip.decompress(compressed.data) == plain.data
+
+
+def test_small_responses_are_sent_as_they_are(bugs, client):
+    login(client)
+    response = get(client, '/api/bugs?status=Closed', encoding='gzip')
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_json()['count'] == 0
+
+
+def test_streamed_responses_are_compressed_as_they_go(bugs, client, monkeypatch):
+    monkeypatch.setattr(bugs, 'NDJSON_BATCH_ROWS', 10)
+    login(client)
+    plain = get(client, '/api/bugs?format=ndjson')
+    response = client.get('/api/bugs?format=ndjson', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+    try:
+        assert response.headers['Content-Encoding'] == 'gzip' and 'Content-Length' not in response.headers
+        chunks = list(response.response)
+    finally:
+        response.close()
+
+    # Every chunk is flushed, so each one decodes as soon as it arrives
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    decoded = [decompressor.decompress(chunk) for chunk in chunks]
+    assert sum(1 for part in decoded if part) >= 6
+    assert b''.join(decoded) == plain.data
+
+
+def test_compression_can_be_switched_off(bugs, client, monkeypatch):
+    monkeypatch.setitem(bugs.app.config, 'COMPRESSION_ENABLED', False)
+    login(client)
+    assert 'Content-Encoding' not in get(client, '/api/bugs', encoding='gzip').headers
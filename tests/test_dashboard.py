@@ -0,0 +1,90 @@
+"""The dashboard, streamed and buffered"""
+import sqlite3
+
+from conftest import add_bug, login
+
+
+def dashboard_bugs(db, count=40):
+    with db.get_db_connection() as conn:
+        for n in range(count):
+            # Old, fixed creation times render as dates, not as "n minutes ago"
+            add_bug(conn, title=f'Bug number {n}', priority=('High', 'Medium', 'Low')[n % 3],
+                    assigned_to=None if n % 2 else 2, created_at_ms=1577836800000 + n)
+        conn.execute("UPDATE bugs SET created_at = '2020-01-01 00:00:00'")
+
+
+def get_dashboard(client, streaming, path='/dashboard'):
+    client.application.config['DASHBOARD_STREAMING'] = streaming
+    return client.get(path, headers={'Accept-Encoding': 'identity'})
+
+
+def test_streamed_dashboard_matches_buffered(db, client):
+    dashboard_bugs(db)
+    login(client)
+    for path in ('/dashboard', '/dashboard?priority=High', '/dashboard?search=number+1'):
+        streamed, buffered = get_dashboard(client, True, path), get_dashboard(client, False, path)
+        assert streamed.status_code == buffered.status_code == 200
+        assert streamed.get_data(as_text=True) == buffered.get_data(as_text=True)
+
+
+def test_streamed_dashboard_shows_flashes_once(db, client):
+    login(client)
+    with client.session_transaction() as session:
+        session['_flashes'] = [('success', 'Bug #7 deleted')]
+
+    assert 'Bug #7 deleted' in get_dashboard(client, True).get_data(as_text=True)
+    assert 'Bug #7 deleted' not in get_dashboard(client, True).get_data(as_text=True)
+
+
+def test_streamed_dashboard_releases_its_snapshot_before_sending(db, client):
+    dashboard_bugs(db, count=400)
+    login(client)
+    client.application.config['DASHBOARD_STREAMING'] = True
+    response = client.get('/dashboard', buffered=False)
+    try:
+        chunks = iter(response.response)
+        next(chunks)
+
+        # A slow client is still reading: writers and checkpoints must not wait for it
+        writer = sqlite3.connect(db.DATABASE)
+        writer.execute("UPDATE bugs SET title = 'Renamed' WHERE id = 1")
+        writer.commit()
+        busy, _, _ = writer.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()
+        writer.close()
+        assert busy == 0
+
+        body = b''.join(chunks).decode()
+    finally:
+        response.close()
+    # The page is the snapshot taken before the first byte, not a mix
+    assert 'Renamed' not in body and 'Bug number 0' in body
+
+
+class ExplodingRow:
+    """A bug row that fails to render"""
+    id = 999999
+
+    def __getattr__(self, name):
+        raise RuntimeError('render failed')
+
+
+def test_render_error_after_the_first_byte_ends_the_page_visibly(db, client, monkeypatch):
+    dashboard_bugs(db, count=400)
+    fetchall = db.Projection.fetchall
+
+    def fetchall_with_a_bad_row(projection, conn, sql, params=()):
+        rows = fetchall(projection, conn, sql, params)
+        return rows + [ExplodingRow()] if projection is db.BUG_LIST else rows
+
+    monkeypatch.setattr(db.Projection, 'fetchall', fetchall_with_a_bad_row)
+    login(client)
+    client.application.config['DASHBOARD_STREAMING'] = True
+    response = client.get('/dashboard', headers={'Accept-Encoding': 'identity'}, buffered=False)
+    try:
+        chunks = [chunk.decode() for chunk in response.response]
+    finally:
+        response.close()
+
+    assert response.status_code == 200
+    assert len(chunks) > 1 and 'Bug number 399' in ''.join(chunks)
+    assert chunks[-1] == '<div class="alert alert-error">Error loading dashboard. Please try again.</div>'
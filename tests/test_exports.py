@@ -0,0 +1,93 @@
+"""Exports read from a snapshot and never block writers"""
+import csv
+import io
+import sqlite3
+import time
+
+import pytest
+
+from conftest import add_bug, login
+
+
+def export_bugs(db, count):
+    with db.get_db_connection() as conn:
+        conn.executemany('''
+            INSERT INTO bugs (title, description, priority, status, created_by, created_at_ms)
+            VALUES (?, 'Steps', 'Medium', 'Open', 1, ?)
+        ''', [(f'Exported bug {n}', 1577836800000 + n) for n in range(count)])
+
+
+def read_csv(body):
+    rows = list(csv.reader(io.StringIO(body)))
+    return rows[0], rows[1:]
+
+
+@pytest.mark.parametrize('mode', ['wal', 'backup'])
+def test_writers_are_not_blocked_while_an_export_streams(db, client, monkeypatch, mode):
+    monkeypatch.setattr(db, 'EXPORT_SNAPSHOT_MODE', mode)
+    export_bugs(db, 5000)
+    login(client)
+
+    response = client.get('/export/csv', buffered=False)
+    chunks = iter(response.response)
+    body = [next(chunks), next(chunks)]  # the header, and the first rows: the snapshot is open
+
+    # Bugs keep being filed meanwhile; a writer waiting on the export would time out
+    durations, errors = [], []
+
+    def writer():
+        conn = sqlite3.connect(db.DATABASE, timeout=1.0)
+        try:
+            for n in range(200):
+                start = time.perf_counter()
+                add_bug(conn, title=f'Filed during export {n}', created_at_ms=1600000000000 + n)
+                conn.execute("UPDATE bugs SET title = 'Renamed during export' WHERE id = 1")
+                conn.commit()
+                durations.append(time.perf_counter() - start)
+        except sqlite3.Error as e:
+            errors.append(e)
+        finally:
+            conn.close()
+
+    # The client stalls mid-download until every write is done
+    writer()
+    try:
+        body.extend(chunks)
+    finally:
+        response.close()
+
+    assert errors == []
+    assert len(durations) == 200 and max(durations) < 0.5
+
+    # The export is the database as it was when it started
+    header, rows = read_csv(b''.join(body).decode())
+    assert header[:2] == ['ID', 'Title']
+    assert len(rows) == 5000
+    assert {row[1] for row in rows} == {f'Exported bug {n}' for n in range(5000)}
+    with db.get_db_connection() as conn:
+        assert conn.execute('SELECT COUNT(*) FROM bugs').fetchone()[0] == 5200
+
+
+def test_snapshot_connection_is_read_only_and_consistent(db):
+    export_bugs(db, 10)
+    with db.get_snapshot_connection('wal') as snapshot:
+        with db.get_db_connection() as conn:
+            add_bug(conn)
+        assert snapshot.execute('SELECT COUNT(*) FROM bugs').fetchone()[0] == 10
+        with pytest.raises(sqlite3.OperationalError):
+            snapshot.execute("UPDATE bugs SET title = 'x'")
+
+    with db.get_snapshot_connection('wal') as snapshot:
+        assert snapshot.execute('SELECT COUNT(*) FROM bugs').fetchone()[0] == 11
+
+
+def test_export_filters_by_created_date(db, client):
+    with db.get_db_connection() as conn:
+        add_bug(conn, title='Old', created_at_ms=1577836800000)   # 2020-01-01
+        add_bug(conn, title='New', created_at_ms=1609459200000)   # 2021-01-01
+    login(client)
+
+    _, rows = read_csv(client.get('/export/csv?from=2020-06-01').get_data(as_text=True))
+    assert [row[1] for row in rows] == ['New']
+    response = client.get('/export/csv?from=not-a-date')
+    assert response.status_code == 302
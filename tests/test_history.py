@@ -0,0 +1,140 @@
+"""The bug history timeline: folded runs, keyset pages and filters"""
+import pytest
+
+from conftest import add_bug, add_history, login
+
+
+def walk(fetch):
+    """Follow `older` cursors from the newest page to the end; returns the pages"""
+    pages, before = [], None
+    while True:
+        items, before = fetch(before)
+        pages.append(items)
+        if before is None:
+            return pages
+
+
+def history_bug(conn):
+    """Oldest first: 5 views by dev, a status change, then 3 more views"""
+    bug_id = add_bug(conn)
+    at = iter(range(1000, 100000, 1000))
+    add_history(conn, bug_id, 'bug_created', next(at))
+    for _ in range(5):
+        add_history(conn, bug_id, 'viewed_bug', next(at), user_id=2)
+    add_history(conn, bug_id, 'status_changed', next(at), old_value='Open', new_value='In Progress')
+    for _ in range(3):
+        add_history(conn, bug_id, 'viewed_bug', next(at), user_id=2)
+    return bug_id
+
+
+def summary(entries):
+    return [(entry.action, entry.repeats) for entry in entries]
+
+
+def test_history_page_folds_repeated_events(db):
+    with db.get_db_connection() as conn:
+        entries, older = db.history_page(conn, history_bug(conn))
+
+    assert summary(entries) == [('viewed_bug', 3), ('status_changed', 1), ('viewed_bug', 5), ('bug_created', 1)]
+    assert older is None
+    # A folded entry spans its newest and oldest rows
+    assert entries[0].created_at_ms == 10000 and entries[0].first_created_at_ms == 8000
+
+
+def test_history_page_cursor_walks_the_same_entries(db):
+    with db.get_db_connection() as conn:
+        bug_id = history_bug(conn)
+        everything, _ = db.history_page(conn, bug_id)
+        pages = walk(lambda before: db.history_page(
+            conn, bug_id, before and db.parse_page_cursor(before), limit=1))
+
+    assert [len(page) for page in pages] == [1, 1, 1, 1]
+    assert [summary(page)[0] for page in pages] == summary(everything)
+
+
+def test_history_page_filters_and_raw_rows(db):
+    with db.get_db_connection() as conn:
+        bug_id = history_bug(conn)
+        views, _ = db.history_page(conn, bug_id, actions=['viewed_bug'])
+        raw, _ = db.history_page(conn, bug_id, collapse=False)
+        admin_only, _ = db.history_page(conn, bug_id, actor_id=1)
+
+    # Without the status change in between, all eight views are one run
+    assert summary(views) == [('viewed_bug', 8)]
+    assert len(raw) == 10 and all(entry.repeats == 1 for entry in raw)
+    assert summary(admin_only) == [('status_changed', 1), ('bug_created', 1)]
+
+
+def test_history_page_continues_a_run_longer_than_the_scan(db, monkeypatch):
+    monkeypatch.setattr(db, 'HISTORY_SCAN_ROWS', 4)
+    with db.get_db_connection() as conn:
+        bug_id = add_bug(conn)
+        add_history(conn, bug_id, 'bug_created', 500)
+        for n in range(10):
+            add_history(conn, bug_id, 'viewed_bug', 1000 + n, user_id=2)
+
+        pages = walk(lambda before: db.history_page(
+            conn, bug_id, before and db.parse_page_cursor(before), limit=5))
+
+    entries = [entry for page in pages for entry in page]
+    assert sum(entry.repeats for entry in entries if entry.action == 'viewed_bug') == 10
+    assert entries[-1].action == 'bug_created'
+    assert len({entry.id for entry in entries}) == len(entries)
+
+
+def api_history(client, bug_id, query=''):
+    return client.get(f'/api/bugs/{bug_id}/history?{query}')
+
+
+def test_api_history_filters_by_action_and_actor(db, client):
+    with db.get_db_connection() as conn:
+        bug_id = history_bug(conn)
+    login(client)
+
+    assert [(entry['action'], entry['repeats']) for entry in api_history(client, bug_id).get_json()['history']] == \
+        [('viewed_bug', 3), ('status_changed', 1), ('viewed_bug', 5), ('bug_created', 1)]
+
+    views = api_history(client, bug_id, 'actor=DEV@example.com').get_json()['history']
+    assert [(entry['action'], entry['repeats']) for entry in views] == [('viewed_bug', 8)]
+    assert api_history(client, bug_id, 'actor=nobody@example.com').get_json()['history'] == []
+
+    raw = api_history(client, bug_id, 'action=viewed_bug&collapse=0').get_json()
+    assert len(raw['history']) == 8 and raw['older'] is None
+    assert 'scan_position' not in raw['history'][0]
+
+
+def test_api_history_pages_with_the_older_cursor(db, client):
+    with db.get_db_connection() as conn:
+        bug_id = history_bug(conn)
+    login(client)
+
+    first = api_history(client, bug_id, 'limit=2').get_json()
+    second = api_history(client, bug_id, f'limit=2&before={first["older"]}').get_json()
+    assert [entry['action'] for entry in first['history'] + second['history']] == \
+        ['viewed_bug', 'status_changed', 'viewed_bug', 'bug_created']
+    assert second['older'] is None
+
+
+@pytest.mark.parametrize('query', ['action=exploded', 'before=soon', 'limit=many'])
+def test_api_history_rejects_bad_filters(db, client, query):
+    with db.get_db_connection() as conn:
+        bug_id = history_bug(conn)
+    login(client)
+    assert api_history(client, bug_id, query).status_code == 400
+
+
+def test_api_history_unknown_bug(db, client):
+    login(client)
+    assert api_history(client, 404).status_code == 404
+
+
+def test_history_fragment_renders_only_the_entries(db, client):
+    with db.get_db_connection() as conn:
+        bug_id = history_bug(conn)
+    login(client)
+
+    page = client.get(f'/bug/{bug_id}/history').get_data(as_text=True)
+    fragment = client.get(f'/bug/{bug_id}/history?fragment=1&limit=2').get_data(as_text=True)
+    assert '<html' in page and '&times;5' in page
+    assert '<html' not in fragment and fragment.count('Status Changed') == 1
+    assert 'data-older="' in fragment and 'data-older=""' not in fragment
@@ -0,0 +1,128 @@
+"""Database maintenance: the tasks, their time budget, backups and the scheduler"""
+import json
+import os
+import sqlite3
+from datetime import datetime, time
+
+import pytest
+
+from conftest import add_bug
+
+
+@pytest.fixture
+def backups(db, tmp_path, monkeypatch):
+    """An empty backup directory keeping two backups"""
+    backup_dir = tmp_path / 'backups'
+    monkeypatch.setitem(db.app.config, 'BACKUP_DIR', str(backup_dir))
+    monkeypatch.setitem(db.app.config, 'BACKUP_RETENTION', 2)
+    return backup_dir
+
+
+def last_run(db):
+    with db.get_db_connection() as conn:
+        return conn.execute('SELECT * FROM maintenance_runs ORDER BY id DESC LIMIT 1').fetchone()
+
+
+def statuses(report):
+    return {item['task']: item['status'] for item in report}
+
+
+@pytest.mark.parametrize('spec, now, inside', [
+    ('02:00-05:00', time(3, 30), True),
+    ('02:00-05:00', time(5, 0), False),
+    ('23:00-01:30', time(23, 59), True),
+    ('23:00-01:30', time(0, 30), True),
+    ('23:00-01:30', time(12, 0), False),
+])
+def test_maintenance_window_may_wrap_past_midnight(db, spec, now, inside):
+    window = db.parse_maintenance_window(spec)
+    assert db.in_maintenance_window(datetime.combine(datetime(2024, 1, 1), now), window) is inside
+
+
+def test_run_maintenance_runs_every_task_and_records_the_run(db, backups):
+    with db.get_db_connection() as conn:
+        for _ in range(20):
+            add_bug(conn)
+
+    report = db.run_maintenance()
+    assert [item['task'] for item in report] == list(db.MAINTENANCE_TASKS)
+    assert statuses(report) == {'optimize': 'ok', 'analyze': 'ok', 'checkpoint': 'ok',
+                                'incremental_vacuum': 'ok', 'backup': 'ok'}
+
+    run = last_run(db)
+    assert (run['trigger_name'], run['status']) == ('manual', 'ok') and run['finished_at']
+    assert json.loads(run['report']) == report
+    with db.get_db_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'bugs'").fetchone()[0] > 0
+
+
+def test_tasks_past_the_budget_are_skipped(db, backups):
+    report = db.run_maintenance(('optimize', 'backup'), budget_seconds=0)
+    assert all(item['status'] == 'skipped' and item['detail'] == 'time budget used up' for item in report)
+    assert not backups.exists()
+
+
+def test_a_failing_task_does_not_stop_the_rest(db, tmp_path, monkeypatch):
+    not_a_directory = tmp_path / 'backups'
+    not_a_directory.write_text('')
+    monkeypatch.setitem(db.app.config, 'BACKUP_DIR', str(not_a_directory))
+
+    report = db.run_maintenance(('backup', 'checkpoint'))
+    assert statuses(report) == {'backup': 'failed', 'checkpoint': 'ok'}
+    assert last_run(db)['status'] == 'failed'
+
+
+def test_backup_is_a_usable_copy_and_old_backups_are_pruned(db, backups):
+    with db.get_db_connection() as conn:
+        add_bug(conn, title='In the backup')
+    backups.mkdir()
+    prefix = os.path.splitext(os.path.basename(db.DATABASE))[0]
+    for day in ('01', '02'):
+        (backups / f'{prefix}-200001{day}-000000.db').write_text('')
+    (backups / 'unrelated.db').write_text('')
+
+    db.run_maintenance(('backup',))
+
+    kept = sorted(os.listdir(backups))
+    assert len(kept) == 3 and f'{prefix}-20000102-000000.db' in kept and 'unrelated.db' in kept
+    newest = sqlite3.connect(backups / kept[-2])
+    try:
+        assert newest.execute('SELECT title FROM bugs').fetchall() == [('In the backup',)]
+    finally:
+        newest.close()
+
+
+def test_incremental_vacuum_releases_free_pages(db, backups):
+    with db.get_db_connection() as conn:
+        conn.executemany("INSERT INTO users (email, password, role) VALUES (?, ?, 'debugger')",
+                         [(f'user{n}@example.com', 'x' * 500) for n in range(2000)])
+        conn.execute("DELETE FROM users WHERE email LIKE 'user%'")
+
+    result = db.app.test_cli_runner().invoke(args=['maintenance', '--full-vacuum', '--task', 'incremental_vacuum'])
+    assert result.exit_code == 0, result.output
+    assert '[OK] incremental_vacuum' in result.output
+
+    with db.get_db_connection() as conn:
+        conn.executemany("INSERT INTO users (email, password, role) VALUES (?, ?, 'debugger')",
+                         [(f'user{n}@example.com', 'x' * 500) for n in range(2000)])
+        conn.execute("DELETE FROM users WHERE email LIKE 'user%'")
+        assert conn.execute('PRAGMA freelist_count').fetchone()[0] > 0
+
+    report = db.run_maintenance(('incremental_vacuum',))
+    assert report[0]['status'] == 'ok' and report[0]['detail'].endswith(', 0 left')
+    with db.get_db_connection() as conn:
+        assert conn.execute('PRAGMA freelist_count').fetchone()[0] == 0
+
+
+def test_scheduler_claims_one_run_per_interval(db, monkeypatch):
+    monkeypatch.setitem(db.app.config, 'MAINTENANCE_INTERVAL_HOURS', 24)
+    scheduler = db.MaintenanceScheduler()
+
+    run_id = scheduler._claim_run()
+    assert run_id is not None
+    assert scheduler._claim_run() is None
+    assert last_run(db)['trigger_name'] == 'scheduler'
+
+    # Once the interval has passed the next check claims a new run
+    monkeypatch.setitem(db.app.config, 'MAINTENANCE_INTERVAL_HOURS', 0)
+    assert scheduler._claim_run() not in (None, run_id)
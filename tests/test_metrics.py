@@ -0,0 +1,69 @@
+"""Per-route request metrics and the /metrics endpoint"""
+import re
+
+import pytest
+
+from conftest import add_bug, login
+
+
+@pytest.fixture
+def metrics(db, monkeypatch):
+    """Metrics switched on with nothing collected yet"""
+    monkeypatch.setitem(db.app.config, 'METRICS_ENABLED', True)
+    db.request_metrics.reset()
+    yield db.request_metrics
+    db.request_metrics.reset()
+
+
+def sample(text, name, **labels):
+    """The value of one sample in Prometheus text, or None"""
+    wanted = ','.join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf'^{name}{{{re.escape(wanted)}}} (\S+)$', text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def test_metrics_are_off_by_default(db, client):
+    assert client.get('/metrics').status_code == 404
+
+
+def test_requests_are_counted_by_route_template(db, client, metrics):
+    with db.get_db_connection() as conn:
+        first, second = add_bug(conn), add_bug(conn)
+    login(client)
+    client.get(f'/bug/{first}')
+    client.get(f'/bug/{second}')
+    client.get('/bug/404')
+
+    text = client.get('/metrics').get_data(as_text=True)
+    route = {'route': '/bug/<int:bug_id>', 'method': 'GET'}
+    assert sample(text, 'bugtracker_request_duration_seconds_count', **route) == 3
+    assert sample(text, 'bugtracker_request_duration_seconds_bucket', **route, le='+Inf') == 3
+    assert sample(text, 'bugtracker_requests_total', **route, status=200) == 2
+    assert sample(text, 'bugtracker_requests_total', **route, status=302) == 1
+    assert sample(text, 'bugtracker_sql_statements_total', **route) > 0
+    assert sample(text, 'bugtracker_template_render_seconds_total', **route) > 0
+
+
+def test_histogram_buckets_are_cumulative(db, metrics):
+    for seconds in (0.001, 0.02, 0.02, 30.0):
+        metrics.observe('/x', 'GET', 200, seconds, 0, 0.0, 0.0, 0)
+
+    text = metrics.render()
+    route = {'route': '/x', 'method': 'GET'}
+    assert sample(text, 'bugtracker_request_duration_seconds_bucket', **route, le='0.005') == 1
+    assert sample(text, 'bugtracker_request_duration_seconds_bucket', **route, le='0.025') == 3
+    assert sample(text, 'bugtracker_request_duration_seconds_bucket', **route, le='10.0') == 3
+    assert sample(text, 'bugtracker_request_duration_seconds_bucket', **route, le='+Inf') == 4
+    assert sample(text, 'bugtracker_request_duration_seconds_sum', **route) == pytest.approx(30.041)
+
+
+def test_label_values_are_escaped(db, metrics):
+    metrics.observe('/say/"hi"\\', 'GET', 200, 0.001, 0, 0.0, 0.0, 0)
+    assert 'route="/say/\\"hi\\"\\\\"' in metrics.render()
+
+
+def test_unmatched_paths_share_one_route(db, client, metrics):
+    client.get('/no/such/page')
+    client.get('/nor/this')
+    text = client.get('/metrics').get_data(as_text=True)
+    assert sample(text, 'bugtracker_requests_total', route='unmatched', method='GET', status=404) == 2
@@ -0,0 +1,51 @@
+"""Signing in with GitHub: which email an account is matched on"""
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def github(db, monkeypatch):
+    """Answers the GitHub API with the user and email list set on the returned namespace"""
+    fake = SimpleNamespace(user={'id': 4242, 'login': 'octo', 'name': 'Octo Cat', 'email': None}, emails=[])
+    token = SimpleNamespace(json=lambda: {'access_token': 'token'})
+    monkeypatch.setattr(db.http_session, 'post', lambda *args, **kwargs: token)
+
+    def fetch_json(url, headers=None, http=None):
+        return dict(fake.user) if url.endswith('/user') else fake.emails
+
+    monkeypatch.setattr(db, 'fetch_json', fetch_json)
+    return fake
+
+
+def sign_in(client):
+    response = client.get('/auth/github/callback?code=abc&state=xyz')
+    assert response.status_code == 302 and response.headers['Location'].endswith('/dashboard')
+    with client.session_transaction() as session:
+        return session['user_id'], session['user_email'], session['user_role']
+
+
+def test_verified_primary_email_is_used(db, client, github):
+    github.emails = [{'email': 'octo@work.dev', 'primary': False, 'verified': True},
+                     {'email': 'octo@home.dev', 'primary': True, 'verified': True}]
+    user_id, email, role = sign_in(client)
+    assert (email, role) == ('octo@home.dev', 'user') and user_id > 3
+
+
+def test_unverified_email_never_matches_an_existing_account(db, client, github):
+    github.emails = [{'email': 'admin@example.com', 'primary': True, 'verified': False},
+                     {'email': 'octo@work.dev', 'primary': False, 'verified': True}]
+    user_id, email, role = sign_in(client)
+    assert (email, role) == ('octo@work.dev', 'user') and user_id != 1
+
+
+def test_without_a_verified_email_a_placeholder_is_used(db, client, github):
+    github.emails = [{'email': 'admin@example.com', 'primary': True, 'verified': False}]
+    user_id, email, _ = sign_in(client)
+    assert email == 'github_octo@github.local' and user_id != 1
+
+
+def test_linked_accounts_keep_the_user_role(db, client, github):
+    github.emails = [{'email': 'admin@example.com', 'primary': True, 'verified': True}]
+    user_id, _, role = sign_in(client)
+    assert (user_id, role) == (1, 'user')
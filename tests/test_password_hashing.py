@@ -0,0 +1,96 @@
+"""Password hashing in a bounded worker pool, and hash upgrades on login"""
+import os
+import threading
+import time
+
+import pytest
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+@pytest.fixture
+def pool(db):
+    """A one-process pool with a single queue slot"""
+    pool = db.PasswordHashPool(workers=1, queue_size=1, queue_wait=0.1, timeout=5)
+    yield pool
+    pool.shutdown()
+
+
+def test_pool_hashes_in_a_worker_process(db, pool):
+    stored = pool.run(generate_password_hash, 'Correct-Horse-1', 'pbkdf2:sha256:1000', 16)
+    assert pool.run(check_password_hash, stored, 'Correct-Horse-1') is True
+    assert pool.run(os.getpid) != os.getpid()
+
+
+def test_pool_without_workers_runs_inline(db):
+    pool = db.PasswordHashPool(workers=0, queue_size=1, queue_wait=0.1, timeout=5)
+    assert pool.run(os.getpid) == os.getpid()
+
+
+def test_pool_sheds_callers_when_the_queue_is_full(db, pool):
+    pool.run(os.getpid)  # start the worker
+    busy = threading.Thread(target=pool.run, args=(time.sleep, 1.0))
+    busy.start()
+    time.sleep(0.2)
+    try:
+        with pytest.raises(db.PasswordHashBusy):
+            pool.run(os.getpid)
+    finally:
+        busy.join()
+    # The slot is free again once the slow hash is done
+    assert pool.run(pow, 2, 3) == 8
+
+
+def test_pool_gives_up_on_a_slow_hash(db):
+    pool = db.PasswordHashPool(workers=1, queue_size=2, queue_wait=0.1, timeout=0.2)
+    try:
+        with pytest.raises(db.PasswordHashBusy):
+            pool.run(time.sleep, 2.0)
+    finally:
+        pool.shutdown()
+
+
+def test_pool_replaces_a_crashed_worker(db, pool):
+    with pytest.raises(db.PasswordHashBusy):
+        pool.run(os._exit, 1)
+    assert pool.run(pow, 2, 3) == 8
+
+
+def stored_password(db, user_id=2):
+    with db.get_db_connection() as conn:
+        return conn.execute('SELECT password FROM users WHERE id = ?', (user_id,)).fetchone()[0]
+
+
+def set_password(db, stored, user_id=2):
+    with db.get_db_connection() as conn:
+        conn.execute('UPDATE users SET password = ? WHERE id = ?', (stored, user_id))
+
+
+def post_login(client, password):
+    return client.post('/login', data={'email': 'dev@example.com', 'password': password})
+
+
+def test_login_upgrades_a_cheaper_hash(db, client):
+    set_password(db, generate_password_hash('Correct-Horse-1', 'pbkdf2:sha256:1000'))
+
+    assert post_login(client, 'Correct-Horse-1').status_code == 302
+    upgraded = stored_password(db)
+    assert upgraded.startswith(db.PASSWORD_HASH_METHOD + '$')
+    assert check_password_hash(upgraded, 'Correct-Horse-1')
+
+
+def test_failed_login_leaves_the_hash_alone(db, client):
+    old = generate_password_hash('Correct-Horse-1', 'pbkdf2:sha256:1000')
+    set_password(db, old)
+
+    assert post_login(client, 'wrong').status_code == 200
+    assert stored_password(db) == old
+
+
+def test_login_is_refused_while_the_pool_is_busy(db, client, monkeypatch):
+    def busy(*args):
+        raise db.PasswordHashBusy()
+
+    monkeypatch.setattr(db.password_hasher, 'run', busy)
+    response = post_login(client, 'Correct-Horse-1')
+    assert response.status_code == 503
+    assert 'The server is busy' in response.get_data(as_text=True)
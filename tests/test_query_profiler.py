@@ -0,0 +1,80 @@
+"""The SQL statement profiler and its admin page"""
+import pytest
+
+from conftest import add_bug, login
+
+
+@pytest.fixture
+def profiler(db, monkeypatch):
+    """An empty profiler that records every statement, with plan lookups counted"""
+    monkeypatch.setitem(db.app.config, 'QUERY_PROFILER_ENABLED', True)
+    monkeypatch.setitem(db.app.config, 'SLOW_QUERY_MS', 0.0)
+    db.statement_profiler.reset()
+    explained = []
+    explain = db.StatementProfiler._explain
+
+    def counting_explain(connection, sql, parameters):
+        explained.append(sql)
+        return explain(connection, sql, parameters)
+
+    monkeypatch.setattr(db.StatementProfiler, '_explain', staticmethod(counting_explain))
+    yield db.statement_profiler, explained
+    db.statement_profiler.reset()
+
+
+def test_normalize_sql_reduces_statements_to_their_shape(db):
+    assert db.normalize_sql("SELECT *  FROM bugs\n WHERE id IN (?, ?, ?) AND status = 'Open' LIMIT 10") == \
+        'SELECT * FROM bugs WHERE id IN (?, ...) AND status = ? LIMIT ?'
+
+
+def test_slow_statements_are_explained_once_per_shape(db, profiler):
+    statement_profiler, explained = profiler
+    with db.get_db_connection() as conn:
+        for bug_id in range(1, 6):
+            conn.execute('SELECT title FROM bugs WHERE id = ?', (bug_id,)).fetchall()
+
+    shape = 'SELECT title FROM bugs WHERE id = ?'
+    stats = next(row for row in statement_profiler.top(limit=100) if row['shape'] == shape)
+    assert stats['calls'] == 5 and stats['slow'] == 5
+    assert 'USING INTEGER PRIMARY KEY' in stats['plan']
+    assert explained.count('SELECT title FROM bugs WHERE id = ?') == 1
+
+    # Clearing the statistics forgets the plan as well
+    statement_profiler.reset()
+    with db.get_db_connection() as conn:
+        conn.execute('SELECT title FROM bugs WHERE id = ?', (1,)).fetchall()
+    assert explained.count('SELECT title FROM bugs WHERE id = ?') == 2
+
+
+def test_fast_statements_are_not_explained(db, profiler, monkeypatch):
+    statement_profiler, explained = profiler
+    monkeypatch.setitem(db.app.config, 'SLOW_QUERY_MS', 60000.0)
+    with db.get_db_connection() as conn:
+        add_bug(conn)
+    assert explained == []
+    assert all(row['slow'] == 0 for row in statement_profiler.top())
+
+
+@pytest.mark.parametrize('value', ['nan', 'NaN', '-1', 'inf', 'fast', ''])
+def test_threshold_rejects_invalid_values(db, client, monkeypatch, value):
+    monkeypatch.setitem(db.app.config, 'SLOW_QUERY_MS', 100.0)
+    login(client)
+    response = client.post('/admin/query-profiler', data={'action': 'threshold', 'slow_query_ms': value})
+    assert response.status_code == 400
+    assert 'Threshold must be a non-negative number' in response.get_data(as_text=True)
+    assert db.app.config['SLOW_QUERY_MS'] == 100.0
+
+
+def test_threshold_accepts_a_number(db, client, monkeypatch):
+    monkeypatch.setitem(db.app.config, 'SLOW_QUERY_MS', 100.0)
+    login(client)
+    response = client.post('/admin/query-profiler', data={'action': 'threshold', 'slow_query_ms': '250'})
+    assert response.status_code == 302
+    assert db.app.config['SLOW_QUERY_MS'] == 250.0
+
+
+def test_profiler_page_is_admin_only(db, client):
+    login(client, user_id=2, email='dev@example.com', role='debugger')
+    assert client.get('/admin/query-profiler').status_code == 302
+    login(client)
+    assert client.get('/admin/query-profiler').status_code == 200
@@ -0,0 +1,87 @@
+"""Token-bucket rate limits: both backends and the login limits"""
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def limited(db, client, monkeypatch):
+    """The client with rate limiting on and empty buckets; returns the app module"""
+    monkeypatch.setitem(client.application.config, 'RATE_LIMIT_ENABLED', True)
+    monkeypatch.setattr(db, 'rate_limiter', db.TokenBucketLimiter())
+    with db.get_db_connection() as conn:
+        conn.execute('UPDATE users SET password = ? WHERE id = 2', (db.hash_password('Correct-Horse-1'),))
+    return db
+
+
+def post_login(client, password, ip, email='dev@example.com'):
+    return client.post('/login', data={'email': email, 'password': password},
+                       environ_base={'REMOTE_ADDR': ip})
+
+
+@pytest.mark.parametrize('spec, expected', [('10/60', (10.0, 10 / 60)), ('5', (5.0, 5.0))])
+def test_parse_rate(db, spec, expected):
+    assert db.parse_rate(spec) == expected
+
+
+@pytest.mark.parametrize('spec', ['0/60', '5/0', '-1/60', 'many'])
+def test_parse_rate_rejects_invalid_limits(db, spec):
+    with pytest.raises(ValueError):
+        db.parse_rate(spec)
+
+
+def test_bucket_allows_a_burst_then_refills(db):
+    limiter = db.TokenBucketLimiter()
+    assert [limiter.take('k', 3, 1.0, now=100.0) for _ in range(3)] == [0, 0, 0]
+    assert limiter.take('k', 3, 1.0, now=100.0) == pytest.approx(1.0)
+    assert limiter.take('k', 3, 1.0, now=101.0) == 0
+    # Other keys have their own buckets
+    assert limiter.take('other', 3, 1.0, now=101.0) == 0
+
+
+def test_memory_limiter_sweeps_full_buckets(db):
+    limiter = db.TokenBucketLimiter(max_keys=10)
+    for n in range(10):
+        limiter.take(f'old:{n}', 1, 1.0, now=0.0)
+    limiter.take('new', 1, 1.0, now=60.0)
+    assert len(limiter) == 1
+
+
+def test_sqlite_limiter_shares_buckets_between_threads(db, tmp_path):
+    limiter = db.SQLiteTokenBucketLimiter(str(tmp_path / 'rate_limits.db'))
+    results = []
+
+    def worker():
+        for _ in range(25):
+            results.append(limiter.take('login:ip:10.0.0.1', 20, 1e-6, now=1000.0))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(1 for retry_after in results if retry_after == 0) == 20
+    assert limiter._calls == 200
+
+
+def test_login_is_limited_per_client_and_email(limited, client):
+    for _ in range(5):
+        assert post_login(client, 'wrong', '10.0.0.1').status_code == 200
+    limited_response = post_login(client, 'wrong', '10.0.0.1')
+    assert limited_response.status_code == 429
+    assert int(limited_response.headers['Retry-After']) >= 1
+
+
+def test_failed_logins_from_elsewhere_do_not_lock_the_owner_out(limited, client):
+    for _ in range(6):
+        post_login(client, 'wrong', '203.0.113.9')
+
+    response = post_login(client, 'Correct-Horse-1', '10.0.0.2')
+    assert response.status_code == 302 and response.headers['Location'].endswith('/dashboard')
+
+
+def test_login_is_limited_per_client_across_emails(limited, client):
+    statuses = [post_login(client, 'wrong', '10.0.0.3', email=f'guess{n}@example.com').status_code
+                for n in range(21)]
+    assert statuses[:20] == [200] * 20 and statuses[20] == 429
@@ -0,0 +1,167 @@
+"""The related-bugs similarity index: merging generations, catching up and querying"""
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from conftest import add_bug, add_history, login
+
+WORDS = ('crash save dialog export csv login timeout avatar upload resize dashboard filter priority '
+         'comment history cursor session token memory leak render slow query index backup restore').split()
+
+
+def random_text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def random_bugs(count, seed=7):
+    rng = random.Random(seed)
+    return [{'id': bug_id, 'title': random_text(rng, 4), 'description': random_text(rng, 12),
+             'steps': random_text(rng, 6), 'actual_result': ''} for bug_id in range(1, count + 1)]
+
+
+def build(db, bugs):
+    return db.merge_similarity_base(db.empty_similarity_base(), None, [bug['id'] for bug in bugs],
+                                    [db.bug_text_vector(bug) for bug in bugs])
+
+
+def entries(base):
+    """The base as a set of (term, bug id, weight) entries, independent of their order"""
+    terms = np.repeat(np.arange(len(base.pointers) - 1), np.diff(base.pointers))
+    return {(int(term), int(base.bug_ids[row]), round(float(weight), 5))
+            for term, row, weight in zip(terms, base.rows, base.weights)}
+
+
+def brute_force(db, base, bugs, query, k):
+    """Cosine similarity of the query with every bug, with the base's idf"""
+    def dense(features, tf):
+        vector = np.zeros(db.SIMILARITY_FEATURES)
+        vector[features] = tf * base.idf[features]
+        return vector / (np.linalg.norm(vector) or 1)
+
+    target = dense(*query)
+    scores = [(bug['id'], float(dense(*db.bug_text_vector(bug)) @ target)) for bug in bugs]
+    return sorted(scores, key=lambda item: -item[1])[:k]
+
+
+def test_merge_matches_a_fresh_build(db):
+    bugs = random_bugs(60)
+    base = build(db, bugs[:40])
+
+    # Bugs 3 and 7 are edited, 10 deleted, 41-60 created
+    edited = {3: dict(bugs[2], title='memory leak in render'), 7: dict(bugs[6], title='backup restore timeout')}
+    dead = np.isin(base.bug_ids, [3, 7, 10])
+    changed = [edited[3], edited[7]] + bugs[40:]
+    merged = db.merge_similarity_base(base, dead, [bug['id'] for bug in changed],
+                                      [db.bug_text_vector(bug) for bug in changed])
+
+    final = sorted([bug for bug in bugs if bug['id'] not in (3, 7, 10)] + list(edited.values()),
+                   key=lambda bug: bug['id'])
+    fresh = build(db, final)
+    assert merged.bug_ids.tolist() == fresh.bug_ids.tolist()
+    assert merged.pointers.tolist() == fresh.pointers.tolist()
+    assert entries(merged) == entries(fresh)
+    assert np.allclose(merged.idf, fresh.idf) and np.allclose(merged.norms, fresh.norms)
+
+
+def test_query_ranks_by_cosine_similarity(db, tmp_path):
+    bugs = random_bugs(80)
+    base = build(db, bugs)
+    index = db.SimilarityIndex(str(tmp_path / 'index'))
+    with index._lock:
+        index._publish(base, (0, 0), 'test')
+
+    query = db.text_vector([('export csv timeout on the dashboard', 3.0)])
+    matches = index.query([query], k=5, min_score=0)[0]
+    expected = brute_force(db, base, bugs, query, 5)
+    assert [bug_id for bug_id, _ in matches] == [bug_id for bug_id, _ in expected]
+    assert [score for _, score in matches] == pytest.approx([score for _, score in expected], abs=1e-3)
+
+    # A bug is not related to itself
+    assert all(bug_id != 1 for bug_id, _ in index.query([db.bug_text_vector(bugs[0])], exclude=[1])[0])
+
+
+def insert_bug(conn, title, description):
+    bug_id = conn.execute('''
+        INSERT INTO bugs (title, description, priority, status, created_by, created_at_ms)
+        VALUES (?, ?, 'Medium', 'Open', 1, 0)
+    ''', (title, description)).lastrowid
+    add_history(conn, bug_id, 'bug_created', 0)
+    return bug_id
+
+
+def related_ids(index, db, title):
+    return [bug_id for bug_id, _ in index.query([db.text_vector([(title, 3.0)])], k=3)[0]]
+
+
+def test_index_catches_up_with_edits_and_deletions(db, tmp_path):
+    with db.get_db_connection() as conn:
+        crash = insert_bug(conn, 'Crash when saving the export dialog', 'The export dialog crashes on save')
+        leak = insert_bug(conn, 'Memory leak while rendering charts', 'Rendering leaks memory')
+        insert_bug(conn, 'Avatar upload rejects large images', 'Uploading a big avatar fails')
+
+    index = db.SimilarityIndex(str(tmp_path / 'index'))
+    with db.get_db_connection() as conn:
+        assert index.build(conn) == 3
+    assert related_ids(index, db, 'export dialog crash') == [crash]
+
+    with db.get_db_connection() as conn:
+        conn.execute("UPDATE bugs SET title = 'Session token expires early', description = 'Logged out' WHERE id = ?",
+                     (crash,))
+        add_history(conn, crash, 'title_changed', 0)
+        token = insert_bug(conn, 'Login token timeout', 'The session token times out')
+        conn.execute('DELETE FROM bug_history WHERE bug_id = ?', (leak,))
+        conn.execute('DELETE FROM bugs WHERE id = ?', (leak,))
+        conn.execute("INSERT INTO bug_deletions (bug_id, user_id, title, created_at_ms) VALUES (?, 1, 'Leak', 0)",
+                     (leak,))
+    with db.get_db_connection() as conn:
+        assert index.refresh(conn) == 3
+        assert index.refresh(conn) == 0
+
+    assert related_ids(index, db, 'export dialog crash') == []
+    assert related_ids(index, db, 'memory leak rendering') == []
+    # Words no indexed bug had before are matched from the delta alone
+    assert set(related_ids(index, db, 'session token')) == {crash, token}
+    assert index.size == 3
+
+    # Written out as a new generation, and picked up by another worker, nothing changes
+    assert index.compact() is True and index.compact() is False
+    other = db.SimilarityIndex(index.directory)
+    assert other.load() is True
+    for title in ('export dialog crash', 'memory leak rendering', 'session token'):
+        assert related_ids(other, db, title) == related_ids(index, db, title)
+
+
+def test_index_from_a_newer_database_is_stale(db, tmp_path):
+    with db.get_db_connection() as conn:
+        insert_bug(conn, 'Crash when saving the export dialog', 'Crashes')
+    index = db.SimilarityIndex(str(tmp_path / 'index'))
+    with db.get_db_connection() as conn:
+        index.build(conn)
+    # The database is restored from a backup older than the index
+    with db.get_db_connection() as conn:
+        conn.execute('DELETE FROM bug_history')
+
+    with db.get_db_connection() as conn, pytest.raises(db.SimilarityIndexStale):
+        index.refresh(conn)
+
+
+def test_bug_page_lists_related_bugs(db, client, tmp_path, monkeypatch):
+    with db.get_db_connection() as conn:
+        crash = insert_bug(conn, 'Crash when saving the export dialog', 'The export dialog crashes on save')
+        twin = insert_bug(conn, 'Export dialog crash on save', 'Saving from the export dialog crashes')
+        add_bug(conn, title='Avatar upload rejects large images')
+    index = db.SimilarityIndex(str(tmp_path / 'index'))
+    with db.get_db_connection() as conn:
+        index.build(conn)
+    monkeypatch.setitem(db.app.config, 'SIMILARITY_ENABLED', True)
+    monkeypatch.setattr(db, 'similarity_index', index)
+    login(client)
+
+    page = client.get(f'/bug/{crash}').get_data(as_text=True)
+    assert f'#{twin} Export dialog crash on save' in page
+    assert 'Avatar upload' not in page.split('related-bugs-section', 1)[1]
+
+    similar = client.post('/api/check-duplicates', json={'title': 'crash in export dialog'}).get_json()
+    assert {bug['id'] for bug in similar['similar_bugs']} == {crash, twin}